@@ -0,0 +1,150 @@
+"""Comment Positions Benchmark - Compare convert.update_comment_positions with the old one."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Comment Positions Benchmark - Compare convert.update_comment_positions with the old one.
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Comment Positions Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+__license__ = "GNU General Public License Version 3"
+
+
+import json
+import time
+from typing import Any
+
+from localization_translation import convert
+
+# Entries in generated Files.cfg
+SIZES = (2_000, 20_000, 100_000)
+# Entries added to new version
+ADDED = 5
+
+
+def legacy_update_comment_positions(
+    original_pos: dict[str, dict[int, str]],
+    new_data: dict[str, Any],
+    old_data: dict[str, Any],
+) -> dict[str, dict[int, str]]:
+    """Update comment positions, like convert.update_comment_positions used to."""
+    # Get json text of files
+    old_json = json.dumps(old_data, indent="\t").splitlines()
+    new_json = json.dumps(new_data, indent="\t").splitlines()
+
+    new_comments: dict[str, dict[int, str]] = {}
+
+    # For each name
+    for name in old_data:
+        # Reads include comments, so have to keep track of comments read.
+        read_offset = 0
+
+        # Make predictions of guess where it is in new version more accurate
+        sec_add = 0
+
+        # Find section
+        section = "null/"
+        for item in original_pos:
+            if name in item:
+                section = item
+
+        # If sections of data are not the same
+        if new_data[name] != old_data[name]:
+            # Find start of bock section in new and old json
+            section_start = f'\t"{name}": ['
+            obs = old_json.index(section_start) - 1
+            nbs = new_json.index(section_start) - 1
+            n_end = new_json.index("\t]") + 1
+            # Initialize section
+            new_comments[section] = {}
+            # For each offset in the comments
+            for offset in sorted(original_pos[section]):
+                # Find line comment lives on
+                old_comment = old_json[obs + offset - read_offset]
+
+                # Find start to look for same line in new
+                start = nbs + offset - read_offset + sec_add
+                start = max(nbs, start)
+
+                # Find old comment position in new json
+                new_pos = new_json.index(old_comment, start, n_end)
+
+                # Cumulative additions
+                sec_add = max(sec_add, new_pos - start)
+
+                # New position needs to be offset as well
+                new_pos += read_offset
+
+                # Update offset
+                read_offset += 1
+
+                # Record new comment
+                new_comments[section][new_pos - nbs] = original_pos[section][offset]
+    return new_comments
+
+
+def generate_files(entries: int) -> list[str]:
+    """Return file list of Installer/Files.cfg with entries entries."""
+    return [f"Applications/App{index}.app/Main.lua" for index in range(entries)]
+
+
+def files_cfg(files: list[str]) -> str:
+    """Return Installer/Files.cfg text of files, with a comment every ten and a blank line every fifty."""
+    text = ["{", "\tfiles = {"]
+    for index, filename in enumerate(files):
+        if index % 50 == 0:
+            text.append("")
+        if index % 10 == 0:
+            text.append(f"\t\t-- Group {index // 10}")
+        text.append(f'\t\t"{filename}",')
+    text[-1] = text[-1].removesuffix(",")
+    text.extend(("\t}", "}"))
+    return "\n".join(text)
+
+
+def run() -> None:
+    """Run benchmark."""
+    for entries in SIZES:
+        old_data, comments = convert.lang_to_json(files_cfg(generate_files(entries)))
+        new_files = generate_files(entries)
+        # Add entries away from comments, where both versions agree
+        for added in range(ADDED):
+            new_files.insert(entries * (added + 1) // (ADDED + 1) // 10 * 10 + 5, f"Libraries/Added{added}.lua")
+        new_data = {"files": new_files}
+        comment_count = sum(map(len, comments.values()))
+
+        start = time.perf_counter()
+        new = convert.update_comment_positions(comments, new_data, old_data)
+        new_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        old = legacy_update_comment_positions(comments, new_data, old_data)
+        old_time = time.perf_counter() - start
+
+        assert new == old
+        assert convert.dict_to_lang(new_data, new) == convert.dict_to_lang(new_data, old)
+        print(
+            f"{entries:>7} entries, {comment_count:>6} comments: "
+            f"update_comment_positions {new_time:.3f}s, legacy {old_time:.3f}s ({old_time / new_time:.1f}x)",
+        )
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
+    run()
@@ -0,0 +1,272 @@
+"""Extricate Depth Benchmark - Compare iterative extricate with the old recursive one."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Extricate Depth Benchmark - Compare iterative extricate with the old recursive one.
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Extricate Depth Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+__license__ = "GNU General Public License Version 3"
+
+
+import time
+from typing import TYPE_CHECKING, Any
+
+from localization_translation import extricate
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+# Values in generated data, and nesting depths to try
+VALUES = 10_000
+DEPTHS = (1, 10, 100, 900, 3000)
+
+
+def legacy_dict_to_list(data: Any) -> tuple[list[str], list[str]]:
+    """Convert dictionary to two lists, like extricate.dict_to_list used to."""
+
+    def read_block(data: Any) -> tuple[list[str], list[str]]:
+        """Read block."""
+        keys: list[str] = []
+        values: list[str] = []
+
+        match type(data).__name__:
+            case "dict" as dtype:
+                assert isinstance(data, dict)  # Mypy doesn't understand
+                # If empty dict
+                if not data:
+                    keys.append(extricate.wrap_quotes(extricate.SEP, extricate.TYPE_CHAR[dtype]))
+                    values.append("")
+                # Will not run if no data to enumerate
+                for key, value in data.items():
+                    # Ensure key won't break everything
+                    intersect = set(str(key)) & (set(extricate.CHAR_TYPE) | {extricate.SEP})
+                    if intersect:
+                        raise ValueError(
+                            f'Dict key contains CHAR_TYPE value(s) "{"".join(intersect)}' + '"',
+                        )
+
+                    key = extricate.wrap_quotes(key, extricate.TYPE_CHAR[type(key).__name__])
+                    for block_k, block_v in zip(
+                        *read_block(value),
+                        strict=True,
+                    ):
+                        keys.append(
+                            extricate.wrap_quotes(
+                                f"{key}{extricate.SEP}{block_k}",
+                                extricate.TYPE_CHAR[dtype],
+                            ),
+                        )
+                        values.append(block_v)
+            case "list" as dtype:
+                assert isinstance(data, list)  # Mypy doesn't understand
+                # If empty list
+                if not data:
+                    keys.append(extricate.wrap_quotes(f"{extricate.SEP}", extricate.TYPE_CHAR[dtype]))
+                    values.append("")
+                # Will not run if no data to enumerate
+                for key, value in enumerate(data):
+                    for block_k, block_v in zip(
+                        *read_block(value),
+                        strict=True,
+                    ):
+                        keys.append(
+                            extricate.wrap_quotes(
+                                f"{key}{extricate.SEP}{block_k}",
+                                extricate.TYPE_CHAR[dtype],
+                            ),
+                        )
+                        values.append(block_v)
+            case "str" | "int" | "bool" | "float" | "NoneType" as dtype:
+                keys.append(extricate.wrap_quotes("", extricate.TYPE_CHAR[dtype]))
+                values.append(str(data))
+            case _ as dtype:
+                raise TypeError(
+                    f'Expected type {extricate.combine_end(extricate.TYPE_CHAR, "or")}, got "{dtype}"',
+                )
+        return keys, values
+
+    return read_block(data)
+
+
+class Segment:
+    """Segment with item. Basically like a pointer."""
+
+    __slots__ = ("item",)
+
+    def __init__(self, item: Any = None) -> None:
+        """Initialize Segment."""
+        self.item = item
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        if self.item is None:
+            return "Segment()"
+        return f"Segment({self.item!r})"
+
+    def is_container(self) -> bool:
+        """Return if is container."""
+        return isinstance(self.item, list | dict)
+
+    def unwrap(self) -> Any:
+        """Unwrap contained item."""
+        if not self.is_container():
+            return self.item
+        match type(self.item).__name__:
+            case "dict":
+                assert isinstance(self.item, dict)  # Mypy doesn't understand
+                dict_data = {}
+                for key, item in self.item.items():
+                    if isinstance(item, Segment):
+                        dict_data[key] = item.unwrap()
+                        continue
+                    dict_data[key] = item
+                return dict_data
+            case "list":
+                assert isinstance(self.item, list)  # Mypy doesn't understand
+                list_data = []
+                for item in self.item:
+                    if isinstance(item, Segment):
+                        list_data.append(item.unwrap())
+                        continue
+                    list_data.append(item)
+                return list_data
+            case _ as dtype:
+                raise ValueError(f'Expected dict or list, got "{dtype}"')
+
+
+def legacy_list_to_dict(keys: Iterable[str], values: Iterable[str | int]) -> Any:
+    """Convert split lists back into dictionary, like extricate.list_to_dict used to."""
+
+    def handle_map(
+        segment: Segment,
+        key: str,
+        value: str,
+        map_func: Callable[[Any], Any],
+    ) -> None:
+        """Unwrap key and either set segment item or continue to unwrap."""
+        index = extricate.unwrap_quotes(key)
+        if index == "":
+            segment.item = map_func(value)
+            return
+        unwrap_key(segment, index, map_func(value))
+
+    def unwrap_key(segment: Segment, key: str, value: Any) -> None:
+        """Take apart key and set segment item to value in the right place."""
+        head = key[0]
+        if head == "":
+            segment.item = value
+            return
+        if head not in extricate.CHAR_TYPE:
+            raise ValueError(f'Key type character "{head}" unrecognized')
+        match extricate.CHAR_TYPE[head]:
+            case "dict":
+                if not isinstance(segment.item, dict):
+                    segment.item = {}
+                raw_key, index = extricate.unwrap_quotes(key).split(extricate.SEP, 1)
+
+                if raw_key:
+                    dkey: int | str
+                    if raw_key[0] not in extricate.CHAR_TYPE:
+                        raise ValueError(
+                            f'Key type character "{raw_key[0]}" unrecognized',
+                        )
+                    match extricate.CHAR_TYPE[raw_key[0]]:
+                        case "str":
+                            dkey = extricate.unwrap_quotes(raw_key)
+                        case "int":
+                            dkey = int(extricate.unwrap_quotes(raw_key))
+                        case _ as dtype:
+                            raise TypeError(
+                                f'Expected str or int, got "{dtype}"',
+                            )
+
+                    if dkey not in segment.item:
+                        segment.item[dkey] = Segment()
+                    unwrap_key(segment.item[dkey], index, value)
+            case "list":
+                if not isinstance(segment.item, list):
+                    segment.item = []
+                indice_str, index = extricate.unwrap_quotes(key).split(extricate.SEP, 1)
+                if indice_str:
+                    indice = int(indice_str)
+                    while indice >= len(segment.item):
+                        segment.item.append(Segment())
+                    unwrap_key(segment.item[indice], index, value)
+            case "str":
+                handle_map(segment, key, value, str)
+            case "int":
+                handle_map(segment, key, value, int)
+            case "bool":
+                handle_map(segment, key, value, bool)
+            case "float":
+                handle_map(segment, key, value, float)
+            case "NoneType":
+                handle_map(segment, key, value, lambda x: None)
+            case _ as dtype:
+                raise TypeError(
+                    f'Expected type {extricate.combine_end(extricate.TYPE_CHAR, "or")}, got "{dtype}"',
+                )
+
+    data = Segment()
+    for key, value in zip(keys, values, strict=True):
+        unwrap_key(data, key, value)
+    return data.unwrap()
+
+
+def generate_data(depth: int) -> Any:
+    """Return data of about VALUES values in dictionaries and lists nested depth deep."""
+    data: Any = {f"key{index}": f"Value {index}" for index in range(VALUES // depth)}
+    for level in range(depth - 1):
+        data = {"level": data, "count": level} if level % 2 else [data, f"Item {level}"]
+    return data
+
+
+def measure(function: Callable[..., Any], *args: Any) -> tuple[float, Any]:
+    """Return seconds taken to run function with args and its result."""
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def run() -> None:
+    """Run benchmark."""
+    for depth in DEPTHS:
+        data = generate_data(depth)
+        new_time, (keys, values) = measure(extricate.dict_to_list, data)
+        rebuild_time, _ = measure(extricate.list_to_dict, keys, values)
+        result = f"depth {depth:>4}, {len(keys)} values: dict_to_list {new_time:.3f}s, list_to_dict {rebuild_time:.3f}s"
+        try:
+            old_time, old = measure(legacy_dict_to_list, data)
+            old_rebuild_time, _ = measure(legacy_list_to_dict, keys, values)
+        except RecursionError:
+            result += ", old versions hit recursion limit"
+        else:
+            assert old == (keys, values)
+            result += (
+                f", old {old_time:.3f}s ({old_time / new_time:.1f}x) "
+                f"and {old_rebuild_time:.3f}s ({old_rebuild_time / rebuild_time:.1f}x)"
+            )
+        print(result)
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
+    run()
@@ -0,0 +1,82 @@
+"""Extricate Paths Benchmark - Compare path tuple flattening with string keys."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Extricate Paths Benchmark - Compare path tuple flattening with string keys.
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Extricate Paths Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+__license__ = "GNU General Public License Version 3"
+
+
+import time
+from typing import TYPE_CHECKING, Any
+
+from localization_translation import extricate
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Sections, keys per section and nesting depth of generated lang data
+SECTIONS = 200
+KEYS = 50
+DEPTHS = (2, 8, 32)
+
+
+def generate_data(depth: int) -> dict[str, Any]:
+    """Return lang style data with SECTIONS * KEYS values nested depth deep."""
+    data: dict[str, Any] = {}
+    for section in range(SECTIONS):
+        block: dict[str, Any] = {f"key{index}": f"Value {index} of section {section}" for index in range(KEYS)}
+        block["list"] = [f"Item {index}" for index in range(5)]
+        for level in range(depth - 1):
+            block = {f"level{level}": block}
+        data[f"section{section}"] = block
+    return data
+
+
+def measure(function: Callable[..., Any], *args: Any) -> tuple[float, Any]:
+    """Return seconds taken to run function with args and its result."""
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def run() -> None:
+    """Run benchmark."""
+    for depth in DEPTHS:
+        data = generate_data(depth)
+        string_time, (keys, values) = measure(extricate.dict_to_list, data)
+        path_time, (flat_keys, flat_values) = measure(extricate.flatten_paths, data)
+        assert flat_values == values
+        rebuild_string_time, rebuilt = measure(extricate.list_to_dict, keys, values)
+        rebuild_path_time, flat_rebuilt = measure(extricate.unflatten_paths, flat_keys, flat_values)
+        assert rebuilt == flat_rebuilt == data
+        print(
+            f"depth {depth:>2}, {len(keys)} values: "
+            f"flatten {path_time:.3f}s vs dict_to_list {string_time:.3f}s ({string_time / path_time:.1f}x), "
+            f"unflatten {rebuild_path_time:.3f}s vs list_to_dict {rebuild_string_time:.3f}s "
+            f"({rebuild_string_time / rebuild_path_time:.1f}x)",
+        )
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
+    run()
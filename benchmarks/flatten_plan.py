@@ -0,0 +1,83 @@
+"""Flatten Plan Benchmark - Compare rebuilding many languages from one FlattenPlan."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Flatten Plan Benchmark - Compare rebuilding many languages from one FlattenPlan.
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Flatten Plan Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+__license__ = "GNU General Public License Version 3"
+
+
+import time
+from typing import Any
+
+from localization_translation import extricate
+
+# Languages to rebuild every file for
+LANGUAGES = 100
+# Sections and keys per section of generated English file
+SECTIONS = 20
+KEYS = 40
+
+
+def generate_english() -> dict[str, Any]:
+    """Return MineOS style English lang data."""
+    data: dict[str, Any] = {}
+    for section in range(SECTIONS):
+        data[f"section{section}"] = {f"key{index}": f"Value {index} of section {section}" for index in range(KEYS)}
+        data[f"section{section}"]["items"] = [f"Item {index}" for index in range(5)]
+        data[f"count{section}"] = section
+    return data
+
+
+def translated(values: list[str], language: int) -> list[str]:
+    """Return values as if translated into language, leaving numbers alone."""
+    return [value if value.isdigit() else f"{value} ({language})" for value in values]
+
+
+def run() -> None:
+    """Run benchmark."""
+    english = generate_english()
+
+    start = time.perf_counter()
+    old_results = []
+    for language in range(LANGUAGES):
+        keys, values = extricate.dict_to_list(english)
+        old_results.append(extricate.list_to_dict(keys, translated(values, language)))
+    old_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new_results = []
+    plan = extricate.FlattenPlan(english)
+    for language in range(LANGUAGES):
+        new_results.append(plan.rebuild(translated(plan.values, language)))
+    new_time = time.perf_counter() - start
+
+    assert new_results == old_results
+    print(
+        f"{LANGUAGES} languages of {len(plan.values)} values: "
+        f"FlattenPlan {new_time:.3f}s, dict_to_list and list_to_dict {old_time:.3f}s ({old_time / new_time:.1f}x)",
+    )
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
+    run()
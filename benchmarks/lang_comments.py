@@ -0,0 +1,153 @@
+"""Lang Comments Benchmark - Compare comment insertion of convert.dict_to_lang with the old one."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Lang Comments Benchmark - Compare comment insertion of convert.dict_to_lang with the old one.
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Lang Comments Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+__license__ = "GNU General Public License Version 3"
+
+
+import json
+import time
+from typing import Any
+
+from localization_translation import convert
+
+LINES = 100_000
+
+
+def legacy_dict_to_lang(
+    data: dict[str, Any],
+    comments: dict[str, dict[int, str]],
+) -> str:
+    """Convert data and comments to MineOS file data, like convert.dict_to_lang used to."""
+    json_data = json.dumps(
+        data,
+        ensure_ascii=False,
+        indent="\t",
+        separators=(",", " = "),
+    )
+    new_lines: list[str] = []
+    section: list[tuple[str, int]] = [("null", 0)]
+    for line in json_data.splitlines():
+        idx = len(new_lines)
+
+        indent = line.count("\t") * "\t"
+
+        if (" = " in line and line.split(" = ")[1].strip() == "[") or line.strip() == "[":
+            line = line.replace("[", "{", 1)
+        if line.strip() in {"],", "]"}:
+            line = line.replace("]", "}", 1)
+
+        if "{" in line:
+            key = "dict"
+            if " = " in line:
+                key = line.split(" = ", 1)[0].strip()
+                if key.startswith('"') and key.endswith('"'):
+                    key = key[1:-1]
+            section.append((key, idx))
+
+        if "}" in line:
+            path = "/".join(s[0] for s in section)
+            sec_start = section.pop()[1]
+            if path in comments:
+                for offset, comment in comments[path].items():
+                    pos = sec_start + offset
+                    indent = "" if pos >= len(new_lines) else new_lines[pos].count("\t") * "\t"
+                    comment = f"{indent}-- {comment}" if comment else indent
+                    new_lines.insert(pos, comment)
+
+        if " = " in line:
+            key, value = line.split(" = ", 1)
+            key = key.strip()
+
+            if key.startswith('"') and key.endswith('"'):
+                key = key[1:-1]
+            if key.isdigit():
+                key = f"[{key}]"
+
+            line = f"{indent}{key} = {value}"
+
+        # VK app has strange thing
+        if "$$$$" in line:
+            value = line.strip().replace("$$$$", "", 1)
+            line = f"{indent}[0] = {value}"
+        new_lines.append(line)
+
+    for _ in range(len(section)):
+        path = "/".join(s[0] for s in section)
+        sec_start = section.pop()[1]
+        if path in comments:
+            for offset, comment in comments[path].items():
+                pos = sec_start + offset
+                indent = "" if pos >= len(new_lines) else new_lines[pos].count("\t") * "\t"
+
+                comment = f"{indent}-- {comment}" if comment else indent
+                new_lines.insert(pos, comment)
+
+    return "\n".join(new_lines)
+
+
+def generate_files_cfg(lines: int, sections: int) -> str:
+    """Return Installer/Files.cfg style file of about lines lines in sections lists, with a comment every ten."""
+    per_section = lines // sections
+    text = ["{"]
+    for section in range(sections):
+        text.append(f"\tsection{section} = {{")
+        for index in range(per_section):
+            if index % 50 == 0:
+                text.append("")
+            if index % 10 == 0:
+                text.append(f"\t\t-- Group {index // 10} of section {section}")
+            text.append(f'\t\t"Applications/App{section}_{index}.app/Main.lua",')
+        text[-1] = text[-1].removesuffix(",")
+        text.append("\t},")
+    text[-1] = "\t}"
+    text.append("}")
+    return "\n".join(text)
+
+
+def run() -> None:
+    """Run benchmark."""
+    for sections in (1, 10):
+        text = generate_files_cfg(LINES, sections)
+        data, comments = convert.lang_to_json(text)
+        comment_count = sum(map(len, comments.values()))
+
+        start = time.perf_counter()
+        new = convert.dict_to_lang(data, comments)
+        new_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        old = legacy_dict_to_lang(data, comments)
+        old_time = time.perf_counter() - start
+
+        assert new == old
+        print(
+            f"{text.count(chr(10)) + 1} lines in {sections} sections, {comment_count} comments: "
+            f"dict_to_lang {new_time:.3f}s, legacy {old_time:.3f}s ({old_time / new_time:.1f}x)",
+        )
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
+    run()
@@ -0,0 +1,96 @@
+"""Lang Loading Benchmark - Compare reading cached lang files with memory mapping them."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Lang Loading Benchmark - Compare reading cached lang files with memory mapping them.
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Lang Loading Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+__license__ = "GNU General Public License Version 3"
+
+
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from localization_translation import convert_parse, lua_parser
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+FILES = 10
+KEYS = 20_000
+
+
+def generate_tree(folder: str) -> list[str]:
+    """Write FILES lang files with KEYS values each to folder and return their filenames."""
+    filenames = []
+    for file_index in range(FILES):
+        lines = ["{", "\t-- Generated localization file"]
+        lines.extend(f'\tkey{index} = "Value {index} of file {file_index}, translated",' for index in range(KEYS))
+        lines.append("}")
+        filename = os.path.join(folder, f"Language{file_index}.lang")
+        with open(filename, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines))
+        filenames.append(filename)
+    return filenames
+
+
+def read_and_parse(filename: str) -> object:
+    """Return value of lang file, reading and decoding all of it first."""
+    with open(filename, encoding="utf-8") as file:
+        text = file.read()
+    return lua_parser.read_lua_table(lua_parser.TokenStream(text).without_cst(), False)[0]
+
+
+def measure(loader: Callable[[str], object], filenames: list[str]) -> tuple[float, int]:
+    """Return seconds taken to load every file one after another, and peak traced bytes while doing so."""
+    start = time.perf_counter()
+    for filename in filenames:
+        loader(filename)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    for filename in filenames:
+        loader(filename)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run() -> None:
+    """Run benchmark."""
+    with tempfile.TemporaryDirectory() as folder:
+        filenames = generate_tree(folder)
+        size = sum(os.path.getsize(filename) for filename in filenames)
+        assert read_and_parse(filenames[0]) == convert_parse.read_lang_file(filenames[0])
+        print(f"{FILES} files, {size / 1024 / 1024:.1f} MiB")
+        for name, loader in (
+            ("read and parse", read_and_parse),
+            ("read_lang_file", convert_parse.read_lang_file),
+        ):
+            elapsed, peak = measure(loader, filenames)
+            print(f"{name:>15}: {elapsed:.3f}s, peak {peak / 1024 / 1024:.2f} MiB")
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
+    run()
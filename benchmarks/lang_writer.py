@@ -0,0 +1,89 @@
+"""Lang Writer Benchmark - Compare dict_to_lang with splicing values into the source."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Lang Writer Benchmark - Compare dict_to_lang with splicing values into the source.
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Lang Writer Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+__license__ = "GNU General Public License Version 3"
+
+
+import time
+
+from localization_translation import convert_parse
+
+SIZES = (1_000, 10_000, 50_000)
+
+
+def generate_lang(keys: int) -> str:
+    """Return MineOS style lang table with keys values and a list table every hundred keys."""
+    lines = ["{"]
+    for index in range(keys):
+        if index % 100 == 99:
+            lines.append(f"\tlist{index} = {{")
+            lines.extend(f'\t\t"Entry {entry} of list {index}",' for entry in range(10))
+            lines.append("\t},")
+        else:
+            lines.append(f'\tkey{index} = "Localization value number {index}",')
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def translate(data: dict[str | int | float, object]) -> dict[str | int | float, object]:
+    """Return copy of data with every string value changed."""
+    return {
+        key: translate(value) if isinstance(value, dict) else f"{value}!" if isinstance(value, str) else value  # type: ignore[arg-type]
+        for key, value in data.items()
+    }
+
+
+def run() -> None:
+    """Run benchmark."""
+    for keys in SIZES:
+        text = generate_lang(keys)
+
+        start = time.perf_counter()
+        data, comments = convert_parse.lang_to_dict(text)
+        old_parse = time.perf_counter() - start
+        translated = translate(data)
+        start = time.perf_counter()
+        convert_parse.dict_to_lang(translated, comments)
+        old_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        data, document = convert_parse.lang_to_document(text)
+        new_parse = time.perf_counter() - start
+        translated = translate(data)
+        start = time.perf_counter()
+        new = convert_parse.document_to_lang(translated, document)
+        new_write = time.perf_counter() - start
+
+        assert new == text.replace('",', '!",')
+        print(
+            f"{keys:>6} keys ({len(text) / 1024:.0f} KiB): "
+            f"lang_to_document {new_parse:.3f}s, lang_to_dict {old_parse:.3f}s; "
+            f"document_to_lang {new_write:.3f}s, dict_to_lang {old_write:.3f}s",
+        )
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
+    run()
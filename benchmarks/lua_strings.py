@@ -0,0 +1,108 @@
+"""Lua String Benchmark - Compare string_value with the old character loop decoder."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Lua String Benchmark - Compare string_value with the old character loop decoder.
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Lua String Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+__license__ = "GNU General Public License Version 3"
+
+
+import time
+from typing import TYPE_CHECKING
+
+from localization_translation import lua_parser
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+VALUES = 200_000
+ROUNDS = 5
+
+
+def legacy_string_value(text: str) -> str:
+    """Decode string literal like Parser.parse_string_literal used to, one character at a time."""
+    value = ""
+    skip = 0  # Number of chars to not add to running value
+    for idx, char in enumerate(text):
+        if skip:
+            skip -= 1
+            continue
+        if char != "\\":
+            value += char
+            continue
+        # Is escape sequence start, so read next char to find which one
+        value += text[idx + 1].translate(
+            {
+                97: "\a",
+                98: "\b",
+                102: "\f",
+                110: "\n",
+                114: "\r",
+                116: "\t",
+                118: "\v",
+                92: "\\",
+            },
+        )
+        skip = 1
+    return value[1:-1]
+
+
+def generate_literals(count: int) -> list[str]:
+    """Return string literal token texts like the ones in lang files, one in ten with escapes."""
+    literals = []
+    for index in range(count):
+        if index % 10 == 0:
+            literals.append(f'"Line {index}\\nPress \\"OK\\" to continue\\t({index}%)"')
+        else:
+            literals.append(f'"Localization value number {index}, shown in the settings window"')
+    return literals
+
+
+def measure(decoder: Callable[[str], str], literals: list[str]) -> float:
+    """Return best time of decoding every literal."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for literal in literals:
+            decoder(literal)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run() -> None:
+    """Run benchmark."""
+    literals = generate_literals(VALUES)
+    for literal in literals[:10]:
+        assert lua_parser.string_value(literal) == legacy_string_value(literal)
+    old = measure(legacy_string_value, literals)
+    new = measure(lua_parser.string_value, literals)
+    print(f"{VALUES} string literals: string_value {new:.3f}s, legacy {old:.3f}s ({old / new:.1f}x)")
+    values = [lua_parser.string_value(literal) for literal in literals]
+    start = time.perf_counter()
+    for value in values:
+        lua_parser.encode_string(value)
+    print(f"encode_string: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
+    run()
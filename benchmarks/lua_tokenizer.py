@@ -0,0 +1,189 @@
+"""Lua Tokenizer Benchmark - Compare tokenize_cst with the old slicing tokenizer and TokenStream."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Lua Tokenizer Benchmark - Compare tokenize_cst with the old slicing tokenizer.
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Lua Tokenizer Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+__license__ = "GNU General Public License Version 3"
+
+
+import re
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from localization_translation import lua_parser
+from localization_translation.lua_parser import (
+    Assignment,
+    Comment,
+    End,
+    Identifier,
+    Newline,
+    Numeric,
+    ParseError,
+    Separator,
+    StrLit,
+    Token,
+    Whitespace,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Iterable
+
+# Old patterns, anchored with ^ since they were only used at the start of text
+IDENTIFIER = re.compile(r"^[a-z_][a-z_\d]*", re.IGNORECASE)
+COMMENT = re.compile("--.*\n")
+NUMERIC = re.compile(r"^-?(\d+)(\.\d+)?(e(?:-|\+)?\d+)?")
+HEXADECIMAL = re.compile(
+    r"(0x[a-f\d]+)(\.[a-f\d]+)?(p(?:-|\+)?\d+)?",
+    re.IGNORECASE,
+)
+
+# Sizes of generated input in bytes
+SIZES = (64_000, 256_000, 1_000_000, 4_000_000)
+# Skip the old tokenizer past this size, it takes too long
+LEGACY_LIMIT = 2_000_000
+
+
+def legacy_tokenize_cst(text: str) -> Generator[Token, None, None]:
+    """Tokenize like tokenize_cst did before, slicing off text after every token."""
+    line = 1
+    column = -1
+
+    while True:
+        read = 1
+        last_line = line
+        token: type[Token] | None = End
+
+        if not text:
+            read = 0
+        elif text[0] in {" ", "\r", "\t"}:
+            while read < len(text) and text[read] in {" ", "\r", "\t"}:
+                read += 1
+            token = Whitespace
+        elif text[0] == "\n":
+            token = Newline
+            line += 1
+        elif text[0] in "()[]{},;":
+            token = Separator
+        elif text.startswith("--"):
+            match_ = COMMENT.match(text)
+            if not match_:
+                raise ParseError(f"Could not parse comment from {text!r}")
+
+            token = Comment
+            read = match_.end() - 1
+        elif text[0] == "=":
+            token = Assignment
+        elif text[0] in {'"', "'"}:
+            read = 1
+            start_bracket = text[0]
+            while read < len(text):
+                char = text[read]
+                if char == start_bracket and text[read - 1] != "\\":
+                    read += 1
+                    break
+                read += 1
+
+            token = StrLit
+        else:
+            if match_ := (HEXADECIMAL.match(text) or NUMERIC.match(text)):
+                token = Numeric
+                read = match_.end()
+            elif match_ := IDENTIFIER.match(text):
+                token = Identifier
+                read = match_.end()
+            else:
+                raise ParseError(f"Could not parse {text!r}")
+
+        if last_line != line:
+            column = -1
+        else:
+            column += read
+
+        if token is not None:
+            yield token(text[:read], line, column)
+            if issubclass(token, End):
+                break
+        text = text[read:]
+
+
+def generate_lang(size: int) -> str:
+    """Return MineOS style lang table text of about size characters."""
+    lines = ["-- Generated localization file", "{"]
+    total = 0
+    index = 0
+    while total < size:
+        line = f'\tkey{index} = "Localization value number {index}, with \\"quotes\\"", -- note {index}'
+        if index % 5 == 0:
+            line = f"\tcount{index} = {index}.5e-2,"
+        lines.append(line)
+        total += len(line) + 1
+        index += 1
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def measure(tokenizer: Callable[[str], Iterable[Token]], text: str) -> tuple[float, list[Token]]:
+    """Return seconds taken to tokenize text and the tokens."""
+    start = time.perf_counter()
+    tokens = list(tokenizer(text))
+    return time.perf_counter() - start, tokens
+
+
+def measure_memory(text: str) -> tuple[int, int]:
+    """Return bytes held by token list and by token stream of text."""
+    tracemalloc.start()
+    tokens = list(lua_parser.tokenize_cst(text))
+    list_size = tracemalloc.get_traced_memory()[0]
+    del tokens
+    tracemalloc.stop()
+    tracemalloc.start()
+    stream = lua_parser.TokenStream(text)
+    stream_size = tracemalloc.get_traced_memory()[0]
+    del stream
+    tracemalloc.stop()
+    return list_size, stream_size
+
+
+def run() -> None:
+    """Run benchmark."""
+    for size in SIZES:
+        text = generate_lang(size)
+        new_time, tokens = measure(lua_parser.tokenize_cst, text)
+        result = f"{len(text):>9} chars, {len(tokens):>8} tokens: tokenize_cst {new_time:7.3f}s"
+        if len(text) <= LEGACY_LIMIT:
+            old_time, old_tokens = measure(legacy_tokenize_cst, text)
+            assert old_tokens == tokens, "tokenizers disagree"
+            assert [type(token) for token in old_tokens] == [type(token) for token in tokens]
+            result += f", legacy {old_time:7.3f}s ({old_time / new_time:.1f}x)"
+        print(result)
+    list_size, stream_size = measure_memory(generate_lang(SIZES[2]))
+    print(
+        f"Memory for {SIZES[2]} chars: token list {list_size / 1e6:.1f} MB, "
+        f"token stream {stream_size / 1e6:.1f} MB ({list_size / stream_size:.1f}x smaller)",
+    )
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
+    run()
@@ -0,0 +1,68 @@
+"""Mock Backend Benchmark - Measure translation throughput without the network."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Mock Backend Benchmark - Measure translation throughput without the network.
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Mock Backend Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+__license__ = "GNU General Public License Version 3"
+
+
+import httpx
+import trio
+
+from localization_translation import backends, translate
+from localization_translation.mock_server import MockTranslateServer
+
+SENTENCES = 600
+LANGUAGES = ("es", "fr", "de", "ru", "ja", "pl", "uk", "it", "nl", "pt")
+LATENCY = 0.05
+
+
+async def async_run() -> None:
+    """Translate a fake lang file to several languages through the mock server."""
+    server = MockTranslateServer(latency=LATENCY)
+    sentences: list[str | int] = [f"Localization value number {i}" for i in range(SENTENCES)]
+    async with trio.open_nursery() as nursery:
+        await nursery.start(server.serve)
+        async with httpx.AsyncClient(http2=True) as client:
+            backend = backends.MockServerBackend(client, server)
+            start = trio.current_time()
+            async with trio.open_nursery() as languages:
+                for code in LANGUAGES:
+                    languages.start_soon(translate.translate_async, client, sentences, code, "en", None, backend)
+            elapsed = trio.current_time() - start
+        nursery.cancel_scope.cancel()
+
+    total = SENTENCES * len(LANGUAGES)
+    health = backend.health()
+    print(f"{total} sentences in {server.requests} requests, {elapsed:.2f} seconds")
+    print(f"{total / elapsed:.0f} sentences/second, {health.average_latency * 1000:.1f} ms average latency")
+
+
+def run() -> None:
+    """Run benchmark."""
+    trio.run(async_run)
+
+
+if __name__ == "__main__":
+    print(f"{__title__} v{__version__}\nProgrammed by {__author__}.\n")
+    run()
@@ -0,0 +1,131 @@
+"""Value Store Benchmark - Compare memory of value lists with a ValueStore."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Value Store Benchmark - Compare memory of value lists with a ValueStore.
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Value Store Benchmark"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+__license__ = "GNU General Public License Version 3"
+
+
+import json
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from localization_translation import extricate
+from localization_translation.value_store import ValueStore
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Generated files, languages per file and keys per file
+FILES = 200
+LANGUAGES = 30
+KEYS = 100
+# Most MineOS strings are shared, like "OK", "Cancel" and app names
+COMMON = 300
+
+
+def generate_file(file: int, language: int) -> str:
+    """Return JSON text of file in language, reusing common strings."""
+    data = {}
+    for key in range(KEYS):
+        if key % 4:
+            text = f"Common string {(file * 7 + key) % COMMON} in language {language}"
+        else:
+            text = f"File {file} string {key} in language {language}"
+        data[f"key{key}"] = text
+    return json.dumps(data)
+
+
+def load_lists() -> dict[tuple[int, int], list[str]]:
+    """Return values list of every file in every language."""
+    values = {}
+    for file in range(FILES):
+        for language in range(LANGUAGES):
+            values[file, language] = extricate.flatten_paths(json.loads(generate_file(file, language)))[1]
+    return values
+
+
+def load_store() -> ValueStore:
+    """Return ValueStore of every file in every language."""
+    store = ValueStore()
+    for file in range(FILES):
+        for language in range(LANGUAGES):
+            data = json.loads(generate_file(file, language))
+            if language:
+                store.set_values(str(file), str(language), extricate.flatten_paths(data)[1])
+            else:
+                store.add_data(str(file), str(language), data)
+    return store
+
+
+def measure_memory(function: Callable[[], object]) -> int:
+    """Return bytes still held by result of function."""
+    tracemalloc.start()
+    result = function()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def list_changes(old: list[str], new: list[str]) -> list[int]:
+    """Return indexes where value lists old and new differ."""
+    return [index for index, (first, second) in enumerate(zip(old, new, strict=True)) if first != second]
+
+
+def run() -> None:
+    """Run benchmark."""
+    list_size = measure_memory(load_lists)
+    store_size = measure_memory(load_store)
+    print(
+        f"{FILES} files in {LANGUAGES} languages: value lists {list_size / 1e6:.1f} MB, "
+        f"value store {store_size / 1e6:.1f} MB ({list_size / store_size:.1f}x smaller)",
+    )
+
+    lists = load_lists()
+    store = load_store()
+    # Revision of language 0 with a few changed values, as after editing
+    revised = {}
+    for file in range(FILES):
+        # Read again like a file saved after editing, so no strings are shared
+        values = json.loads(json.dumps(lists[file, 0]))
+        values[file % KEYS] += " (edited)"
+        revised[file] = values
+        store.set_values(str(file), "revised", values)
+    start = time.perf_counter()
+    list_count = sum(len(list_changes(lists[file, 0], revised[file])) for file in range(FILES))
+    list_time = time.perf_counter() - start
+    start = time.perf_counter()
+    store_count = sum(len(store.changed(str(file), "0", "revised")) for file in range(FILES))
+    store_time = time.perf_counter() - start
+    assert list_count == store_count == FILES
+    print(
+        f"Changed keys between revisions: value lists {list_time:.4f}s, "
+        f"value store {store_time:.4f}s ({list_time / store_time:.1f}x)",
+    )
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
+    run()
@@ -0,0 +1,187 @@
+"""Backends - Pluggable translation services."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Backends - Pluggable translation services
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Backends"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+
+from typing import TYPE_CHECKING, Final, NamedTuple, Protocol
+
+import trio
+
+from localization_translation import translate
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import httpx
+
+    from localization_translation.mock_server import MockTranslateServer
+
+# Consecutive failures before a backend reports itself unhealthy
+UNHEALTHY_FAILURES: Final = 3
+
+
+class BackendCapabilities(NamedTuple):
+    """What a backend can handle in one request."""
+
+    max_batch_size: int  # Most sentences per request
+    max_chars: int  # Most URL encoded query characters per request
+
+
+class BackendHealth(NamedTuple):
+    """Health report of a backend."""
+
+    healthy: bool
+    requests: int
+    failures: int
+    average_latency: float  # Seconds per successful batch, including waiting for a request slot
+    last_error: str | None
+
+
+class TranslationBackend(Protocol):
+    """Service that can translate batches of sentences."""
+
+    @property
+    def name(self) -> str:
+        """Name of backend."""
+
+    @property
+    def capabilities(self) -> BackendCapabilities:
+        """Limits of what the backend can handle in one request."""
+
+    async def translate_batch(
+        self,
+        sentences: Sequence[str],
+        to_lang: str,
+        source_lang: str = "auto",
+    ) -> list[str]:
+        """Return sentences translated from source_lang to to_lang."""
+
+    def health(self) -> BackendHealth:
+        """Return health report."""
+
+
+class HealthTracker:
+    """Keep track of backend request outcomes."""
+
+    __slots__ = ("consecutive_failures", "failures", "last_error", "requests", "total_latency")
+
+    def __init__(self) -> None:
+        """Initialize counters."""
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.total_latency = 0.0
+        self.last_error: str | None = None
+
+    def succeeded(self, latency: float) -> None:
+        """Record successful request that took latency seconds."""
+        self.requests += 1
+        self.consecutive_failures = 0
+        self.total_latency += latency
+
+    def failed(self, error: str) -> None:
+        """Record failed request."""
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = error
+
+    def report(self) -> BackendHealth:
+        """Return health report."""
+        successes = self.requests - self.failures
+        return BackendHealth(
+            healthy=self.consecutive_failures < UNHEALTHY_FAILURES,
+            requests=self.requests,
+            failures=self.failures,
+            average_latency=self.total_latency / successes if successes else 0.0,
+            last_error=self.last_error,
+        )
+
+
+GOOGLE_CAPABILITIES: Final = BackendCapabilities(translate.MAX_BATCH_SIZE, translate.MAX_QUERY_LENGTH)
+
+
+class GoogleBackend:
+    """Google Translate, or anything else that speaks the gtx protocol."""
+
+    __slots__ = ("base_url", "capabilities", "client", "name", "tracker")
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        base_url: str = translate.GOOGLE_TRANSLATE_URL,
+        name: str = "google",
+        capabilities: BackendCapabilities = GOOGLE_CAPABILITIES,
+    ) -> None:
+        """Initialize with client to send requests with and endpoint URL."""
+        self.client = client
+        self.base_url = base_url
+        self.name = name
+        self.capabilities = capabilities
+        self.tracker = HealthTracker()
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}({self.name!r}, {self.base_url!r})"
+
+    async def translate_batch(
+        self,
+        sentences: Sequence[str],
+        to_lang: str,
+        source_lang: str = "auto",
+    ) -> list[str]:
+        """Return sentences translated from source_lang to to_lang."""
+        start = trio.current_time()
+        try:
+            results = await translate.get_translated_batch_coroutine(
+                self.client,
+                sentences,
+                to_lang,
+                source_lang,
+                self.base_url,
+            )
+        except Exception as exc:
+            self.tracker.failed(repr(exc))
+            raise
+        self.tracker.succeeded(trio.current_time() - start)
+        return results
+
+    def health(self) -> BackendHealth:
+        """Return health report."""
+        return self.tracker.report()
+
+
+class MockServerBackend(GoogleBackend):
+    """Backend talking to a local mock translation server, for measuring without the network."""
+
+    __slots__ = ()
+
+    def __init__(self, client: httpx.AsyncClient, server: MockTranslateServer) -> None:
+        """Initialize with client and running server."""
+        super().__init__(client, server.url, "mock")
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
@@ -32,6 +32,7 @@ from typing import TYPE_CHECKING
 import httpx
 import trio
 
+from localization_translation import scheduler, translate
 from localization_translation.mineos_auto_trans import (
     __version__,
     translate_broken_values,
@@ -108,6 +109,17 @@ class DumpAction(argparse.Action):
         parser.exit()
 
 
+def positive_int(value: str) -> int:
+    """Return value as integer, raising ArgumentTypeError if it is not positive."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 async def async_run(
     parser: argparse.ArgumentParser,
     args: argparse.Namespace,
@@ -170,10 +182,25 @@ def main() -> None:
         dest="key",
     )
 
+    parser.add_argument(
+        "--max-requests",
+        type=positive_int,
+        default=scheduler.MAX_CONCURRENT,
+        help="Maximum number of requests in flight at once (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-per-host",
+        type=positive_int,
+        default=scheduler.MAX_PER_HOST,
+        help="Maximum number of requests in flight to any one host (default: %(default)s)",
+    )
+
     args = parser.parse_args()
 
     logging.basicConfig(level=logging.WARNING)
 
+    translate.SCHEDULER.set_limits(args.max_requests, args.max_per_host)
+
     is_new_key = args.filename and args.key
     if not (args.unhandled or args.broken or args.lolcat or is_new_key):
         parser.print_help()
@@ -26,8 +26,13 @@ __version__ = "1.4.2"
 __license__ = "GNU General Public License Version 3"
 
 
+import bisect
 import json
-from typing import Any
+from itertools import pairwise
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
 
 
 def squish(text: str) -> str:
@@ -218,6 +223,40 @@ def lang_to_json(
         raise
 
 
+def insert_comments(lines: list[str], start: int, comments: dict[int, str]) -> str | None:
+    """Insert comments of section starting at index start into lines.
+
+    Comments are keyed by offset from start. Result is the same as
+    inserting every comment at start + offset in order, indented like
+    the line it is inserted before, but when offsets are ascending, as
+    they are when read by lang_to_json, the lines of the section are
+    merged with the comments in one pass instead of moving every line
+    after each comment. Return indent of last comment, or None if there
+    were no comments.
+    """
+    indent: str | None = None
+    offsets = list(comments)
+    if offsets and (offsets[0] < 0 or any(a >= b for a, b in pairwise(offsets))):
+        for offset, comment in comments.items():
+            pos = start + offset
+            indent = "" if pos >= len(lines) else lines[pos].count("\t") * "\t"
+            lines.insert(pos, f"{indent}-- {comment}" if comment else indent)
+        return indent
+    section = lines[start:]
+    merged: list[str] = []
+    read = 0
+    for offset, comment in comments.items():
+        # Lines before offset come first
+        take = max(offset - len(merged), 0)
+        merged.extend(section[read : read + take])
+        read = min(read + take, len(section))
+        indent = section[read].count("\t") * "\t" if read < len(section) else ""
+        merged.append(f"{indent}-- {comment}" if comment else indent)
+    merged.extend(section[read:])
+    lines[start:] = merged
+    return indent
+
+
 def dict_to_lang(
     data: dict[str, Any],
     comments: dict[str, dict[int, str]],
@@ -230,6 +269,7 @@ def dict_to_lang(
         separators=(",", " = "),
     )
     new_lines: list[str] = []
+    # Path and start line of open sections
     section: list[tuple[str, int]] = [("null", 0)]
     for line in json_data.splitlines():
         idx = len(new_lines)
@@ -247,17 +287,14 @@ def dict_to_lang(
                 key = line.split(" = ", 1)[0].strip()
                 if key.startswith('"') and key.endswith('"'):
                     key = key[1:-1]
-            section.append((key, idx))
+            section.append((f"{section[-1][0]}/{key}", idx))
 
         if "}" in line:
-            path = "/".join(s[0] for s in section)
-            sec_start = section.pop()[1]
+            path, sec_start = section.pop()
             if path in comments:
-                for offset, comment in comments[path].items():
-                    pos = sec_start + offset
-                    indent = "" if pos >= len(new_lines) else new_lines[pos].count("\t") * "\t"
-                    comment = f"{indent}-- {comment}" if comment else indent
-                    new_lines.insert(pos, comment)
+                last_indent = insert_comments(new_lines, sec_start, comments[path])
+                if last_indent is not None:
+                    indent = last_indent
 
         if " = " in line:
             key, value = line.split(" = ", 1)
@@ -276,78 +313,208 @@ def dict_to_lang(
             line = f"{indent}[0] = {value}"
         new_lines.append(line)
 
-    for _ in range(len(section)):
-        path = "/".join(s[0] for s in section)
-        sec_start = section.pop()[1]
+    while section:
+        path, sec_start = section.pop()
         if path in comments:
-            for offset, comment in comments[path].items():
-                pos = sec_start + offset
-                indent = "" if pos >= len(new_lines) else new_lines[pos].count("\t") * "\t"
-
-                comment = f"{indent}-- {comment}" if comment else indent
-                new_lines.insert(pos, comment)
+            insert_comments(new_lines, sec_start, comments[path])
 
     return "\n".join(new_lines)
 
 
+def common_length(a: Sequence[object], b: Sequence[object], x: int = 0, y: int = 0) -> int:
+    """Return how many items of a from index x equal items of b from index y."""
+    limit = min(len(a) - x, len(b) - y)
+    length = 0
+    # Compare growing slices, much faster than item by item for long runs
+    step = 1
+    while step:
+        end = length + step
+        if end <= limit and a[x + length : x + end] == b[y + length : y + end]:
+            length = end
+            step *= 2
+        else:
+            step //= 2
+    return length
+
+
+def diff_runs(old: Sequence[object], new: Sequence[object]) -> list[tuple[int, int, int]]:
+    """Return runs of lines kept from old in new as old start, new start and length, in order.
+
+    Common prefix and suffix are matched directly, and the rest with
+    Myers' greedy diff, so time is about linear in line count when only
+    a few lines change.
+    """
+    prefix = common_length(old, new)
+    suffix = common_length(old[prefix:][::-1], new[prefix:][::-1])
+    a = old[prefix : len(old) - suffix]
+    b = new[prefix : len(new) - suffix]
+    n, m = len(a), len(b)
+
+    # Furthest x reached on each diagonal k = x - y, kept for every edit count
+    furthest = {1: 0}
+    trace: list[dict[int, int]] = []
+    for edits in range(n + m + 1):
+        trace.append(furthest.copy())
+        for k in range(-edits, edits + 1, 2):
+            if k == -edits or (k != edits and furthest[k - 1] < furthest[k + 1]):
+                x = furthest[k + 1]
+            else:
+                x = furthest[k - 1] + 1
+            x += common_length(a, b, x, x - k)
+            furthest[k] = x
+            y = x - k
+            if x >= n and y >= m:
+                break
+        else:
+            continue
+        break
+
+    # Walk back through trace collecting diagonal runs
+    runs: list[tuple[int, int, int]] = []
+    x, y = n, m
+    for edits in range(len(trace) - 1, -1, -1):
+        furthest = trace[edits]
+        k = x - y
+        # Same choice as going forward, insertion or deletion
+        insertion = k == -edits or (k != edits and furthest[k - 1] < furthest[k + 1])
+        prev_k = k + 1 if insertion else k - 1
+        prev_x = furthest[prev_k]
+        prev_y = prev_x - prev_k
+        run = min(x - prev_x, y - prev_y)
+        if run > 0:
+            runs.append((prefix + x - run, prefix + y - run, run))
+        x, y = prev_x, prev_y
+    runs.append((0, 0, prefix))
+    runs.reverse()
+    runs.append((len(old) - suffix, len(new) - suffix, suffix))
+    return [run for run in runs if run[2]]
+
+
+def data_lines(
+    data: dict[str, Any],
+) -> tuple[list[object], list[tuple[str, int, int]], list[tuple[bool, int]]]:
+    """Return what lines dict_to_lang writes for data, without comments.
+
+    Result is a key for every line, comparable between versions of data,
+    the path, open line and close line of every section, and open and
+    close events of sections in file order.
+    """
+    lines: list[object] = []
+    sections: list[tuple[str, int, int]] = [("null", 0, -1)]
+    events: list[tuple[bool, int]] = [(True, 0)]
+
+    def add(path: str, head: object, value: dict[str, Any] | list[Any]) -> None:
+        index = len(sections)
+        sections.append((path, len(lines), -1))
+        events.append((True, index))
+        lines.append(head)
+        if value:
+            items = value.items() if isinstance(value, dict) else enumerate(value)
+            values = value.values() if isinstance(value, dict) else value
+            if not {dict, list} & set(map(type, values)):
+                # Section of plain values, most of Files.cfg
+                lines.extend(items if isinstance(value, dict) else value)
+            else:
+                for key, child in items:
+                    if isinstance(child, (dict, list)):
+                        if isinstance(value, dict):
+                            add(f"{path}/{key}", (key, "{"), child)
+                        else:
+                            add(f"{path}/dict", "{", child)
+                    else:
+                        lines.append((key, child) if isinstance(value, dict) else child)
+            lines.append("}")
+        sections[index] = (path, sections[index][1], len(lines) - 1)
+        events.append((False, index))
+
+    add("null/dict", "{", data)
+    sections[0] = ("null", 0, len(lines) - 1)
+    events.append((False, 0))
+    return lines, sections, events
+
+
 def update_comment_positions(
     original_pos: dict[str, dict[int, str]],
     new_data: dict[str, Any],
     old_data: dict[str, Any],
 ) -> dict[str, dict[int, str]]:
-    """Update comment positions."""
-    # Get json text of files
-    old_json = json.dumps(old_data, indent="\t").splitlines()
-    new_json = json.dumps(new_data, indent="\t").splitlines()
+    """Return comments of old_data moved to where they belong in new_data.
+
+    Every comment stays before the line it was before in old_data, found
+    by diffing the lines of both files. If that line is gone, comment
+    goes where the lines replacing it start. Sections are worked out
+    again from where comments end up, so comments of any section move
+    with it.
+    """
+    old_lines, old_sections, old_events = data_lines(old_data)
+
+    # Lay out old file like dict_to_lang, lines as their index and
+    # comments as negative numbers, to find line after every comment
+    anchors: list[tuple[int, str]] = []
+    layout: list[int] = []
+    starts: dict[int, int] = {}
+    for is_open, index in old_events:
+        path, open_line, close_line = old_sections[index]
+        if is_open:
+            layout.extend(range(len(layout) - len(anchors), open_line))
+            starts[index] = len(layout)
+            continue
+        layout.extend(range(len(layout) - len(anchors), close_line + 1))
+        if path not in original_pos:
+            continue
+        section = layout[starts[index] :]
+        merged: list[int] = []
+        read = 0
+        for offset, comment in sorted(original_pos[path].items()):
+            take = max(offset - len(merged), 0)
+            merged.extend(section[read : read + take])
+            read = min(read + take, len(section))
+            if read == len(section):
+                anchor = close_line + 1
+            elif section[read] < 0:
+                anchor = anchors[-1 - section[read]][0]
+            else:
+                anchor = section[read]
+            merged.append(-1 - len(anchors))
+            anchors.append((anchor, comment))
+        merged.extend(section[read:])
+        layout[starts[index] :] = merged
+    # Comments in file order, only comments before the same line are
+    # left in the order they were added
+    anchors.sort(key=lambda anchor: anchor[0])
+
+    # Move lines comments are before to where they are in new version
+    new_lines, new_sections, new_events = data_lines(new_data)
+    runs = diff_runs(old_lines, new_lines)
+    run_starts = [old_start for old_start, _, _ in runs]
+    moved: list[int] = []
+    for line, _ in anchors:
+        found = bisect.bisect_right(run_starts, line) - 1
+        if found < 0:
+            moved.append(0)
+            continue
+        old_start, new_start, length = runs[found]
+        # Lines not kept go where the lines after last kept line start
+        moved.append(new_start + min(line - old_start, length))
 
+    # Find section comments end up in and offsets from its start
     new_comments: dict[str, dict[int, str]] = {}
-
-    # For each name
-    for name in old_data:
-        # Reads include comments, so have to keep track of comments read.
-        read_offset = 0
-
-        # Make predictions of guess where it is in new version more accurate
-        sec_add = 0
-
-        # Find section
-        section = "null/"
-        for item in original_pos:
-            if name in item:
-                section = item
-
-        # If sections of data are not the same
-        if new_data[name] != old_data[name]:
-            # Find start of bock section in new and old json
-            section_start = f'\t"{name}": ['
-            obs = old_json.index(section_start) - 1
-            nbs = new_json.index(section_start) - 1
-            n_end = new_json.index("\t]") + 1
-            # Initialize section
-            new_comments[section] = {}
-            # For each offset in the comments
-            for offset in sorted(original_pos[section]):
-                # Find line comment lives on
-                old_comment = old_json[obs + offset - read_offset]
-
-                # Find start to look for same line in new
-                start = nbs + offset - read_offset + sec_add
-                start = max(nbs, start)
-
-                # Find old comment position in new json
-                new_pos = new_json.index(old_comment, start, n_end)
-
-                # Cumulative additions
-                sec_add = max(sec_add, new_pos - start)
-
-                # New position needs to be offset as well
-                new_pos += read_offset
-
-                # Update offset
-                read_offset += 1
-
-                # Record new comment
-                new_comments[section][new_pos - nbs] = original_pos[section][offset]
+    stack: list[int] = []
+    event_index = 0
+    for rank, (line, (_, comment)) in enumerate(zip(moved, anchors, strict=True)):
+        while event_index < len(new_events):
+            is_open, index = new_events[event_index]
+            _, open_line, close_line = new_sections[index]
+            if is_open and (open_line < line or index == 0):
+                stack.append(index)
+            elif not is_open and close_line < line and index != 0:
+                stack.pop()
+            else:
+                break
+            event_index += 1
+        path, open_line, _ = new_sections[stack[-1]]
+        start = 0 if stack[-1] == 0 else open_line + bisect.bisect_right(moved, open_line)
+        new_comments.setdefault(path, {})[line + rank - start] = comment
     return new_comments
 
 
@@ -25,10 +25,12 @@ __author__ = "CoolCat467"
 __version__ = "0.0.0"
 __license__ = "GNU General Public License Version 3"
 
+import contextlib
+import mmap
 from enum import IntEnum, auto
 from typing import Any, NamedTuple
 
-from localization_translation import lua_parser
+from localization_translation import lua_document, lua_parser
 
 
 class TokenType(IntEnum):
@@ -69,10 +71,8 @@ def lang_to_dict(
     lang_data: str,
 ) -> tuple[dict[str | int | float, Any], CommentData]:
     """Return data and comments from lua table."""
-    all_tokens: list[lua_parser.Token] = list(lua_parser.tokenize_cst(lang_data))
-    parser = lua_parser.Parser([t for t in all_tokens if not isinstance(t, lua_parser.CSTToken)])
-    table_value = parser.parse_value()
-    data, read_tokens = lua_parser.parse_lua_table(table_value, False)
+    stream = lua_parser.TokenStream(lang_data)
+    data, _read_tokens = lua_parser.read_lua_table(stream.without_cst(), False)
     assert isinstance(data, dict)
 
     indent_format: list[IndentFormat] = []
@@ -80,55 +80,53 @@ def lang_to_dict(
 
     i = -1
 
-    def next_token() -> lua_parser.Token:
+    def next_kind() -> type[lua_parser.Token]:
         nonlocal i
         i += 1
-        if i >= len(all_tokens):
+        if i >= len(stream):
             raise ValueError("Reached EOF")
-        return all_tokens[i]
+        return stream.kind(i)
 
-    while i < (len(all_tokens) - 1):
-        token = next_token()
-        text = token.text
-        if isinstance(token, lua_parser.Separator):
+    while i < (len(stream) - 1):
+        kind = next_kind()
+        if kind is lua_parser.Separator:
+            text = stream.text(i)
             if text == "{":
                 key_data.append(Token(TokenType.StartBracket))
                 multiline = False
                 indent_text = " "
-                token = next_token()
-                if isinstance(token, lua_parser.Newline):
+                kind = next_kind()
+                if kind is lua_parser.Newline:
                     multiline = True
-                    token = next_token()
-                if isinstance(token, lua_parser.Whitespace):
-                    indent_text = token.text
+                    kind = next_kind()
+                if kind is lua_parser.Whitespace:
+                    indent_text = stream.text(i)
                 indent_format.append(IndentFormat(multiline, indent_text))
             elif text == ",":
-                if not isinstance(next_token(), lua_parser.Newline):
+                if next_kind() is not lua_parser.Newline:
                     i -= 1
             elif text == "}":
                 if key_data[-1].type_ == TokenType.Newline and key_data[-2].type_ == TokenType.Identifier:
                     del key_data[-1]
                 key_data.append(Token(TokenType.EndBracket))
-                if not isinstance(next_token(), lua_parser.Newline):
+                if next_kind() is not lua_parser.Newline:
                     i -= 1
-        elif isinstance(token, lua_parser.Identifier):
-            key_data.append(Token(TokenType.Identifier, text))
-        elif isinstance(token, lua_parser.Numeric):
-            key_data.append(Token(TokenType.Numeric, text))
-        elif isinstance(token, lua_parser.Comment):
-            key_data.append(Token(TokenType.Comment, text))
-            if not isinstance(next_token(), lua_parser.Newline):
+        elif kind is lua_parser.Identifier:
+            key_data.append(Token(TokenType.Identifier, stream.text(i)))
+        elif kind is lua_parser.Numeric:
+            key_data.append(Token(TokenType.Numeric, stream.text(i)))
+        elif kind is lua_parser.Comment:
+            key_data.append(Token(TokenType.Comment, stream.text(i)))
+            if next_kind() is not lua_parser.Newline:
                 i -= 1
-        elif isinstance(token, lua_parser.Newline):
+        elif kind is lua_parser.Newline:
             key_data.append(Token(TokenType.Newline))
-        elif isinstance(token, lua_parser.Assignment):
-            token = next_token()
-            while isinstance(token, lua_parser.Whitespace):
-                token = next_token()
-            # print(f'{token = }')
-            if not isinstance(token, lua_parser.Numeric):
+        elif kind is lua_parser.Assignment:
+            kind = next_kind()
+            while kind is lua_parser.Whitespace:
+                kind = next_kind()
+            if kind is not lua_parser.Numeric:
                 i -= 1
-                # print(f"{token = }")
 
     return data, CommentData(tuple(indent_format), tuple(key_data))
 
@@ -205,7 +203,7 @@ def dict_to_lang(
                         unbroken_chain = False
                         continue
                     if isinstance(value, str):
-                        value = f'"{value}"'
+                        value = lua_parser.encode_string(value)
                     elif isinstance(value, int | bool):
                         value = repr(value).lower()
                     else:
@@ -261,7 +259,7 @@ def dict_to_lang(
                 if isinstance(value, int | float | bool):
                     line += repr(value).lower()
                 else:
-                    line += f'"{value}"'
+                    line += lua_parser.encode_string(value)
                 if comments.keys[idx + 1].type_ != TokenType.EndBracket:
                     line += ","
                 cartrage_return()
@@ -282,6 +280,88 @@ def dict_to_lang(
     return "\n".join(lines) or "{}"
 
 
+def read_lang_file(filename: str, convert_lists: bool = False) -> object:
+    """Return value of lua table file, without reading the file into memory.
+
+    File is memory mapped and tokenized as bytes while it is parsed, so
+    only the text of one token at a time is ever decoded and held.
+    """
+    with open(filename, "rb") as file:
+        try:
+            view = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can not be mapped
+            view = None
+        with view if view is not None else contextlib.nullcontext():
+            tokens = lua_parser.TokenWindow(lua_parser.tokenize_bytes(b"" if view is None else view))
+            value, _read_tokens = lua_parser.read_lua_table(tokens, convert_lists, keep_tokens=False)
+    return value
+
+
+def lang_to_document(
+    lang_data: str,
+) -> tuple[dict[str | int | float, Any], lua_document.LuaDocument]:
+    """Return data and index of where its values are in lua table source, only tokenizing once."""
+    stream = lua_parser.TokenStream(lang_data)
+    data, _read_tokens = lua_parser.read_lua_table(stream.without_cst(), False)
+    assert isinstance(data, dict)
+    return data, lua_document.LuaDocument(lang_data, stream)
+
+
+def document_to_lang(
+    data: dict[str | int | float, Any],
+    document: lua_document.LuaDocument,
+) -> str:
+    """Return source of document with values changed to the ones in data.
+
+    Instead of rebuilding the file line by line like dict_to_lang does,
+    changed values are spliced over their spans in the original source
+    in one join, so everything else is kept byte for byte and time is
+    linear in the size of the file. New keys are added to the end of
+    their table, and keys missing from data keep their old value.
+    """
+    edited = document.copy()
+    source = document.source
+    # Tables in data by path, so values are not looked up from the root every time
+    tables: dict[lua_document.Path, object] = {(): data}
+
+    def lookup(path: lua_document.Path) -> object:
+        if path in tables:
+            return tables[path]
+        value = lua_document.get_child(lookup(path[:-1]), path[-1])
+        tables[path] = value
+        return value
+
+    for path, node in document.nodes.items():
+        try:
+            value = lua_document.get_child(lookup(path[:-1]), path[-1]) if path else data
+        except KeyError:
+            continue
+        if node.close >= 0:
+            if isinstance(value, dict | list | tuple):
+                for key, item in lua_document.get_fields(value):
+                    if (*path, key) not in document.nodes:
+                        edited.set((*path, key), item)
+            elif path:
+                edited.set(path, value)
+            continue
+        original = source[node.start : node.end]
+        if isinstance(value, str):
+            text = lua_parser.encode_string(value)
+            # Same string might be written differently, like with single quotes
+            if text == original or (original[0] in "\"'[" and lua_parser.string_value(original) == value):
+                continue
+        else:
+            text = lua_document.format_value(value, edited.indentation(node.field_start))
+            if text == original:
+                continue
+            old = lua_document.parse_value(original)
+            if type(old) is type(value) and old == value:
+                continue
+        edited.replacements[path] = text
+    return edited.text()
+
+
 def run() -> None:
     """Run program."""
     text = """{
@@ -25,10 +25,11 @@ __author__ = "CoolCat467"
 __license__ = "GNU General Public License Version 3"
 
 
-from typing import TYPE_CHECKING, Any, Final
+import re
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable
+    from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
 
 
 def wrap_quotes(text: str, quotes: str = '"') -> str:
@@ -67,194 +68,478 @@ SEP: Final = "\x00"
 
 def dict_to_list(data: Any) -> tuple[list[str], list[str]]:
     """Convert dictionary to two lists, one of keys, one of values."""
-
-    def read_block(data: Any) -> tuple[list[str], list[str]]:
-        """Read block."""
+    if type(data) is dict and data:
+        # Flat dictionaries, like every MineOS lang file, skip the general path
         keys: list[str] = []
-        values: list[str] = []
-
-        match type(data).__name__:
-            case "dict" as dtype:
-                assert isinstance(data, dict)  # Mypy doesn't understand
-                # If empty dict
-                if not data:
-                    keys.append(wrap_quotes(SEP, TYPE_CHAR[dtype]))
-                    values.append("")
-                # Will not run if no data to enumerate
-                for key, value in data.items():
-                    # Ensure key won't break everything
-                    intersect = set(str(key)) & (set(CHAR_TYPE) | {SEP})
-                    if intersect:
-                        raise ValueError(
-                            f'Dict key contains CHAR_TYPE value(s) "{"".join(intersect)}' + '"',
-                        )
-
-                    key = wrap_quotes(key, TYPE_CHAR[type(key).__name__])
-                    for block_k, block_v in zip(
-                        *read_block(value),
-                        strict=True,
-                    ):
-                        keys.append(
-                            wrap_quotes(
-                                f"{key}{SEP}{block_k}",
-                                TYPE_CHAR[dtype],
-                            ),
-                        )
-                        values.append(block_v)
-            case "list" as dtype:
-                assert isinstance(data, list)  # Mypy doesn't understand
-                # If empty list
-                if not data:
-                    keys.append(wrap_quotes(f"{SEP}", TYPE_CHAR[dtype]))
-                    values.append("")
-                # Will not run if no data to enumerate
-                for key, value in enumerate(data):
-                    for block_k, block_v in zip(
-                        *read_block(value),
-                        strict=True,
-                    ):
-                        keys.append(
-                            wrap_quotes(
-                                f"{key}{SEP}{block_k}",
-                                TYPE_CHAR[dtype],
-                            ),
-                        )
-                        values.append(block_v)
-            case "str" | "int" | "bool" | "float" | "NoneType" as dtype:
-                keys.append(wrap_quotes("", TYPE_CHAR[dtype]))
-                values.append(str(data))
-            case _ as dtype:
-                raise TypeError(
-                    f'Expected type {combine_end(TYPE_CHAR, "or")}, got "{dtype}"',
-                )
-        return keys, values
-
-    return read_block(data)
-
-
-class Segment:
-    """Segment with item. Basically like a pointer."""
-
-    __slots__ = ("item",)
-
-    def __init__(self, item: Any = None) -> None:
-        """Initialize Segment."""
-        self.item = item
-
-    def __repr__(self) -> str:
-        """Return representation of self."""
-        if self.item is None:
-            return "Segment()"
-        return f"Segment({self.item!r})"
-
-    def is_container(self) -> bool:
-        """Return if is container."""
-        return isinstance(self.item, list | dict)
-
-    def unwrap(self) -> Any:
-        """Unwrap contained item."""
-        if not self.is_container():
-            return self.item
-        match type(self.item).__name__:
-            case "dict":
-                assert isinstance(self.item, dict)  # Mypy doesn't understand
-                dict_data = {}
-                for key, item in self.item.items():
-                    if isinstance(item, Segment):
-                        dict_data[key] = item.unwrap()
-                        continue
-                    dict_data[key] = item
-                return dict_data
-            case "list":
-                assert isinstance(self.item, list)  # Mypy doesn't understand
-                list_data = []
-                for item in self.item:
-                    if isinstance(item, Segment):
-                        list_data.append(item.unwrap())
-                        continue
-                    list_data.append(item)
-                return list_data
-            case _ as dtype:
-                raise ValueError(f'Expected dict or list, got "{dtype}"')
+        for key, value in data.items():
+            kind = LEAF_CHARS.get(type(value))
+            if kind is None or type(key) is not str or not KEY_CHARS.isdisjoint(key):
+                break
+            keys.append(f"{FLAT_START}{key}{FLAT_MIDDLE}{kind}{kind}{FLAT_END}")
+        else:
+            return keys, list(map(str, data.values()))
+    flat_keys, values = flatten_paths(data)
+    return list(iter_key_strings(flat_keys)), values
 
 
 def list_to_dict(keys: Iterable[str], values: Iterable[str | int]) -> Any:
     """Convert split lists of compiled keys and values back into dictionary."""
-
-    def handle_map(
-        segment: Segment,
-        key: str,
-        value: str,
-        map_func: Callable[[Any], Any],
-    ) -> None:
-        """Unwrap key and either set segment item or continue to unwrap."""
-        index = unwrap_quotes(key)
-        if index == "":
-            segment.item = map_func(value)
+    keys = list(keys)
+    matches = list(map(FLAT_KEY.fullmatch, keys))
+    if matches and all(matches):
+        # Flat dictionary with string keys, built in one go
+        return {
+            match_[1]: CHAR_CONVERT[match_[2]](value)  # type: ignore[index]
+            for match_, value in zip(matches, values, strict=True)
+        }
+    builder = DictBuilder()
+    builder.extend(zip(keys, values, strict=True))
+    return builder.data
+
+
+class FlatKey(NamedTuple):
+    """Where a value of flattened data goes, without string encoding.
+
+    kinds has a type character for the container of every step in path,
+    then one for the value, which is dict or list for empty containers.
+    """
+
+    kinds: str
+    path: tuple[Any, ...]
+
+
+# Characters dict keys cannot have, they would break string keys
+KEY_CHARS: Final = frozenset(CHAR_TYPE) | {SEP}
+CONTAINER_CHARS: Final = {TYPE_CHAR["dict"]: dict, TYPE_CHAR["list"]: list}
+CHAR_CONVERT: Final[dict[str, Callable[[Any], Any]]] = {
+    TYPE_CHAR["str"]: str,
+    TYPE_CHAR["int"]: int,
+    TYPE_CHAR["float"]: float,
+    TYPE_CHAR["bool"]: lambda value: str(value) == "True",
+    TYPE_CHAR["NoneType"]: lambda value: None,
+}
+LEAF_CHARS: Final = {
+    str: TYPE_CHAR["str"],
+    int: TYPE_CHAR["int"],
+    float: TYPE_CHAR["float"],
+    bool: TYPE_CHAR["bool"],
+    type(None): TYPE_CHAR["NoneType"],
+}
+# String key of a value with a string key in a flat dictionary is
+# FLAT_START, key, FLAT_MIDDLE, value type character twice and FLAT_END
+FLAT_START: Final = TYPE_CHAR["dict"] + TYPE_CHAR["str"]
+FLAT_MIDDLE: Final = TYPE_CHAR["str"] + SEP
+FLAT_END: Final = TYPE_CHAR["dict"]
+FLAT_KEY: Final = re.compile(
+    f"{FLAT_START}([^{''.join(sorted(KEY_CHARS))}]*){FLAT_MIDDLE}([{''.join(LEAF_CHARS.values())}])\\2{FLAT_END}",
+)
+
+
+def iter_flatten(data: Any) -> Generator[tuple[FlatKey, str], None, None]:
+    """Yield FlatKey and value of every leaf of data.
+
+    Same leaves in the same order as dict_to_list. Containers are read
+    with a stack of iterators instead of recursion, so depth is not
+    limited and nothing is copied between levels.
+    """
+    path: list[Any] = []
+    kinds: list[str] = []
+    # Items left to read of every open container
+    stack: list[Iterator[tuple[Any, Any]]] = []
+    value = data
+    while True:
+        dtype = type(value).__name__
+        if dtype not in TYPE_CHAR:
+            raise TypeError(
+                f'Expected type {combine_end(TYPE_CHAR, "or")}, got "{dtype}"',
+            )
+        if dtype in {"dict", "list"} and value:
+            kinds.append(TYPE_CHAR[dtype])
+            stack.append(iter(value.items()) if dtype == "dict" else enumerate(value))
+            # Replaced by key of first item below
+            path.append(None)
+        else:
+            key = FlatKey("".join(kinds) + TYPE_CHAR[dtype], tuple(path))
+            yield key, "" if dtype in {"dict", "list"} else str(value)
+
+        # Move to next item, closing containers that have run out
+        while stack:
+            item = next(stack[-1], None)
+            if item is not None:
+                path[-1], value = item
+                break
+            stack.pop()
+            kinds.pop()
+            path.pop()
+        else:
             return
-        unwrap_key(segment, index, map_func(value))
 
-    def unwrap_key(segment: Segment, key: str, value: Any) -> None:
-        """Take apart key and set segment item to value in the right place."""
-        head = key[0]
-        if head == "":
-            segment.item = value
-            return
+
+def flatten_paths(data: Any) -> tuple[list[FlatKey], list[str]]:
+    """Convert data to two lists, one of keys as FlatKey, one of values.
+
+    Same leaves in the same order as dict_to_list, but paths are shared
+    tuples instead of nested strings.
+    """
+    keys: list[FlatKey] = []
+    values: list[str] = []
+    for key, value in iter_flatten(data):
+        keys.append(key)
+        values.append(value)
+    return keys, values
+
+
+def get_slot(container: Any, key: Any) -> Any:
+    """Return item of container at key, padding lists with None to reach it."""
+    if isinstance(container, list):
+        if key >= len(container):
+            container.extend([None] * (key + 1 - len(container)))
+        return container[key]
+    return container.get(key)
+
+
+def longest_shared(most: int, shares: Callable[[int], bool]) -> int:
+    """Return largest count up to most that shares is true for.
+
+    shares must be true up to some count and false after it. Usually
+    nearly everything is shared, so look down from most with growing
+    steps, then halve what is left.
+    """
+    shared = 0
+    step = 1
+    while shared < most:
+        probe = max(most - step + 1, shared + 1)
+        if shares(probe):
+            shared = probe
+            break
+        most = probe - 1
+        step *= 2
+    while shared < most:
+        middle = (shared + most + 1) // 2
+        if shares(middle):
+            shared = middle
+        else:
+            most = middle - 1
+    return shared
+
+
+def shared_containers(key: FlatKey, last: FlatKey) -> int:
+    """Return how many containers from the root the paths of key and last go through."""
+    kinds, path = key
+    last_kinds, last_path = last
+
+    def shares(count: int) -> bool:
+        """Return if first count containers are shared."""
+        return path[: count - 1] == last_path[: count - 1] and kinds[:count] == last_kinds[:count]
+
+    return longest_shared(min(len(path), len(last_path)), shares)
+
+
+class DictBuilder:
+    """Build data from FlatKey or string key and value pairs added one at a time.
+
+    Containers on the path of the last item are remembered, so every
+    item only walks down from where its path leaves the last one, and
+    deep data costs about the same as flat data per item. Items can be
+    added as they arrive, such as translation results, without holding
+    full keys and values lists.
+    """
+
+    __slots__ = ("_chain", "_holder", "_last", "_reader", "count")
+
+    def __init__(self) -> None:
+        """Initialize empty DictBuilder."""
+        # Root goes in slot 0 of holder, so it is handled like any other item
+        self._holder: list[Any] = [None]
+        # chain[depth + 1] is container of kind kinds[depth] at path[:depth]
+        self._chain: list[Any] = [self._holder]
+        self._last = FlatKey("", ())
+        self._reader = KeyReader()
+        self.count = 0
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} {self.count} items>"
+
+    @property
+    def data(self) -> Any:
+        """Data built so far."""
+        return self._holder[0]
+
+    def add(self, key: FlatKey | str, value: str | int) -> None:
+        """Add value at key, a FlatKey or key in the string format of dict_to_list."""
+        if isinstance(key, str):
+            key = self._reader.read(key)
+        kinds, path = key
+        chain = self._chain
+        last = self._last
+        if kinds == last.kinds and path[:-1] == last.path[:-1]:
+            # Same parent, by far the most common
+            shared = len(path)
+        else:
+            shared = shared_containers(key, last)
+            del chain[shared + 1 :]
+        self._last = key
+        self.count += 1
+
+        parent = chain[-1]
+        slot = path[shared - 1] if shared else 0
+        for kind, step in zip(kinds[shared:], path[shared:], strict=False):
+            item = get_slot(parent, slot)
+            container_type = CONTAINER_CHARS[kind]
+            if not isinstance(item, container_type):
+                item = container_type()
+                parent[slot] = item
+            chain.append(item)
+            parent, slot = item, step
+        kind = kinds[-1]
+        if kind in CHAR_CONVERT:
+            if isinstance(parent, list) and slot >= len(parent):
+                parent.extend([None] * (slot + 1 - len(parent)))
+            parent[slot] = CHAR_CONVERT[kind](value)
+        elif kind in CONTAINER_CHARS:
+            if not isinstance(get_slot(parent, slot), CONTAINER_CHARS[kind]):
+                parent[slot] = CONTAINER_CHARS[kind]()
+        else:
+            raise ValueError(f'Key type character "{kind}" unrecognized')
+
+    def extend(self, items: Iterable[tuple[FlatKey | str, str | int]]) -> None:
+        """Add every key and value pair of items."""
+        add = self.add
+        for key, value in items:
+            add(key, value)
+
+
+def unflatten_items(items: Iterable[tuple[FlatKey, str | int]]) -> Any:
+    """Convert FlatKey and value pairs back into data, in one pass."""
+    builder = DictBuilder()
+    builder.extend(items)
+    return builder.data
+
+
+def unflatten_paths(keys: Iterable[FlatKey], values: Iterable[str | int]) -> Any:
+    """Convert lists of FlatKey keys and values back into data, in one pass."""
+    return unflatten_items(zip(keys, values, strict=True))
+
+
+def key_part(kind: str, step: Any) -> str:
+    """Return start of string key for step into container of kind."""
+    if kind == TYPE_CHAR["dict"]:
+        # Ensure key won't break everything
+        text = str(step)
+        if not KEY_CHARS.isdisjoint(text):
+            raise ValueError(
+                f'Dict key contains CHAR_TYPE value(s) "{"".join(KEY_CHARS.intersection(text))}' + '"',
+            )
+        step = wrap_quotes(text, TYPE_CHAR[type(step).__name__])
+    return f"{kind}{step}{SEP}"
+
+
+def key_end(kinds: str) -> str:
+    """Return end of string key with given kinds, value and closing type characters."""
+    return wrap_quotes(SEP if kinds[-1] in CONTAINER_CHARS else "", kinds[-1]) + kinds[-2::-1]
+
+
+def key_to_string(key: FlatKey) -> str:
+    """Return key in the string format of dict_to_list.
+
+    Every container wraps the rest of the key in its type character, so
+    key is the start of every step, then the value and then the type
+    characters of containers in reverse.
+    """
+    kinds, path = key
+    return "".join(map(key_part, kinds, path)) + key_end(kinds)
+
+
+def iter_key_strings(keys: Iterable[FlatKey]) -> Generator[str, None, None]:
+    """Yield every key in the string format of dict_to_list.
+
+    Start of string key is kept for every step of the key before, so
+    keys in flattened order only make the steps that changed.
+    """
+    # Start of string key of every step of last key
+    parts: list[str] = []
+    ends: dict[str, str] = {}
+    last = FlatKey("", ())
+    for key in keys:
+        kinds, path = key
+        if kinds == last.kinds and path[:-1] == last.path[:-1]:
+            # Same parent, only last step changed
+            parts.pop()
+        else:
+            del parts[max(shared_containers(key, last) - 1, 0) :]
+        parts.extend(map(key_part, kinds[len(parts) :], path[len(parts) :]))
+        if kinds not in ends:
+            ends[kinds] = key_end(kinds)
+        yield "".join(parts) + ends[kinds]
+        last = key
+
+
+def read_key_steps(text: str, index: int, kinds: list[str], path: list[Any], ends: list[int]) -> None:
+    """Read string key text from index, adding to kinds and path and where every step ends to ends."""
+    # Closing characters at the end of text are only the same type
+    # characters again, so they are not read
+    while True:
+        head = text[index]
         if head not in CHAR_TYPE:
             raise ValueError(f'Key type character "{head}" unrecognized')
-        match CHAR_TYPE[head]:
-            case "dict":
-                if not isinstance(segment.item, dict):
-                    segment.item = {}
-                raw_key, index = unwrap_quotes(key).split(SEP, 1)
-
-                if raw_key:
-                    dkey: int | str
-                    if raw_key[0] not in CHAR_TYPE:
-                        raise ValueError(
-                            f'Key type character "{raw_key[0]}" unrecognized',
-                        )
-                    match CHAR_TYPE[raw_key[0]]:
-                        case "str":
-                            dkey = unwrap_quotes(raw_key)
-                        case "int":
-                            dkey = int(unwrap_quotes(raw_key))
-                        case _ as dtype:
-                            raise TypeError(
-                                f'Expected str or int, got "{dtype}"',
-                            )
-
-                    if dkey not in segment.item:
-                        segment.item[dkey] = Segment()
-                    unwrap_key(segment.item[dkey], index, value)
-            case "list":
-                if not isinstance(segment.item, list):
-                    segment.item = []
-                indice_str, index = unwrap_quotes(key).split(SEP, 1)
-                if indice_str:
-                    indice = int(indice_str)
-                    while indice >= len(segment.item):
-                        segment.item.append(Segment())
-                    unwrap_key(segment.item[indice], index, value)
-            case "str":
-                handle_map(segment, key, value, str)
-            case "int":
-                handle_map(segment, key, value, int)
-            case "bool":
-                handle_map(segment, key, value, bool)
-            case "float":
-                handle_map(segment, key, value, float)
-            case "NoneType":
-                handle_map(segment, key, value, lambda x: None)
-            case _ as dtype:
-                raise TypeError(
-                    f'Expected type {combine_end(TYPE_CHAR, "or")}, got "{dtype}"',
-                )
-
-    data = Segment()
-    for key, value in zip(keys, values, strict=True):
-        unwrap_key(data, key, value)
-    return data.unwrap()
+        kinds.append(head)
+        if head not in CONTAINER_CHARS:
+            return
+        end = text.index(SEP, index + 1)
+        raw_key = text[index + 1 : end]
+        index = end + 1
+        if not raw_key:
+            # Empty container
+            return
+        if head == TYPE_CHAR["list"]:
+            path.append(int(raw_key))
+        elif raw_key[0] not in CHAR_TYPE:
+            raise ValueError(
+                f'Key type character "{raw_key[0]}" unrecognized',
+            )
+        else:
+            match CHAR_TYPE[raw_key[0]]:
+                case "str":
+                    path.append(unwrap_quotes(raw_key))
+                case "int":
+                    path.append(int(unwrap_quotes(raw_key)))
+                case _ as dtype:
+                    raise TypeError(
+                        f'Expected str or int, got "{dtype}"',
+                    )
+        ends.append(index)
+
+
+def string_to_key(text: str) -> FlatKey:
+    """Return FlatKey of key in the string format of dict_to_list."""
+    kinds: list[str] = []
+    path: list[Any] = []
+    read_key_steps(text, 0, kinds, path, [])
+    return FlatKey("".join(kinds), tuple(path))
+
+
+class KeyReader:
+    """Read keys in the string format of dict_to_list one after another.
+
+    Steps are kept from the key before, so keys in flattened order only
+    read the steps that changed.
+    """
+
+    __slots__ = ("_ends", "_kinds", "_last", "_path")
+
+    def __init__(self) -> None:
+        """Initialize KeyReader."""
+        self._kinds: list[str] = []
+        self._path: list[Any] = []
+        # Where every step of last key ends in its text
+        self._ends: list[int] = []
+        self._last = ""
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} last={self._last!r}>"
+
+    def read(self, text: str) -> FlatKey:
+        """Return FlatKey of key text."""
+        kinds, path, ends, last = self._kinds, self._path, self._ends, self._last
+        parent_end = ends[-2] if len(ends) > 1 else 0
+        if ends and text[:parent_end] == last[:parent_end]:
+            # Same parent, by far the most common. Reading a step again
+            # when more is shared is harmless.
+            shared = len(ends) - 1
+        else:
+            shared = longest_shared(len(ends), lambda count: text[: ends[count - 1]] == last[: ends[count - 1]])
+        del kinds[shared:], path[shared:], ends[shared:]
+        read_key_steps(text, ends[-1] if ends else 0, kinds, path, ends)
+        self._last = text
+        return FlatKey("".join(kinds), tuple(path))
+
+
+def iter_string_keys(texts: Iterable[str]) -> Generator[FlatKey, None, None]:
+    """Yield FlatKey of every key in the string format of dict_to_list."""
+    read = KeyReader().read
+    for text in texts:
+        yield read(text)
+
+
+class FlattenPlan:
+    """Values of data, and a program to put any values back the same way.
+
+    Made once from source data, then rebuild turns any number of value
+    lists, such as one per language, into data without looking at keys.
+    """
+
+    __slots__ = ("_string_keys", "containers", "keys", "program", "values")
+
+    def __init__(self, data: Any) -> None:
+        """Initialize FlattenPlan from data."""
+        self.keys, self.values = flatten_paths(data)
+        self._string_keys: list[str] | None = None
+        # Holder of root is container 0
+        self.containers = 1
+        # Parent container, key in it, whether parent is a list, function
+        # to make item and item argument. Argument is the new container
+        # number for containers, or value index for values.
+        self.program: list[tuple[int, Any, bool, Callable[..., Any], int]] = []
+
+        # Containers on path of last key, keys are in flattened order so
+        # a container is done with once a key leaves it
+        chain = [0]
+        list_ids: set[int] = {0}
+        last = FlatKey("", ())
+        for index, key in enumerate(self.keys):
+            kinds, path = key
+            del chain[shared_containers(key, last) + 1 :]
+            last = key
+            for depth in range(len(chain) - 1, len(path)):
+                parent = chain[-1]
+                slot = path[depth - 1] if depth else 0
+                container = self.add_container(parent, slot, parent in list_ids, kinds[depth])
+                if kinds[depth] == TYPE_CHAR["list"]:
+                    list_ids.add(container)
+                chain.append(container)
+            parent = chain[-1]
+            slot = path[-1] if path else 0
+            kind = kinds[-1]
+            if kind in CONTAINER_CHARS:
+                self.add_container(parent, slot, parent in list_ids, kind)
+            else:
+                self.program.append((parent, slot, parent in list_ids, CHAR_CONVERT[kind], index))
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} {len(self.values)} values, {len(self.program)} steps>"
+
+    def add_container(self, parent: int, slot: Any, in_list: bool, kind: str) -> int:
+        """Add step making container of kind in slot of parent. Return new container number."""
+        self.program.append((parent, slot, in_list, CONTAINER_CHARS[kind], self.containers))
+        self.containers += 1
+        return self.containers - 1
+
+    def string_keys(self) -> list[str]:
+        """Return keys in the string format of dict_to_list."""
+        if self._string_keys is None:
+            self._string_keys = list(iter_key_strings(self.keys))
+        return self._string_keys
+
+    def rebuild(self, values: Sequence[str | int]) -> Any:
+        """Return data with given values in place of values of plan."""
+        if len(values) != len(self.values):
+            raise ValueError(f"Expected {len(self.values)} values, got {len(values)}")
+        containers: list[Any] = [None] * self.containers
+        containers[0] = []
+        for parent, slot, in_list, make, argument in self.program:
+            if make is dict or make is list:
+                item = containers[argument] = make()
+            else:
+                item = make(values[argument])
+            # Items of lists come in order, so they can be appended
+            if in_list:
+                containers[parent].append(item)
+            else:
+                containers[parent][slot] = item
+        return containers[0][0] if containers[0] else None
 
 
 if __name__ == "__main__":
@@ -0,0 +1,187 @@
+"""Journal - Checkpoint translation progress so interrupted runs can resume."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Journal - Checkpoint translation progress so interrupted runs can resume
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Journal"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+
+import json
+import os
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from types import TracebackType
+    from typing import Self
+
+
+class Journal:
+    """Append only log of finished translation work.
+
+    Every line is a JSON object for one (file, language) unit, either
+    holding newly translated values as {key: [source, translation]} or
+    marking the unit as done. Lines are flushed as soon as they are
+    written, so after a crash a restarted run can pick up translated
+    values instead of requesting them again. A torn last line from a
+    crash mid-write is ignored. The file is only created once there is
+    something to write.
+    """
+
+    __slots__ = ("done", "file", "path", "values")
+
+    def __init__(self, path: str) -> None:
+        """Load existing journal at path, if any."""
+        self.path = path
+        self.values: dict[tuple[str, str], dict[str, tuple[str, str]]] = {}
+        self.done: set[tuple[str, str]] = set()
+        self.file: IO[str] | None = None
+        self.load()
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} {self.path!r} {len(self.values)} in progress, {len(self.done)} done>"
+
+    def __enter__(self) -> Self:
+        """Return self for context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close journal, compacting it if there was no error."""
+        if exc_type is None:
+            self.compact()
+        self.close()
+
+    def load(self) -> None:
+        """Read entries from journal file."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.apply(entry)
+
+    def apply(self, entry: dict[str, object]) -> None:
+        """Apply journal entry to state."""
+        unit = (str(entry["file"]), str(entry["lang"]))
+        if entry.get("done"):
+            self.done.add(unit)
+            self.values.pop(unit, None)
+            return
+        values = entry.get("values")
+        assert isinstance(values, dict)
+        self.done.discard(unit)
+        unit_values = self.values.setdefault(unit, {})
+        for key, (source, translation) in values.items():
+            unit_values[key] = (source, translation)
+
+    def write(self, entry: dict[str, object]) -> None:
+        """Apply entry and append it to journal file."""
+        self.apply(entry)
+        if self.file is None:
+            self.file = open(self.path, "a", encoding="utf-8")  # noqa: SIM115
+        self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def record(self, file: str, lang: str, values: dict[str, tuple[str, str]]) -> None:
+        """Record values of file translated to lang, a dictionary of key to (source, translation)."""
+        if values:
+            self.write({"file": file, "lang": lang, "values": values})
+
+    def finish(self, file: str, lang: str) -> None:
+        """Record that file is completely translated to lang and saved."""
+        self.write({"file": file, "lang": lang, "done": True})
+
+    def progress(self, file: str, lang: str) -> FileProgress:
+        """Return progress tracker for translating file to lang."""
+        return FileProgress(self, file, lang)
+
+    def compact(self) -> None:
+        """Rewrite journal keeping only units still in progress, removing it if there are none."""
+        self.close()
+        self.done.clear()
+        if not self.values:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        temp = f"{self.path}.tmp"
+        with open(temp, "w", encoding="utf-8") as file:
+            for (name, lang), values in self.values.items():
+                entry = {"file": name, "lang": lang, "values": values}
+                file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(temp, self.path)
+
+    def close(self) -> None:
+        """Close journal file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class FileProgress:
+    """Translation progress of one file into one language."""
+
+    __slots__ = ("file", "journal", "lang")
+
+    def __init__(self, journal: Journal, file: str, lang: str) -> None:
+        """Initialize with journal, file name, and language."""
+        self.journal = journal
+        self.file = file
+        self.lang = lang
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}({self.journal!r}, {self.file!r}, {self.lang!r})"
+
+    def restore(self, keys: Sequence[str], sentences: Sequence[str]) -> dict[int, str]:
+        """Return dictionary of index to translation for already translated sentences.
+
+        Values whose source sentence changed since they were recorded are skipped.
+        """
+        saved = self.journal.values.get((self.file, self.lang), {})
+        restored: dict[int, str] = {}
+        for idx, (key, sentence) in enumerate(zip(keys, sentences, strict=True)):
+            if key in saved:
+                source, translation = saved[key]
+                if source == sentence:
+                    restored[idx] = translation
+        return restored
+
+    def record(self, keys: Sequence[str], sentences: Sequence[str], translated: dict[int, str]) -> None:
+        """Record translations, a dictionary of index in keys and sentences to translation."""
+        self.journal.record(
+            self.file,
+            self.lang,
+            {keys[idx]: (sentences[idx], text) for idx, text in translated.items()},
+        )
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
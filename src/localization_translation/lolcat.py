@@ -183,25 +183,18 @@ def translate_file(english: dict[str, T], block_threshold: int = 2048) -> dict[s
     ##        else:
     ##            translate_results.append(translate_deduplicated_results[deduped_index])
 
-    # Rebuild full results with blanks
-    results = []
-    index = 0
-    for idx, original in enumerate(sentences):
-        if idx in bad_values:
-            results.append(original)
-        else:
-            results.append(translate_results[index])
-            index += 1
-
-    for (idx, old), new in zip(enumerate(sentences), results, strict=True):
+    # Rebuild with blanks, adding values to the result as they are fixed
+    builder = extricate.DictBuilder()
+    translated = iter(translate_results)
+    for idx, (key, old) in enumerate(zip(keys, sentences, strict=True)):
+        new = old if idx in bad_values else next(translated)
         if new is None or not isinstance(old, str):
-            results[idx] = old  # type: ignore[unreachable]
-            continue
-        if old.endswith(" ") and not new.endswith(" "):
-            results[idx] = new + " "
-    assert len(results) == len(sentences)
-    ##    print("\n".join(" --> ".join(x) for x in zip(sentences, results)))
-    return extricate.list_to_dict(keys, results)  # type: ignore[no-any-return]
+            new = old  # type: ignore[unreachable]
+        elif old.endswith(" ") and not new.endswith(" "):
+            new += " "
+        builder.add(key, new)
+    assert next(translated, None) is None
+    return builder.data  # type: ignore[no-any-return]
 
 
 def run() -> None:
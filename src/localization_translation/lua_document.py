@@ -0,0 +1,417 @@
+"""Lua Document - Edit lua table source in place."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Lua Document - Edit lua table source in place
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Lua Document"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+
+import copy
+from typing import TYPE_CHECKING, NamedTuple, TypeAlias
+
+from localization_translation import lua_parser
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+Key: TypeAlias = str | int
+Path: TypeAlias = tuple[Key, ...]
+
+
+class Node(NamedTuple):
+    """Where a value is in the original source."""
+
+    start: int  # Offset of first character of value
+    end: int  # Offset just past value
+    field_start: int  # Offset of first character of field holding value, key included
+    # Rest are only used for tables
+    close: int = -1  # Offset of closing brace
+    last_field_start: int = -1  # Offset of first character of last field
+    last_field_end: int = -1  # Offset just past last field's value, or opening brace if empty
+    separated: bool = False  # If last field has a separator after it
+    line_end: int = -1  # Offset of newline after last field, if closing brace is on a later line
+
+
+class IndexFrame:
+    """Table being indexed by LuaDocument."""
+
+    __slots__ = ("field_start", "last_field_end", "last_field_start", "next_index", "path", "separated", "start")
+
+    def __init__(self, path: Path, field_start: int, start: int) -> None:
+        """Initialize with path of table and offsets of its field and opening brace."""
+        self.path = path
+        self.field_start = field_start
+        self.start = start
+        self.next_index = 1
+        self.last_field_start = -1
+        self.last_field_end = start + 1
+        self.separated = False
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} {self.path!r}>"
+
+
+def format_key(key: Key) -> str:
+    """Return lua table field key text for key."""
+    if isinstance(key, int):
+        return f"[{key}]"
+    if lua_parser.IDENTIFIER.fullmatch(key) and key not in lua_parser.KEYWORDS:
+        return key
+    return f"[{lua_parser.encode_string(key)}]"
+
+
+def format_value(value: object, indent: str = "") -> str:
+    """Return lua source for value. Fields of tables are indented one tab more than indent."""
+    if value is None:
+        return "nil"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int | float):
+        return repr(value)
+    if isinstance(value, str):
+        return lua_parser.encode_string(value)
+    inner = f"{indent}\t"
+    if isinstance(value, list | tuple):
+        fields = [format_value(item, inner) for item in value]
+    elif isinstance(value, dict):
+        fields = [f"{format_key(key)} = {format_value(item, inner)}" for key, item in value.items()]
+    else:
+        raise TypeError(f"Cannot write {type(value).__name__} as lua")
+    if not fields:
+        return "{}"
+    return "{\n" + "".join(f"{inner}{field},\n" for field in fields) + f"{indent}}}"
+
+
+def parse_value(lua_text: str) -> object:
+    """Return value of lua source of one value. Tables are kept as dictionaries."""
+    value, _ = lua_parser.read_lua_table(lua_parser.TokenStream(lua_text).without_cst(), False)
+    return value
+
+
+def get_child(container: object, key: Key) -> object:
+    """Return field key of python table value, which may be a list."""
+    if isinstance(container, list | tuple) and isinstance(key, int) and 0 < key <= len(container):
+        return container[key - 1]
+    if isinstance(container, dict):
+        return container[key]
+    raise KeyError(key)
+
+
+def get_fields(container: object) -> Iterable[tuple[Key, object]]:
+    """Return key and value pairs of python table value, or nothing if it is not a table."""
+    if isinstance(container, list | tuple):
+        return enumerate(container, 1)
+    if isinstance(container, dict):
+        return container.items()
+    return ()
+
+
+def set_child(container: object, key: Key, value: object) -> None:
+    """Set field key of python table value, which may be a list."""
+    if isinstance(container, list) and isinstance(key, int) and 0 < key <= len(container) + 1:
+        if key > len(container):
+            container.append(value)
+        else:
+            container[key - 1] = value
+    elif isinstance(container, dict):
+        container[key] = value
+    else:
+        raise KeyError(key)
+
+
+class LuaDocument:
+    """Lua table source that is edited by patching it instead of regenerating it.
+
+    Source is tokenized once, and the offsets of every value are kept
+    in an index by path of keys. Edits are stored as replacements of
+    values and fields added to tables, and only the new text is ever
+    tokenized and parsed, so an edit costs time proportional to its
+    size and not to the size of the file. When writing, unchanged parts
+    of source are copied as they are, comments and formatting included.
+    """
+
+    __slots__ = ("inserts", "nodes", "replacements", "source")
+
+    def __init__(self, source: str, stream: lua_parser.TokenStream | None = None) -> None:
+        """Index lua table source, using stream of its tokens if already tokenized."""
+        self.source = source
+        self.nodes: dict[Path, Node] = {}
+        # Path of value to replacement source
+        self.replacements: dict[Path, str] = {}
+        # Path of table to new fields
+        self.inserts: dict[Path, dict[Key, object]] = {}
+        self.index(lua_parser.TokenStream(source) if stream is None else stream)
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        edits = len(self.replacements) + sum(map(len, self.inserts.values()))
+        return f"<{self.__class__.__name__} {len(self.nodes)} values, {edits} edits>"
+
+    def copy(self) -> LuaDocument:
+        """Return copy with the same edits, sharing the index."""
+        document = self.__class__.__new__(self.__class__)
+        document.source = self.source
+        document.nodes = self.nodes
+        document.replacements = dict(self.replacements)
+        document.inserts = copy.deepcopy(self.inserts)
+        return document
+
+    def index(self, stream: lua_parser.TokenStream) -> None:
+        """Record offsets of every value in source from its tokens."""
+        source = self.source
+        indices = stream.without_cst().indices
+        starts = stream.starts
+        ends = stream.ends
+        count = len(indices)
+        position = 0
+
+        def text(at: int) -> str:
+            if at >= count:
+                raise lua_parser.ParseError("Ran out of tokens")
+            return stream.text(indices[at])
+
+        def error(expected: str) -> lua_parser.ParseError:
+            token = stream.token(indices[min(position, count - 1)])
+            return lua_parser.ParseError(f"Expected {expected}, got {token.text!r} ({token.location()})")
+
+        def end_field(frame: IndexFrame, end: int) -> None:
+            """Read separator after field whose value ends at end."""
+            nonlocal position
+            frame.last_field_end = end
+            frame.separated = text(position) in {",", ";"}
+            if frame.separated:
+                position += 1
+            elif text(position) != "}":
+                raise error("',', ';', or '}'")
+
+        stack: list[IndexFrame] = []
+        path: Path = ()
+        field_start = starts[indices[0]]
+        while True:
+            # Read a value
+            value_text = text(position)
+            kind = stream.kind(indices[position])
+            start = starts[indices[position]]
+            position += 1
+            if value_text == "{" and kind is lua_parser.Separator:
+                stack.append(IndexFrame(path, field_start, start))
+            else:
+                if kind not in {lua_parser.StrLit, lua_parser.Numeric, lua_parser.Identifier}:
+                    raise error("value")
+                self.nodes[path] = Node(start, ends[indices[position - 1]], field_start)
+                if not stack:
+                    return
+                end_field(stack[-1], self.nodes[path].end)
+
+            # Close finished tables until reaching the start of a field
+            while True:
+                frame = stack[-1]
+                if text(position) == "}":
+                    close = starts[indices[position]]
+                    position += 1
+                    stack.pop()
+                    line_end = -1
+                    if frame.last_field_start >= 0:
+                        after = frame.last_field_end + frame.separated
+                        line_end = source.find("\n", after, close)
+                    self.nodes[frame.path] = Node(
+                        frame.start,
+                        close + 1,
+                        frame.field_start,
+                        close,
+                        frame.last_field_start,
+                        frame.last_field_end,
+                        frame.separated,
+                        line_end,
+                    )
+                    if not stack:
+                        return
+                    end_field(stack[-1], close + 1)
+                    continue
+                field_start = starts[indices[position]]
+                frame.last_field_start = field_start
+                key: Key
+                if text(position) == "[":
+                    key_text = text(position + 1)
+                    if stream.kind(indices[position + 1]) not in {lua_parser.StrLit, lua_parser.Numeric}:
+                        raise error("table key")
+                    key_value = parse_value(key_text)
+                    if not isinstance(key_value, str | int):
+                        raise error("table key")
+                    key = key_value
+                    position += 2
+                    if text(position) != "]":
+                        raise error("']'")
+                    if text(position + 1) != "=":
+                        raise error("'='")
+                    position += 2
+                elif stream.kind(indices[position]) is lua_parser.Identifier and text(position + 1) == "=":
+                    key = text(position)
+                    position += 2
+                else:
+                    key = frame.next_index
+                    frame.next_index += 1
+                path = (*frame.path, key)
+                break
+
+    def indentation(self, offset: int) -> str:
+        """Return whitespace before offset on its line, or empty string if there is other text."""
+        before = self.source[self.source.rfind("\n", 0, offset) + 1 : offset]
+        return "" if before.strip() else before
+
+    def edited(self, path: Path) -> tuple[Path, object] | None:
+        """Return path and value of replaced or added value holding path, if any."""
+        for depth in range(len(path) + 1):
+            prefix = path[:depth]
+            if prefix in self.replacements:
+                return prefix, parse_value(self.replacements[prefix])
+            if depth and prefix[-1] in self.inserts.get(prefix[:-1], ()):
+                return prefix, self.inserts[prefix[:-1]][prefix[-1]]
+        return None
+
+    def insert_marks(self, table: Path, fields: dict[Key, object]) -> list[tuple[int, int, str]]:
+        """Return (start, end, text) marks adding fields to table."""
+        node = self.nodes[table]
+        if node.last_field_start < 0:
+            outer = self.indentation(node.field_start)
+            inner = f"{outer}\t"
+            lines = "".join(
+                f"\n{inner}{format_key(key)} = {format_value(value, inner)}," for key, value in fields.items()
+            )
+            if node.close == node.start + 1:
+                return [(node.close, node.close, f"{lines}\n{outer}")]
+            return [(node.start + 1, node.start + 1, lines)]
+        if node.line_end < 0:
+            text = "".join(f", {format_key(key)} = {format_value(value)}" for key, value in fields.items())
+            return [(node.last_field_end, node.last_field_end, text)]
+        inner = self.indentation(node.last_field_start) or f"{self.indentation(node.field_start)}\t"
+        text = ",".join(f"\n{inner}{format_key(key)} = {format_value(value, inner)}" for key, value in fields.items())
+        if node.separated:
+            return [(node.line_end, node.line_end, f"{text},")]
+        return [(node.last_field_end, node.last_field_end, ","), (node.line_end, node.line_end, text)]
+
+    def render(self, start: int, end: int) -> str:
+        """Return source from start to end with edits inside it applied."""
+        marks: list[tuple[int, int, str]] = []
+        for path, text in self.replacements.items():
+            node = self.nodes[path]
+            if start <= node.start and node.end <= end:
+                marks.append((node.start, node.end, text))
+        for table, fields in self.inserts.items():
+            node = self.nodes[table]
+            if start <= node.start and node.end <= end:
+                marks.extend(self.insert_marks(table, fields))
+        marks.sort(key=lambda mark: mark[:2])
+        parts: list[str] = []
+        position = start
+        for mark_start, mark_end, text in marks:
+            parts.append(self.source[position:mark_start])
+            parts.append(text)
+            position = mark_end
+        parts.append(self.source[position:end])
+        return "".join(parts)
+
+    def text(self) -> str:
+        """Return source with all edits applied."""
+        return self.render(0, len(self.source))
+
+    def get(self, path: Iterable[Key] = ()) -> object:
+        """Return current value at path. Tables are returned as dictionaries."""
+        path = tuple(path)
+        edit = self.edited(path)
+        if edit is not None:
+            edit_path, value = edit
+            for key in path[len(edit_path) :]:
+                value = get_child(value, key)
+            return value
+        node = self.nodes.get(path)
+        if node is None:
+            raise KeyError(path)
+        return parse_value(self.render(node.start, node.end))
+
+    def set(self, path: Iterable[Key], value: object) -> None:
+        """Set value at path, adding it to its table if it is not there."""
+        path = tuple(path)
+        if not path:
+            raise ValueError("Cannot set root table")
+        edit = self.edited(path[:-1])
+        if edit is not None:
+            # Inside a replaced or added value, change that value
+            edit_path, container = edit
+            target = container
+            for key in path[len(edit_path) : -1]:
+                target = get_child(target, key)
+            set_child(target, path[-1], value)
+            if edit_path in self.replacements:
+                indent = self.indentation(self.nodes[edit_path].field_start)
+                self.replacements[edit_path] = format_value(container, indent)
+            return
+        if path[-1] in self.inserts.get(path[:-1], ()):
+            self.inserts[path[:-1]][path[-1]] = value
+            return
+        node = self.nodes.get(path)
+        if node is not None:
+            self.replace_text(path, format_value(value, self.indentation(node.field_start)))
+            return
+        table = self.nodes.get(path[:-1])
+        if table is None or table.close < 0:
+            raise KeyError(path[:-1])
+        self.inserts.setdefault(path[:-1], {})[path[-1]] = value
+
+    def replace_text(self, path: Iterable[Key], lua_text: str) -> None:
+        """Replace value at path with lua source, which is checked by parsing it."""
+        path = tuple(path)
+        value = parse_value(lua_text)
+        if path not in self.nodes or self.edited(path[:-1]) is not None:
+            self.set(path, value)
+            return
+        # Edits inside the old value go away with it
+        for old in [old for old in self.replacements if old[: len(path)] == path]:
+            del self.replacements[old]
+        for old in [old for old in self.inserts if old[: len(path)] == path]:
+            del self.inserts[old]
+        self.replacements[path] = lua_text
+
+    def update(self, values: Mapping[Key, object], path: Iterable[Key] = ()) -> None:
+        """Set every key of values in table at path."""
+        path = tuple(path)
+        for key, value in values.items():
+            self.set((*path, key), value)
+
+
+def write_document(filename: str, document: LuaDocument) -> None:
+    """Write source of document with all edits applied to filename."""
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write(document.text())
+
+
+def update_lang_file(filename: str, values: Mapping[Key, object]) -> None:
+    """Set keys of lang file, keeping the rest of the file as it is."""
+    with open(filename, encoding="utf-8") as file:
+        document = LuaDocument(file.read())
+    document.update(values)
+    write_document(filename, document)
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
@@ -26,19 +26,24 @@ __license__ = "GNU General Public License Version 3"
 
 
 import re
+from array import array
 from collections import deque
+from collections.abc import Sequence
 from typing import (
     TYPE_CHECKING,
     Any,
+    Final,
     Generic,
     NamedTuple,
     NoReturn,
     TypeVar,
     cast,
+    overload,
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Collection, Generator, Sequence
+    from collections.abc import Collection, Generator, Iterator
+    from mmap import mmap
 
 
 class ParseError(Exception):
@@ -168,77 +173,321 @@ KEYWORDS = {
     "while",
 }
 
-IDENTIFIER = re.compile(r"^[a-z_][a-z_\d]*", re.IGNORECASE)
+# Patterns are used with match(text, pos), which is anchored at pos
+IDENTIFIER = re.compile(r"[a-z_][a-z_\d]*", re.IGNORECASE)
 COMMENT = re.compile("--.*\n")
 ##INTEGER = re.compile('^[\d]+')
-NUMERIC = re.compile(r"^-?(\d+)(\.\d+)?(e(?:-|\+)?\d+)?")
+NUMERIC = re.compile(r"-?(\d+)(\.\d+)?(e(?:-|\+)?\d+)?")
 HEXADECIMAL = re.compile(
     r"(0x[a-f\d]+)(\.[a-f\d]+)?(p(?:-|\+)?\d+)?",
     re.IGNORECASE,
 )
+WHITESPACE = re.compile(r"[ \r\t]+")
+SEPARATORS = frozenset("()[]{},;")
+# Quoted strings, skipping over escaped characters
+QUOTED = {
+    '"': re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL),
+    "'": re.compile(r"'(?:[^'\\]|\\.)*'", re.DOTALL),
+}
+LONG_BRACKET = re.compile(r"\[(=*)\[")
 
 
-def tokenize_cst(text: str) -> Generator[Token, None, None]:
-    """Tokenize lua code. Yields tokens and complex syntax tree tokens."""
+def scan_cst(text: str) -> Generator[tuple[type[Token], int, int, int, int], None, None]:
+    """Scan lua code. Yields token type, start, end, line, and column of every token.
+
+    Scans by position in text, so remaining input is never copied.
+    """
     line = 1
     column = -1
+    pos = 0
+    length = len(text)
 
     while True:
         read = 1
         last_line = line
-        token: type[Token] | None = End
+        span_lines = 0  # Newlines inside a long string
+        token: type[Token] = End
 
-        if not text:
+        if pos >= length:
             read = 0
-        elif text[0] in {" ", "\r", "\t"}:
-            while read < len(text) and text[read] in {" ", "\r", "\t"}:
-                read += 1
-            token = Whitespace
-        elif text[0] == "\n":
-            token = Newline
-            line += 1
-        elif text[0] in "()[]{},;":
-            token = Separator
-        elif text.startswith("--"):
-            match_ = COMMENT.match(text)
-            if not match_:
-                raise ParseError(f"Could not parse comment from {text!r}")
-
-            token = Comment
-            read = match_.end() - 1
-        elif text[0] == "=":
-            token = Assignment
-        elif text[0] in {'"', "'"}:
-            read = 1
-            start_bracket = text[0]
-            while read < len(text):
-                char = text[read]
-                if char == start_bracket and text[read - 1] != "\\":
-                    read += 1
-                    break
-                read += 1
-
-            token = StrLit
         else:
-            if match_ := (HEXADECIMAL.match(text) or NUMERIC.match(text)):
+            char = text[pos]
+            if char in " \r\t":
+                match_ = WHITESPACE.match(text, pos)
+                assert match_ is not None
+                read = match_.end() - pos
+                token = Whitespace
+            elif char == "\n":
+                token = Newline
+                line += 1
+            elif char == "[" and (match_ := LONG_BRACKET.match(text, pos)):
+                close = "]" + match_.group(1) + "]"
+                end = text.find(close, match_.end())
+                if end < 0:
+                    raise ParseError(f"Unfinished long string starting at {line}:{column + 1}")
+                read = end + len(close) - pos
+                span_lines = text.count("\n", pos, pos + read)
+                token = StrLit
+            elif char in SEPARATORS:
+                token = Separator
+            elif text.startswith("--", pos):
+                match_ = COMMENT.match(text, pos)
+                if not match_:
+                    raise ParseError(f"Could not parse comment from {text[pos:]!r}")
+
+                token = Comment
+                read = match_.end() - 1 - pos
+            elif char == "=":
+                token = Assignment
+            elif char in QUOTED:
+                # Unfinished strings run to the end of text
+                match_ = QUOTED[char].match(text, pos)
+                read = (match_.end() if match_ else length) - pos
+                token = StrLit
+            elif match_ := (HEXADECIMAL.match(text, pos) or NUMERIC.match(text, pos)):
                 token = Numeric
-                read = match_.end()
-            elif match_ := IDENTIFIER.match(text):
+                read = match_.end() - pos
+            elif match_ := IDENTIFIER.match(text, pos):
                 token = Identifier
-                read = match_.end()
+                read = match_.end() - pos
             else:
-                raise ParseError(f"Could not parse {text!r}")
+                raise ParseError(f"Could not parse {text[pos:]!r}")
 
         if last_line != line:
             column = -1
         else:
             column += read
 
-        if token is not None:
-            yield token(text[:read], line, column)
-            if issubclass(token, End):
-                break
-        text = text[read:]
+        yield token, pos, pos + read, line, column
+        if token is End:
+            break
+        if span_lines:
+            line += span_lines
+            column = pos + read - text.rfind("\n", pos, pos + read) - 2
+        pos += read
+
+
+def as_bytes(pattern: re.Pattern[str]) -> re.Pattern[bytes]:
+    """Return bytes version of ASCII only regular expression."""
+    return re.compile(pattern.pattern.encode("ascii"), pattern.flags & ~re.UNICODE)
+
+
+# Patterns for scanning UTF-8 encoded source without decoding it
+BYTES_IDENTIFIER: Final = as_bytes(IDENTIFIER)
+BYTES_NUMERIC: Final = as_bytes(NUMERIC)
+BYTES_HEXADECIMAL: Final = as_bytes(HEXADECIMAL)
+BYTES_WHITESPACE: Final = as_bytes(WHITESPACE)
+BYTES_LONG_BRACKET: Final = as_bytes(LONG_BRACKET)
+BYTES_QUOTED: Final = {ord(quote): as_bytes(pattern) for quote, pattern in QUOTED.items()}
+BYTES_SEPARATORS: Final = frozenset(ord(char) for char in SEPARATORS)
+BYTES_SPACES: Final = frozenset(b" \r\t")
+NEWLINE: Final = ord("\n")
+HYPHEN: Final = ord("-")
+EQUALS: Final = ord("=")
+OPEN_BRACKET: Final = ord("[")
+
+
+def scan_cst_bytes(data: bytes | mmap) -> Generator[tuple[type[Token], int, int, int, int], None, None]:
+    """Scan UTF-8 encoded lua code, like scan_cst. Offsets and columns count bytes.
+
+    Works on anything regular expressions can search, like a memory
+    mapped file, and never decodes or copies the whole of data.
+    """
+    line = 1
+    column = -1
+    pos = 0
+    length = len(data)
+
+    def rest() -> str:
+        return bytes(data[pos : pos + 80]).decode("utf-8", "replace")
+
+    while True:
+        read = 1
+        last_line = line
+        span_lines = 0
+        token: type[Token] = End
+
+        if pos >= length:
+            read = 0
+        else:
+            char = data[pos]
+            if char in BYTES_SPACES:
+                match_ = BYTES_WHITESPACE.match(data, pos)
+                assert match_ is not None
+                read = match_.end() - pos
+                token = Whitespace
+            elif char == NEWLINE:
+                token = Newline
+                line += 1
+            elif char == OPEN_BRACKET and (match_ := BYTES_LONG_BRACKET.match(data, pos)):
+                close = b"]" + match_.group(1) + b"]"
+                end = data.find(close, match_.end())
+                if end < 0:
+                    raise ParseError(f"Unfinished long string starting at {line}:{column + 1}")
+                read = end + len(close) - pos
+                span_lines = data[pos : pos + read].count(b"\n")
+                token = StrLit
+            elif char in BYTES_SEPARATORS:
+                token = Separator
+            elif char == HYPHEN and data[pos + 1 : pos + 2] == b"-":
+                end = data.find(b"\n", pos)
+                if end < 0:
+                    raise ParseError(f"Could not parse comment from {rest()!r}")
+                token = Comment
+                read = end - pos
+            elif char == EQUALS:
+                token = Assignment
+            elif char in BYTES_QUOTED:
+                match_ = BYTES_QUOTED[char].match(data, pos)
+                read = (match_.end() if match_ else length) - pos
+                token = StrLit
+            elif match_ := (BYTES_HEXADECIMAL.match(data, pos) or BYTES_NUMERIC.match(data, pos)):
+                token = Numeric
+                read = match_.end() - pos
+            elif match_ := BYTES_IDENTIFIER.match(data, pos):
+                token = Identifier
+                read = match_.end() - pos
+            else:
+                raise ParseError(f"Could not parse {rest()!r}")
+
+        if last_line != line:
+            column = -1
+        else:
+            column += read
+
+        yield token, pos, pos + read, line, column
+        if token is End:
+            break
+        if span_lines:
+            line += span_lines
+            column = pos + read - data.rfind(b"\n", pos, pos + read) - 2
+        pos += read
+
+
+def tokenize_cst(text: str) -> Generator[Token, None, None]:
+    """Tokenize lua code. Yields tokens and complex syntax tree tokens."""
+    for token, start, end, line, column in scan_cst(text):
+        yield token(text[start:end], line, column)
+
+
+# Token types by kind number in a TokenStream
+TOKEN_KINDS: Final[tuple[type[Token], ...]] = (
+    End,
+    Whitespace,
+    Newline,
+    Comment,
+    Separator,
+    Assignment,
+    StrLit,
+    Numeric,
+    Identifier,
+)
+KIND_NUMBERS: Final = {token: kind for kind, token in enumerate(TOKEN_KINDS)}
+CST_KINDS: Final = frozenset(KIND_NUMBERS[token] for token in TOKEN_KINDS if issubclass(token, CSTToken))
+
+
+class TokenStream(Sequence[Token]):
+    """Tokens of source, stored compactly as parallel arrays.
+
+    Instead of one object per token, kind, start and end offsets, line,
+    and column are kept in arrays, and token text is only sliced out of
+    source when a token is looked at. Indexing returns regular tokens,
+    so a stream can be used anywhere a token list can.
+    """
+
+    __slots__ = ("columns", "ends", "kinds", "lines", "source", "starts")
+
+    def __init__(self, source: str) -> None:
+        """Tokenize source."""
+        self.source = source
+        self.kinds = array("B")
+        self.starts = array("I")
+        self.ends = array("I")
+        self.lines = array("I")
+        # Column is -1 right after a newline
+        self.columns = array("i")
+        add_kind = self.kinds.append
+        add_start = self.starts.append
+        add_end = self.ends.append
+        add_line = self.lines.append
+        add_column = self.columns.append
+        for token, start, end, line, column in scan_cst(source):
+            add_kind(KIND_NUMBERS[token])
+            add_start(start)
+            add_end(end)
+            add_line(line)
+            add_column(column)
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} {len(self)} tokens>"
+
+    def __len__(self) -> int:
+        """Return number of tokens."""
+        return len(self.kinds)
+
+    @overload
+    def __getitem__(self, index: int) -> Token: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Token]: ...
+
+    def __getitem__(self, index: int | slice) -> Token | list[Token]:
+        """Return token at index, or list of tokens in slice."""
+        if isinstance(index, slice):
+            return [self.token(i) for i in range(*index.indices(len(self)))]
+        return self.token(index)
+
+    def kind(self, index: int) -> type[Token]:
+        """Return type of token at index."""
+        return TOKEN_KINDS[self.kinds[index]]
+
+    def text(self, index: int) -> str:
+        """Return text of token at index."""
+        return self.source[self.starts[index] : self.ends[index]]
+
+    def token(self, index: int) -> Token:
+        """Return token at index."""
+        return TOKEN_KINDS[self.kinds[index]](
+            self.source[self.starts[index] : self.ends[index]],
+            self.lines[index],
+            self.columns[index],
+        )
+
+    def without_cst(self) -> TokenView:
+        """Return view of tokens that are not concrete syntax tree tokens, like tokenize."""
+        return TokenView(self, array("I", (i for i, kind in enumerate(self.kinds) if kind not in CST_KINDS)))
+
+
+class TokenView(Sequence[Token]):
+    """Some tokens of a token stream, by index into the stream."""
+
+    __slots__ = ("indices", "stream")
+
+    def __init__(self, stream: TokenStream, indices: array[int]) -> None:
+        """Initialize with stream and indices of tokens in view."""
+        self.stream = stream
+        self.indices = indices
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} {len(self)} of {len(self.stream)} tokens>"
+
+    def __len__(self) -> int:
+        """Return number of tokens."""
+        return len(self.indices)
+
+    @overload
+    def __getitem__(self, index: int) -> Token: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Token]: ...
+
+    def __getitem__(self, index: int | slice) -> Token | list[Token]:
+        """Return token at index, or list of tokens in slice."""
+        if isinstance(index, slice):
+            return [self.stream.token(i) for i in self.indices[index]]
+        return self.stream.token(self.indices[index])
 
 
 def tokenize(text: str) -> Generator[Token, None, None]:
@@ -249,6 +498,64 @@ def tokenize(text: str) -> Generator[Token, None, None]:
         yield token
 
 
+def tokenize_bytes(data: bytes | mmap) -> Generator[Token, None, None]:
+    """Tokenize UTF-8 encoded lua code. Yields tokens, like tokenize. Columns count bytes."""
+    for token, start, end, line, column in scan_cst_bytes(data):
+        if not issubclass(token, CSTToken):
+            yield token(data[start:end].decode("utf-8"), line, column)
+
+
+class TokenWindow(Sequence[Token]):
+    """Tokens read from an iterator as they are indexed.
+
+    Only the last few tokens are kept, which is enough for the look
+    ahead and one token back up read_lua_table needs, so a whole file
+    can be parsed without ever holding all of its tokens. Length is
+    the number of tokens read so far, plus one until tokens run out.
+    """
+
+    __slots__ = ("exhausted", "keep", "read", "tokens", "window")
+
+    def __init__(self, tokens: Iterator[Token], keep: int = 4) -> None:
+        """Initialize with token iterator and number of old tokens to keep."""
+        self.tokens = tokens
+        self.keep = keep
+        self.window: deque[Token] = deque(maxlen=keep)
+        self.read = 0
+        self.exhausted = False
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} {self.read} tokens read>"
+
+    def __len__(self) -> int:
+        """Return number of tokens read, plus one if there may be more."""
+        return self.read + (not self.exhausted)
+
+    @overload
+    def __getitem__(self, index: int) -> Token: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Token]: ...
+
+    def __getitem__(self, index: int | slice) -> Token | list[Token]:
+        """Return token at index, reading tokens up to it."""
+        if isinstance(index, slice):
+            raise TypeError(f"{self.__class__.__name__} can not be sliced")
+        while index >= self.read and not self.exhausted:
+            try:
+                self.window.append(next(self.tokens))
+            except StopIteration:
+                self.exhausted = True
+            else:
+                self.read += 1
+        if index >= self.read:
+            raise IndexError(index)
+        if index < self.read - len(self.window):
+            raise IndexError(f"Token {index} is no longer kept")
+        return self.window[index - self.read]
+
+
 T = TypeVar("T")
 
 
@@ -323,6 +630,123 @@ class Value(Generic[T]):
         return tuple(args)
 
 
+# Single character escape sequences and what they stand for
+ESCAPES: Final = {
+    "a": "\a",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "v": "\v",
+    "\\": "\\",
+    '"': '"',
+    "'": "'",
+    "\n": "\n",
+}
+ESCAPE: Final = re.compile(
+    r"\\(?:(?P<decimal>\d{1,3})|x(?P<hex>[\da-fA-F]{2})|u\{(?P<code>[\da-fA-F]+)\}|z\s*|(?P<char>.))",
+    re.DOTALL,
+)
+# Bytes from \ddd and \xXX escapes are kept as surrogate escapes until
+# the whole string is decoded as UTF-8, since Lua strings are bytes
+BYTE_ESCAPE_START: Final = 0xDC00
+# Characters encode_string writes escaped, mapped to their escape sequence
+ENCODE: Final = str.maketrans(
+    {
+        **{chr(code): f"\\{code:03d}" for code in range(0x20)},
+        "\x7f": "\\127",
+        **{chr(BYTE_ESCAPE_START + code): f"\\{code:03d}" for code in range(0x80, 0x100)},
+        "\a": "\\a",
+        "\b": "\\b",
+        "\f": "\\f",
+        "\n": "\\n",
+        "\r": "\\r",
+        "\t": "\\t",
+        "\v": "\\v",
+        "\\": "\\\\",
+    },
+)
+
+NEEDS_ESCAPE: Final = re.compile(r"[\x00-\x1f\x7f\\\udc80-\udcff]")
+
+
+def unescape(match_: re.Match[str]) -> str:
+    """Return what escape sequence match stands for."""
+    if (char := match_.group("char")) is not None:
+        # Invalid escapes are an error in lua, just keep the character
+        return ESCAPES.get(char, char)
+    if (decimal := match_.group("decimal")) is not None:
+        code = int(decimal)
+        if code > 0xFF:
+            raise ParseError(f"Decimal escape {match_.group()!r} too large")
+    elif (hex_code := match_.group("hex")) is not None:
+        code = int(hex_code, 16)
+    elif (code_point := match_.group("code")) is not None:
+        code = int(code_point, 16)
+        # Surrogates would not survive encoding as UTF-8 again
+        if code > 0x10FFFF or 0xD800 <= code <= 0xDFFF:
+            raise ParseError(f"Unicode escape {match_.group()!r} out of range")
+        return chr(code)
+    else:  # \z skips following whitespace
+        return ""
+    if code >= 0x80:
+        return chr(BYTE_ESCAPE_START + code)
+    return chr(code)
+
+
+def string_value(text: str) -> str:
+    """Return value of string literal token text, quotes or long brackets included.
+
+    Handles every Lua 5.3 escape sequence, and long bracket strings
+    like [[text]] and [==[text]==], which have no escapes.
+    """
+    if text.startswith("["):
+        level = text.index("[", 1) + 1
+        body = text[level:-level]
+        # Newline right after the opening long bracket is skipped
+        if body.startswith("\r\n"):
+            return body[2:]
+        if body.startswith("\n"):
+            return body[1:]
+        return body
+    body = text[1:-1]
+    if "\\" not in body:
+        return body
+    value = ESCAPE.sub(unescape, body)
+    if any(BYTE_ESCAPE_START + 0x80 <= ord(char) < BYTE_ESCAPE_START + 0x100 for char in value):
+        return value.encode("utf-8", "surrogateescape").decode("utf-8", "surrogateescape")
+    return value
+
+
+def encode_string(value: str, quote: str = '"') -> str:
+    """Return lua string literal for value, the inverse of string_value.
+
+    Control characters, backslashes, and quote are escaped. Bytes that
+    were not valid UTF-8 when decoded are written back as decimal escapes.
+    """
+    if NEEDS_ESCAPE.search(value):
+        value = value.translate(ENCODE)
+    return quote + value.replace(quote, f"\\{quote}") + quote
+
+
+def numeric_value(token: Token) -> int | float:
+    """Return value of numeric literal token."""
+    text = token.text
+    match_ = HEXADECIMAL.match(text) or NUMERIC.match(text)
+    if match_ is None:
+        raise ParseError(
+            f"Numeric literal regular expression did not match ({token.location()})",
+        )
+    decimal, fractional, exponent = match_.groups()
+
+    is_float = fractional or exponent
+
+    if decimal.lower().startswith("0x"):  # is hex?
+        return float.fromhex(text) if is_float else int(text, 16)
+    return float(text) if is_float else int(text)
+
+
 def list_or(values: Collection[str]) -> str:
     """Return comma separated listing of values joined with ` or `."""
     if len(values) <= 2:
@@ -415,53 +839,16 @@ class Parser:
     def parse_string_literal(self) -> Value[str]:
         """Parse a string literal."""
         token = self.expect_type(StrLit)
-        # Read the string literal character by character and look for
-        # escape sequences like \a, \n, \t, etc.
-        value = ""
-        skip = 0  # Number of chars to not add to running value
-        for idx, char in enumerate(token.text):
-            if skip:
-                skip -= 1
-                continue
-            if char != "\\":
-                value += char
-                continue
-            # Is escape sequence start, so read next char to find which one
-            value += token.text[idx + 1].translate(
-                {
-                    97: "\a",
-                    98: "\b",
-                    102: "\f",
-                    110: "\n",
-                    114: "\r",
-                    116: "\t",
-                    118: "\v",
-                    92: "\\",
-                },
-            )
-            skip = 1
-        return Value("String", value[1:-1], from_token=token)
+        return Value("String", string_value(token.text), from_token=token)
 
     def parse_numeric_literal(self) -> Value[int | float]:
         """Parse a numeric literal."""
         token = self.expect_type(Numeric)
-
-        text = token.text
-        match_ = HEXADECIMAL.match(text) or NUMERIC.match(text)
-        if match_ is None:
-            self.fail(
-                "Numeric literal regular expression did not match ({token.location()})",
-            )
-        decimal, fractional, exponent = match_.groups()
-
-        is_float = fractional or exponent
-
-        value: int | float
-        if decimal.lower().startswith("0x"):  # is hex?
-            value = float.fromhex(text) if is_float else int(text, 16)
-            return Value("Float" if is_float else "Integer", value)
-        value = float(text) if is_float else int(text)
-        return Value("Float" if is_float else "Integer", value, from_token=token)
+        value = numeric_value(token)
+        name = "Float" if isinstance(value, float) else "Integer"
+        if HEXADECIMAL.match(token.text):  # is hex?
+            return Value(name, value)
+        return Value(name, value, from_token=token)
 
     def parse_field(self) -> Value[Any]:
         """Parse table field."""
@@ -675,6 +1062,150 @@ def parse_lua_table(table_value: Value[Any], convert_lists: bool = True) -> tupl
     # return value.unpack_join()
 
 
+class TableFrame:
+    """Table being read by read_lua_table."""
+
+    __slots__ = ("is_list", "key", "last_int_key", "next_index", "table")
+
+    def __init__(self, is_list: bool) -> None:
+        """Initialize empty table, which is a list until a key says otherwise if is_list."""
+        self.table: dict[str | int, object] = {}
+        self.key: str | int = 0
+        self.next_index = 1
+        self.last_int_key = 0
+        self.is_list = is_list
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} {len(self.table)} fields>"
+
+    def add(self, value: object) -> None:
+        """Set value of current key."""
+        key = self.key
+        if self.is_list:
+            if isinstance(key, int) and key == self.last_int_key + 1:
+                self.last_int_key = key
+            else:
+                self.is_list = False
+        self.table[key] = value
+
+    def result(self) -> dict[str | int, object] | list[object]:
+        """Return table, or list if all keys were 1 to n in order."""
+        if not self.is_list:
+            return self.table
+        return [self.table[i + 1] for i in range(len(self.table))]
+
+
+def read_lua_table(
+    tokens: Sequence[Token],
+    convert_lists: bool = True,
+    keep_tokens: bool = True,
+) -> tuple[object, list[Token]]:
+    """Parse lua value from tokens (without CST tokens) in a single pass.
+
+    Gives the same result as parse_lua_table(Parser(tokens).parse_value()),
+    but builds Python objects directly instead of a Value tree, and
+    tracks nested tables with an explicit stack instead of recursion,
+    so nesting depth is not limited by the recursion limit. If not
+    keep_tokens, the list of tokens values came from is left empty.
+    """
+    from_tokens: list[Token] = []
+    stack: list[TableFrame] = []
+    index = 0
+
+    def next_token() -> Token:
+        nonlocal index
+        if index >= len(tokens):
+            raise ParseError("Ran out of tokens")
+        token = tokens[index]
+        index += 1
+        return token
+
+    def expect(text: str) -> None:
+        token = next_token()
+        if token.text != text:
+            raise ParseError(f"Expected {text!r}, got {token.text!r} ({token.location()})")
+
+    def end_field() -> None:
+        """Read separator after table field, leaving closing brace to be read."""
+        nonlocal index
+        separator = next_token()
+        if separator.text == "}":
+            index -= 1
+        elif separator.text not in {",", ";"}:
+            raise ParseError(f"Expected ',', ';', or '}}', got {separator.text!r} ({separator.location()})")
+
+    def read_scalar(token: Token) -> object:
+        """Return value of a token that is not a table."""
+        if isinstance(token, StrLit):
+            return string_value(token.text)
+        if isinstance(token, Numeric):
+            return numeric_value(token)
+        if isinstance(token, Identifier):
+            text = token.text
+            if text in {"true", "false"}:
+                return text == "true"
+            if text == "nil":
+                return None
+            if text not in KEYWORDS and index < len(tokens):
+                after = tokens[index]
+                if after.text not in {"(", "{", "="} and not isinstance(after, StrLit):
+                    return text
+        raise ParseError(f"Unsupported value {token!r} ({token.location()})")
+
+    # Positional field values are recorded twice, like parse_lua_table does
+    repeat = 1
+    while True:
+        # Read a value
+        token = next_token()
+        if keep_tokens:
+            from_tokens.extend((token,) * repeat)
+        if token.text == "{" and isinstance(token, Separator):
+            stack.append(TableFrame(convert_lists))
+        else:
+            value = read_scalar(token)
+            if not stack:
+                return value, from_tokens
+            stack[-1].add(value)
+            end_field()
+
+        # Close finished tables until reaching the start of a field
+        while True:
+            frame = stack[-1]
+            token = next_token()
+            if token.text == "}":
+                stack.pop()
+                table = frame.result()
+                if not stack:
+                    return table, from_tokens
+                stack[-1].add(table)
+                end_field()
+                continue
+            if token.text == "[":
+                key_token = next_token()
+                key = read_scalar(key_token)
+                if keep_tokens:
+                    from_tokens.extend((token, key_token))
+                if not isinstance(key, str | int):
+                    raise ParseError(f"Unsupported table key {key_token!r} ({key_token.location()})")
+                expect("]")
+                expect("=")
+                frame.key = key
+                repeat = 1
+            elif isinstance(token, Identifier) and token.text not in KEYWORDS:
+                if keep_tokens:
+                    from_tokens.append(token)
+                expect("=")
+                frame.key = token.text
+                repeat = 1
+            else:
+                index -= 1
+                frame.key = frame.next_index
+                frame.next_index += 1
+                repeat = 2
+            break
+
+
 def convert_lists(table_data: dict[Any, Any]) -> dict[Any, Any]:
     """Convert internal numeric tables to lists."""
 
@@ -28,15 +28,33 @@ __license__ = "GNU General Public License Version 3"
 
 import copy
 import os
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
 
 import httpx
 import trio
 
-from localization_translation import convert, extricate, languages, lolcat, translate
+from localization_translation import (
+    convert,
+    convert_parse,
+    extricate,
+    journal,
+    languages,
+    lolcat,
+    lua_document,
+    parse_cache,
+    parse_service,
+    pipeline,
+    translate,
+    translation_memory,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Awaitable, Callable
+    from collections.abc import Awaitable, Callable, Iterator
+
+    from localization_translation.backends import TranslationBackend
+
+# English files downloaded at once while earlier folders translate
+FETCH_WORKERS: Final = 2
 
 ##import json
 ##import base64
@@ -69,10 +87,44 @@ async def translate_file(
     client: httpx.AsyncClient,
     to_lang: str,
     src_lang: str = "auto",
+    memory: translation_memory.TranslationMemory | None = None,
+    dedup: translate.Deduplicator | None = None,
+    backend: TranslationBackend | None = None,
+    progress: journal.FileProgress | None = None,
+    plan: extricate.FlattenPlan | None = None,
 ) -> dict[str, Any]:
-    """Translate an entire file."""
-    keys, sentences = extricate.dict_to_list(data)
-    results = await translate.translate_async(client, sentences, to_lang, src_lang)
+    """Translate an entire file.
+
+    If dedup is given, text already translated during this run is reused.
+    If backend is given, translate with it instead of Google Translate.
+    If progress is given, values it has from an interrupted run are reused
+    and newly translated values are recorded to it as they arrive.
+    If plan is given, it must be the FlattenPlan of data, so it can be
+    shared by every language data is translated into.
+    """
+    if plan is None:
+        plan = extricate.FlattenPlan(data)
+    sentences = plan.values
+    keys = [] if progress is None else plan.string_keys()
+    restored = {} if progress is None else progress.restore(keys, sentences)
+    todo = [idx for idx in range(len(sentences)) if idx not in restored]
+
+    def record(translated: dict[int, str]) -> None:
+        """Record translated values of todo sentences."""
+        assert progress is not None
+        progress.record(keys, sentences, {todo[i]: text for i, text in translated.items()})
+
+    on_batch = None if progress is None else record
+    queries = [sentences[idx] for idx in todo]
+    if dedup is not None:
+        translated = await dedup.translate(client, queries, to_lang, src_lang, memory, backend, on_batch)
+    else:
+        translated = await translate.translate_async(client, queries, to_lang, src_lang, memory, backend, on_batch)
+    results: list[str | int] = list(sentences)
+    for idx, text in restored.items():
+        results[idx] = text
+    for idx, new_text in zip(todo, translated, strict=True):
+        results[idx] = new_text
     for old, new in zip(enumerate(sentences), results, strict=True):
         idx, orig = old
         if new is None or not isinstance(orig, str):
@@ -81,7 +133,7 @@ async def translate_file(
         assert isinstance(new, str)
         if orig.endswith(" ") and not new.endswith(" "):
             results[idx] = new + " "
-    return extricate.list_to_dict(keys, results)  # type: ignore[no-any-return]
+    return plan.rebuild(results)  # type: ignore[no-any-return]
 
 
 def raw_github_address(user: str, repo: str, branch: str, path: str) -> str:
@@ -92,7 +144,8 @@ def raw_github_address(user: str, repo: str, branch: str, path: str) -> str:
 async def download_coroutine(client: httpx.AsyncClient, url: str) -> bytes:
     """Return the sentence translated, asynchronously."""
     # Go to the URL and get response
-    response = await client.get(url, follow_redirects=True)
+    async with translate.SCHEDULER.slot(url):
+        response = await client.get(url, follow_redirects=True)
     if not response.is_success:
         response.raise_for_status()
     # Wait for our response
@@ -116,6 +169,25 @@ def ensure_folder_exists(new_filename: str) -> None:
             os.mkdir(new_path)
 
 
+def open_translation_memory(cache_dir: str) -> translation_memory.TranslationMemory:
+    """Open translation memory database that lives in cache folder."""
+    filename = os.path.join(cache_dir, "translation_memory.sqlite3")
+    ensure_folder_exists(filename)
+    return translation_memory.TranslationMemory(filename)
+
+
+def open_journal(cache_dir: str) -> journal.Journal:
+    """Open checkpoint journal of the current run that lives in cache folder."""
+    filename = os.path.join(cache_dir, "journal.jsonl")
+    ensure_folder_exists(filename)
+    return journal.Journal(filename)
+
+
+def open_parse_cache(cache_dir: str) -> parse_cache.ParseCache:
+    """Return cache of parsed files that lives in cache folder."""
+    return parse_cache.ParseCache(os.path.join(cache_dir, ".parsed"))
+
+
 ##async def download_file(path: str, cache_dir: str, client: httpx.AsyncClient) -> str:
 ##    "Download file at path from MineOS repository."
 ##    real_path = os.path.join(cache_dir, *path.split('/'))
@@ -134,20 +206,26 @@ def ensure_folder_exists(new_filename: str) -> None:
 ##        return file.read()
 
 
+async def cache_file(path: str, cache_dir: str, client: httpx.AsyncClient) -> str:
+    """Download file at path from MineOS repository to cache folder if not there yet. Return cached filename."""
+    real_path = os.path.join(cache_dir, *path.split("/"))
+    if os.path.exists(real_path):
+        print(f"Loaded {path} from cache")
+        return real_path
+    ensure_folder_exists(real_path)
+    print(f"GET {path}")
+    response = await download_coroutine(client, mineos_url(path))
+    # j_resp = json.loads(response)
+    # data = base64.b64decode(j_resp['content'])
+    with open(real_path, "wb") as file:  # noqa: ASYNC230
+        file.write(response)
+    await trio.sleep(1)
+    return real_path
+
+
 async def download_file(path: str, cache_dir: str, client: httpx.AsyncClient) -> str:
     """Download file at path from MineOS repository."""
-    real_path = os.path.join(cache_dir, *path.split("/"))
-    if not os.path.exists(real_path):
-        ensure_folder_exists(real_path)
-        print(f"GET {path}")
-        response = await download_coroutine(client, mineos_url(path))
-        # j_resp = json.loads(response)
-        # data = base64.b64decode(j_resp['content'])
-        with open(real_path, "wb") as file:  # noqa: ASYNC230
-            file.write(response)
-        await trio.sleep(1)
-        return response.decode("utf-8")
-    print(f"Loaded {path} from cache")
+    real_path = await cache_file(path, cache_dir, client)
     with open(real_path, encoding="utf-8") as file:  # noqa: ASYNC230
         return file.read()
 
@@ -156,9 +234,15 @@ async def download_lang(
     path: str,
     cache_dir: str,
     client: httpx.AsyncClient,
+    parsed: parse_cache.ParseCache | None = None,
 ) -> tuple[dict[str, Any], dict[str, dict[int, str]]]:
-    """Download file from MineOS repository and decode as lang file. Return dict and comments."""
-    return convert.lang_to_json(await download_file(path, cache_dir, client))
+    """Download file from MineOS repository and decode as lang file. Return dict and comments.
+
+    Parse results are reused from parsed, or the parse cache in cache folder if not given.
+    """
+    if parsed is None:
+        parsed = open_parse_cache(cache_dir)
+    return await parsed.parse(convert.lang_to_json, await download_file(path, cache_dir, client))
 
 
 def split(path: str) -> tuple[str, str]:
@@ -182,36 +266,42 @@ def section_to_walk(section: list[str]) -> tuple[tuple[str, list[str]], ...]:
     return tuple(dirs.items())
 
 
-async def translate_file_given_coro(
-    trans_coro: Callable[[dict[str, Any], str, str], Awaitable[dict[str, Any]]],
-    file: tuple[dict[str, Any], dict[str, dict[int, str]]],
-    lang_data: list[tuple[str, str]],
-    folder: str,
-) -> int:
-    """Translate a file for all languages in lang_data and save as filename from data."""
-    # English and comments is file
-    # to_lang and filename is each entry in lang_data
-    english, comments = file
-
-    changed = 0
-
-    async def translate_file_coro(to_lang: str, filename: str) -> None:
-        """Translate file from English to to_lang, save as filename."""
-        nonlocal changed
-        # print(f"START {to_lang.title()}")
-        new_lang = await trans_coro(english, to_lang, folder)
-        if new_lang:
-            print(f"END {to_lang.title()}")
-            ensure_folder_exists(filename)
-            convert.write_lang_file(filename, new_lang, comments)
-            changed += 1
-        else:
-            print(f"END {to_lang.title()}: not changed")
+def request_errors(exc: BaseException) -> list[translate.RequestError] | None:
+    """Return every RequestError exc is made of, or None if it holds anything else.
+
+    Requests run in nurseries, so failures can arrive in exception groups.
+    """
+    if isinstance(exc, translate.RequestError):
+        return [exc]
+    inner = getattr(exc, "exceptions", None)
+    if not inner:
+        return None
+    errors: list[translate.RequestError] = []
+    for part in inner:
+        part_errors = request_errors(part)
+        if part_errors is None:
+            return None
+        errors.extend(part_errors)
+    return errors
+
+
+class FolderJob(NamedTuple):
+    """Folder that needs languages translated."""
+
+    section: str
+    folder: str
+    lang_data: list[tuple[str, str]]  # Language name and filename to save as
+
 
-    async with trio.open_nursery() as nursery:
-        for to_lang, filename in lang_data:
-            nursery.start_soon(translate_file_coro, to_lang, filename)
-    return changed
+class LanguageJob(NamedTuple):
+    """Translation of one folder into one language."""
+
+    folder: str
+    to_lang: str
+    filename: str
+    english: dict[str, Any]
+    comments: dict[str, dict[int, str]]
+    plan: extricate.FlattenPlan  # Of english, shared by every language of folder
 
 
 async def abstract_translate(
@@ -219,16 +309,38 @@ async def abstract_translate(
     base_lang: str,
     cache_folder: str,
     get_unhandled: Callable[[set[str], str], set[str]],
-    trans_coro: Callable[[dict[str, Any], str, str], Awaitable[dict[str, Any]]],
+    trans_coro: Callable[
+        [dict[str, Any], str, str, extricate.FlattenPlan],
+        Awaitable[dict[str, Any] | lua_document.LuaDocument],
+    ],
+    checkpoint: journal.Journal | None = None,
 ) -> None:
-    """Abstract translation handler."""
+    """Abstract translation handler.
+
+    Folders stream through fetch, parse, translate, and write stages,
+    so the next folder is downloaded and parsed while the current one is
+    translated, and every language is saved as soon as it is done.
+    Files are parsed in worker processes, so parsing does not hold up
+    requests, unless they were parsed by an earlier run already.
+    If checkpoint is given, every saved (folder, language) is marked done in it,
+    and ones it already has marked done are skipped.
+    trans_coro is called with English data, language, folder, and the
+    FlattenPlan of English data, which is made once per folder and only
+    kept until every language of the folder is written. It can return a
+    LuaDocument instead of data to have its edits written over the
+    original text of the language file.
+    A (folder, language) whose requests keep failing is reported and
+    skipped, so the rest of the run goes on and it is picked up again
+    by the next run.
+    """
     ignore_languages = {
         "chinese (traditional)",
     }
     convert_name = {"zh-cn": "chinese"}
 
     print("\nGettting files...")
-    files, file_comments = await download_lang("Installer/Files.cfg", cache_folder, client)
+    parsed = open_parse_cache(cache_folder)
+    files, file_comments = await download_lang("Installer/Files.cfg", cache_folder, client, parsed)
     # Get true copy
     orig_files = copy.deepcopy(files)
 
@@ -241,59 +353,142 @@ async def abstract_translate(
     print(f"\nSections with English.lang files: {', '.join(search)}\n")
 
     new_files = 1
-
-    for section in search:
-        lang_files = [f for f in files[section] if isinstance(f, str) and f.endswith(".lang")]
-        if section == "localizations":
-            lang_files += [f"Installer/{f}" for f in lang_files]
-        if not lang_files:
-            continue
-        print("#" * 0x20 + section + "#" * 0x20)
-        for folder, exists in section_to_walk(lang_files):
-            handled_langs: set[str] = {(f.split(".")[0]).lower() for f in exists}
-            if not handled_langs:
+    # Languages of each folder still waiting to be written
+    remaining: dict[str, int] = {}
+    # Folder and language of translations that gave up
+    failed: list[tuple[str, str]] = []
+
+    def plan() -> Iterator[FolderJob]:
+        """Yield folders that need translating, adding new files to file list."""
+        nonlocal new_files
+        for section in search:
+            lang_files = [f for f in files[section] if isinstance(f, str) and f.endswith(".lang")]
+            if section == "localizations":
+                lang_files += [f"Installer/{f}" for f in lang_files]
+            if not lang_files:
                 continue
-            last_handled = folder + "/" + exists[-1].split(".")[0].title() + ".lang"
-            handled_langs |= ignore_languages
-
-            unhandled = get_unhandled(handled_langs, folder)
-
-            if not unhandled:
-                print("All translations exist for this folder, skipping.")
-                continue
-
-            english, comments = await download_lang(f"{folder}/English.lang", cache_folder, client)
-
-            real_folder = os.path.sep.join(folder.split("/"))
-            base_group = os.path.join(base_lang, real_folder)
-            total = len(unhandled)
-            print(f"\n{total} languages do not exist, translating them now!")
-            # print(f'{lang_files = }')
-            insert_start = lang_files.index(last_handled)
-            # insert_start = files[section].index(last_handled)
-
-            lang_data = []
-
-            for idx, to_lang in enumerate(unhandled):
-                name = convert_name.get(to_lang, to_lang).title()
-
-                fname = name.replace(" ", "_")
-                fname = fname.replace("(", "").replace(")", "")
-                section_filename = f"{folder}/{fname}.lang"
-                if section_filename not in files[section]:
-                    if folder == "Installer/Localizations":
+            for folder, exists in section_to_walk(lang_files):
+                handled_langs: set[str] = {(f.split(".")[0]).lower() for f in exists}
+                if not handled_langs:
+                    continue
+                last_handled = folder + "/" + exists[-1].split(".")[0].title() + ".lang"
+                handled_langs |= ignore_languages
+
+                unhandled = get_unhandled(handled_langs, folder)
+
+                if not unhandled:
+                    print(f"All translations exist for {folder}, skipping.")
+                    continue
+
+                real_folder = os.path.sep.join(folder.split("/"))
+                base_group = os.path.join(base_lang, real_folder)
+                insert_start = lang_files.index(last_handled)
+
+                lang_data = []
+
+                for idx, to_lang in enumerate(unhandled):
+                    name = convert_name.get(to_lang, to_lang).title()
+
+                    fname = name.replace(" ", "_")
+                    fname = fname.replace("(", "").replace(")", "")
+                    section_filename = f"{folder}/{fname}.lang"
+                    if section_filename not in files[section]:
+                        if folder == "Installer/Localizations":
+                            continue
+                        files[section].insert(insert_start + idx, section_filename)
+
+                    real_filename = os.path.join(base_group, f"{fname}.lang")
+                    if checkpoint is not None and (folder, to_lang) in checkpoint.done:
+                        # Finished by an interrupted run already
                         continue
-                    files[section].insert(insert_start + idx, section_filename)
-
-                real_filename = os.path.join(base_group, f"{fname}.lang")
-                if not os.path.exists(real_filename):
-                    lang_data.append((to_lang, real_filename))
-                else:
-                    new_files += 1
-
-            new_files += await translate_file_given_coro(trans_coro, (english, comments), lang_data, folder)
-            print("\n" + "#" * 0xF + "Done with folder" + "#" * 0xF)
+                    if not os.path.exists(real_filename):
+                        lang_data.append((to_lang, real_filename))
+                    else:
+                        new_files += 1
+
+                if lang_data:
+                    yield FolderJob(section, folder, lang_data)
+
+    # Sections that had their header printed
+    announced: set[str] = set()
+
+    async def fetch(job: FolderJob) -> tuple[tuple[FolderJob, str]]:
+        """Download English file of folder."""
+        # Printed here and not while planning, planning happens lazily
+        # while other stages are busy
+        if job.section not in announced:
+            announced.add(job.section)
+            print("#" * 0x20 + job.section + "#" * 0x20)
+        print(f"\n{len(job.lang_data)} languages do not exist for {job.folder}, translating them now!")
+        return ((job, await download_file(f"{job.folder}/English.lang", cache_folder, client)),)
+
+    async def parse(item: tuple[FolderJob, str]) -> list[LanguageJob]:
+        """Decode English file and split folder into one job per language."""
+        job, text = item
+        english, comments = await parsed.parse(convert.lang_to_json, text)
+        remaining[job.folder] = len(job.lang_data)
+        plan = extricate.FlattenPlan(english)
+        return [
+            LanguageJob(job.folder, to_lang, filename, english, comments, plan) for to_lang, filename in job.lang_data
+        ]
+
+    async def translate_language(
+        job: LanguageJob,
+    ) -> tuple[tuple[LanguageJob, dict[str, Any] | lua_document.LuaDocument | None]]:
+        """Translate English file into language of job, or None if requests keep failing."""
+        try:
+            return ((job, await trans_coro(job.english, job.to_lang, job.folder, job.plan)),)
+        except Exception as exc:
+            errors = request_errors(exc)
+            if errors is None:
+                raise
+            print(f"FAILED {job.to_lang.title()} for {job.folder}: {errors[0]}")
+            return ((job, None),)
+
+    async def write(item: tuple[LanguageJob, dict[str, Any] | lua_document.LuaDocument | None]) -> tuple[()]:
+        """Save translated file, if anything changed."""
+        nonlocal new_files
+        job, new_lang = item
+        if new_lang is None:
+            failed.append((job.folder, job.to_lang))
+            # Do not list a file that was never written
+            name = f"{job.folder}/{os.path.basename(job.filename)}"
+            for section, entries in files.items():
+                if name in entries and name not in orig_files.get(section, ()):
+                    entries.remove(name)
+        elif isinstance(new_lang, lua_document.LuaDocument) or new_lang:
+            await trio.to_thread.run_sync(ensure_folder_exists, job.filename)
+            if isinstance(new_lang, lua_document.LuaDocument):
+                await trio.to_thread.run_sync(lua_document.write_document, job.filename, new_lang)
+            else:
+                await trio.to_thread.run_sync(convert.write_lang_file, job.filename, new_lang, job.comments)
+            new_files += 1
+            print(f"END {job.to_lang.title()}")
+        else:
+            print(f"END {job.to_lang.title()}: not changed")
+        if checkpoint is not None and new_lang is not None:
+            checkpoint.finish(job.folder, job.to_lang)
+        remaining[job.folder] -= 1
+        if not remaining[job.folder]:
+            del remaining[job.folder]
+            print("\n" + "#" * 0xF + f"Done with {job.folder}" + "#" * 0xF)
+        return ()
+
+    stages = pipeline.Pipeline(
+        (
+            pipeline.Stage("fetch", fetch, FETCH_WORKERS),
+            pipeline.Stage("parse", parse, parse_service.WORKERS),
+            pipeline.Stage("translate", translate_language, translate.SCHEDULER.max_concurrent),
+            pipeline.Stage("write", write),
+        ),
+    )
+    await stages.run(plan())
     print("\nLanguages have been translated and saved to upload folder!")
+    if failed:
+        print(f"{len(failed)} translations failed, run again to resume them:")
+        for folder, to_lang in failed:
+            print(f"    {folder}: {to_lang.title()}")
+    print(f"Parse cache: {parsed.hits} hits, {parsed.misses} misses")
 
     if files == orig_files:
         new_files -= 1
@@ -307,8 +502,8 @@ async def abstract_translate(
     print(f"Done! {new_files} new files created.")
 
 
-async def translate_main(client: httpx.AsyncClient) -> None:
-    """Translate with google translate."""
+async def translate_main(client: httpx.AsyncClient, backend: TranslationBackend | None = None) -> None:
+    """Translate with google translate, or backend if given."""
     here_folder = os.getcwd()
     base_lang = os.path.join(here_folder, "mineos_upload")
     cache_folder = os.path.join(here_folder, "mineos_cache")
@@ -318,11 +513,21 @@ async def translate_main(client: httpx.AsyncClient) -> None:
         # return ['greek']
         return {k for k in languages.LANGCODES if k not in handled}
 
-    async def trans_coro(english: dict[str, Any], to_lang: str, folder: str) -> dict[str, Any]:
+    async def trans_coro(
+        english: dict[str, Any],
+        to_lang: str,
+        folder: str,
+        plan: extricate.FlattenPlan,
+    ) -> dict[str, Any]:
         code = languages.LANGCODES[to_lang]
-        return await translate_file(english, client, code, "en")
+        progress = checkpoint.progress(folder, to_lang)
+        return await translate_file(english, client, code, "en", memory, dedup, backend, progress, plan)
 
-    await abstract_translate(client, base_lang, cache_folder, get_unhandled, trans_coro)
+    dedup = translate.Deduplicator()
+    with open_translation_memory(cache_folder) as memory, open_journal(cache_folder) as checkpoint:
+        await abstract_translate(client, base_lang, cache_folder, get_unhandled, trans_coro, checkpoint)
+        print(f"Translation memory: {memory.hits} hits, {memory.misses} misses")
+    print(f"Deduplication: {dedup.requested} unique texts translated, {dedup.reused} reused")
 
 
 async def translate_new_value(client: httpx.AsyncClient, key: str, folder: str) -> None:
@@ -336,23 +541,30 @@ async def translate_new_value(client: httpx.AsyncClient, key: str, folder: str)
             return handled - {"chinese (traditional)", "english", "lolcat"}
         return set()
 
-    async def trans_coro(english: dict[str, Any], to_lang: str, folder: str) -> dict[str, Any]:
+    async def trans_coro(
+        english: dict[str, Any],
+        to_lang: str,
+        folder: str,
+        plan: extricate.FlattenPlan,
+    ) -> lua_document.LuaDocument:
         fname = to_lang.replace(" ", "_")
         fname = fname.replace("(", "").replace(")", "").title()
         filename = f"{folder}/{fname}.lang"
 
-        data = (await download_lang(filename, cache_folder, client))[0]
+        # Only the new value is written, the rest of the file stays as it is
+        document = lua_document.LuaDocument(await download_file(filename, cache_folder, client))
 
         if to_lang == "chinese":
             to_lang += " (traditional)"
 
         code = languages.LANGCODES[to_lang]
 
-        values = await translate.translate_async(client, [english[key]], code, "en")
-        data[key] = values[0]
-        return data
+        values = await translate.translate_async(client, [english[key]], code, "en", memory)
+        document.set((key,), values[0])
+        return document
 
-    await abstract_translate(client, base_lang, cache_folder, get_unhandled, trans_coro)
+    with open_translation_memory(cache_folder) as memory:
+        await abstract_translate(client, base_lang, cache_folder, get_unhandled, trans_coro)
 
 
 def fix_translation(original: str, value: str) -> str:
@@ -382,12 +594,21 @@ async def translate_broken_values(client: httpx.AsyncClient) -> None:
             return set()
         return handled.difference({"chinese (traditional)", "english", "lolcat"})
 
-    async def trans_coro(english: dict[str, str], to_lang: str, folder: str) -> dict[str, str]:
+    async def trans_coro(
+        english: dict[str, Any],
+        to_lang: str,
+        folder: str,
+        plan: extricate.FlattenPlan,
+    ) -> dict[str, str] | lua_document.LuaDocument:
         fname = to_lang.replace(" ", "_")
         fname = fname.replace("(", "").replace(")", "").title()
         filename = f"{folder}/{fname}.lang"
 
-        data = (await download_lang(filename, cache_folder, client))[0]
+        # Most files have nothing broken, so only their values are read
+        # from the memory mapped file, without holding its text
+        real_path = await cache_file(filename, cache_folder, client)
+        data = await trio.to_thread.run_sync(convert_parse.read_lang_file, real_path)
+        assert isinstance(data, dict)
 
         if to_lang == "chinese":
             to_lang += " (traditional)"
@@ -395,34 +616,38 @@ async def translate_broken_values(client: httpx.AsyncClient) -> None:
         code = languages.LANGCODES[to_lang]
 
         ##        translated = await translate_file(english, client, code, 'en')
-        modified = False
-
-        async def translate_single(key: str) -> None:
-            """Translate single value."""
-            nonlocal modified
+        broken: list[str] = []
+        for key, original in english.items():
+            if not isinstance(original, str):
+                continue
+            existing = data.get(key)
+            if existing is None or existing == original or key == existing:
+                # print(f'{data[key]!r} -> {translated[key]!r}')
+                # data[key] = translated[key]
+                broken.append(key)
+
+        # All broken values of the file are translated in shared batches
+        translated = await dedup.translate(client, [english[key] for key in broken], code, "en", memory)
+        fixed: dict[lua_document.Key, object] = {}
+        for key, value in zip(broken, translated, strict=True):
             ##            print(f'{english[key] = }')
-            if not isinstance(english[key], str):
-                return
-            value = await translate.get_translated_coroutine(client, english[key], code, "en")
-            value = fix_translation(english[key], value)  # type: ignore[arg-type]
+            value = fix_translation(english[key], str(value))
             if value != data.get(key):
                 print(f"{data.get(key)!r} -> {value!r}")
-                modified = True
-            data[key] = value
+                fixed[key] = value
 
-        async with trio.open_nursery() as nursery:
-            for key in english:
-                existing = data.get(key)
-                if existing is None or existing == english[key] or key == existing:
-                    # print(f'{data[key]!r} -> {translated[key]!r}')
-                    # data[key] = translated[key]
-                    nursery.start_soon(translate_single, key)
+        if not fixed:
+            return {}
+        # Fixed values are written over the original text of the file
+        document = lua_document.LuaDocument(await download_file(filename, cache_folder, client))
+        document.update(fixed)
+        return document
 
-        if modified:
-            return data
-        return {}
-
-    await abstract_translate(client, base_lang, cache_folder, get_unhandled, trans_coro)
+    dedup = translate.Deduplicator()
+    with open_translation_memory(cache_folder) as memory:
+        await abstract_translate(client, base_lang, cache_folder, get_unhandled, trans_coro)
+        print(f"Translation memory: {memory.hits} hits, {memory.misses} misses")
+    print(f"Deduplication: {dedup.requested} unique texts translated, {dedup.reused} reused")
 
 
 async def translate_lolcat(client: httpx.AsyncClient) -> None:
@@ -436,7 +661,12 @@ async def translate_lolcat(client: httpx.AsyncClient) -> None:
     def get_unhandled(handled: set[str], folder: str) -> set[str]:
         return {"lolcat"}  # if not 'lolcat' in handled else set()
 
-    async def trans_coro(english: dict[str, str], to_lang: str, folder: str) -> dict[str, str]:
+    async def trans_coro(
+        english: dict[str, str],
+        to_lang: str,
+        folder: str,
+        plan: extricate.FlattenPlan,
+    ) -> dict[str, str]:
         return lolcat.translate_file(english)
 
     await abstract_translate(client, base_lang, cache_folder, get_unhandled, trans_coro)
@@ -0,0 +1,149 @@
+"""Mock Server - Local stand-in for the Google Translate endpoint."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Mock Server - Local stand-in for the Google Translate endpoint
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Mock Server"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+
+import json
+from functools import partial
+from typing import TYPE_CHECKING, Final
+from urllib.parse import parse_qs, urlsplit
+
+import trio
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+PATH: Final = "/translate_a/single"
+MAX_HEADER_SIZE: Final = 65536
+
+REASONS: Final = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests"}
+
+
+class MockTranslateServer:
+    """HTTP server answering like the Google Translate gtx endpoint.
+
+    Text is "translated" with transform, one segment per line like
+    Google does. Every response is delayed by latency seconds, and if
+    fail_every is set, every fail_every-th request gets HTTP 429.
+    """
+
+    __slots__ = ("fail_every", "host", "latency", "port", "requests", "transform")
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        transform: Callable[[str], str] = str.swapcase,
+        fail_every: int = 0,
+    ) -> None:
+        """Initialize with response delay, translation function, and failure rate."""
+        self.latency = latency
+        self.transform = transform
+        self.fail_every = fail_every
+        self.requests = 0
+        self.host = "127.0.0.1"
+        self.port = 0
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} {self.url} {self.requests} requests>"
+
+    @property
+    def url(self) -> str:
+        """URL of translation endpoint."""
+        return f"http://{self.host}:{self.port}{PATH}"
+
+    def respond(self, target: str) -> tuple[int, bytes]:
+        """Return status code and json body for request target."""
+        self.requests += 1
+        if self.fail_every and self.requests % self.fail_every == 0:
+            return 429, b"[]"
+        split = urlsplit(target)
+        if split.path != PATH:
+            return 404, b"[]"
+        query = parse_qs(split.query, keep_blank_values=True)
+        if "q" not in query:
+            return 400, b"[]"
+        text = query["q"][0]
+        segments = [[self.transform(line), line, None, None, 10] for line in text.splitlines(True)]
+        source = query.get("sl", ["auto"])[0]
+        return 200, json.dumps([segments, None, source]).encode("utf-8")
+
+    async def handle_connection(self, stream: trio.SocketStream) -> None:
+        """Answer HTTP/1.1 requests on stream until client closes it."""
+        buffer = b""
+        async with stream:
+            while True:
+                while b"\r\n\r\n" not in buffer:
+                    if len(buffer) > MAX_HEADER_SIZE:
+                        return
+                    data = await stream.receive_some(MAX_HEADER_SIZE)
+                    if not data:
+                        return
+                    buffer += data
+                head, buffer = buffer.split(b"\r\n\r\n", 1)
+                request_line = head.split(b"\r\n", 1)[0].decode("latin-1")
+                _method, target, _version = request_line.split(" ", 2)
+                if self.latency:
+                    await trio.sleep(self.latency)
+                status, body = self.respond(target)
+                header = (
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    "Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    "\r\n"
+                )
+                await stream.send_all(header.encode("latin-1") + body)
+
+    async def serve(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        task_status: trio.TaskStatus[str] = trio.TASK_STATUS_IGNORED,
+    ) -> None:
+        """Serve forever on host and port (0 picks a free port). Report URL when started."""
+        async with trio.open_nursery() as nursery:
+            listeners = await nursery.start(partial(trio.serve_tcp, self.handle_connection, port, host=host))
+            self.host = host
+            self.port = listeners[0].socket.getsockname()[1]
+            task_status.started(self.url)
+
+
+async def async_run() -> None:
+    """Serve mock translation server until interrupted."""
+    server = MockTranslateServer()
+    async with trio.open_nursery() as nursery:
+        url = await nursery.start(partial(server.serve, port=8000))
+        print(f"Serving mock translations at {url}")
+
+
+def run() -> None:
+    """Run mock translation server."""
+    trio.run(async_run)
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
+    run()
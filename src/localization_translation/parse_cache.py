@@ -0,0 +1,112 @@
+"""Parse Cache - Remember parsed files by content hash."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Parse Cache - Remember parsed files by content hash
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Parse Cache"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+
+import hashlib
+import os
+import pickle
+from typing import TYPE_CHECKING, Any, Final, TypeVar
+
+import trio
+
+from localization_translation import parse_service
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+T = TypeVar("T")
+
+# Change whenever a parser gives different results for the same text,
+# so results cached by older versions are not used
+PARSER_VERSION: Final = 1
+
+
+class ParseCache:
+    """Parse results stored as pickle files, named by hash of what was parsed.
+
+    The hash covers the parser's name, PARSER_VERSION, and the text, so
+    a changed file or parser is simply a miss and stale entries are never
+    read. Unreadable entries are treated as misses too.
+    """
+
+    __slots__ = ("folder", "hits", "misses")
+
+    def __init__(self, folder: str) -> None:
+        """Initialize with folder to keep results in."""
+        self.folder = folder
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} {self.folder!r} {self.hits} hits, {self.misses} misses>"
+
+    def key(self, parser: Callable[[str], Any], text: str) -> str:
+        """Return cache key of parsing text with parser."""
+        digest = hashlib.sha256(f"{parser.__module__}.{parser.__qualname__}\0{PARSER_VERSION}\0".encode())
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        """Return filename of entry with key."""
+        return os.path.join(self.folder, key[:2], f"{key}.pickle")
+
+    def load(self, key: str) -> tuple[bool, Any]:
+        """Return if entry with key exists and its value."""
+        try:
+            with open(self.path(key), "rb") as file:
+                return True, pickle.load(file)  # noqa: S301
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError):
+            return False, None
+
+    def store(self, key: str, value: object) -> None:
+        """Save value as entry with key."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "wb") as file:
+            pickle.dump(value, file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, path)
+
+    async def parse(self, parser: Callable[[str], T], text: str) -> T:
+        """Return parser(text), from cache if it was parsed before.
+
+        Misses are parsed with parse_service, so parsing happens in a
+        worker process.
+        """
+        key = self.key(parser, text)
+        found, value = await trio.to_thread.run_sync(self.load, key)
+        if found:
+            self.hits += 1
+            return value  # type: ignore[no-any-return]
+        self.misses += 1
+        result = await parse_service.parse(parser, text)
+        await trio.to_thread.run_sync(self.store, key, result)
+        return result
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
@@ -0,0 +1,109 @@
+"""Parse Service - Parse lang files in worker processes."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Parse Service - Parse lang files in worker processes
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Parse Service"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+
+import atexit
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Final, TypeVar
+
+import trio
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+T = TypeVar("T")
+
+# Worker processes parsing at once
+WORKERS: Final = os.cpu_count() or 1
+# Text shorter than this is parsed right away, sending it to a worker costs more
+INLINE_SIZE: Final = 4096
+
+_EXECUTOR: ProcessPoolExecutor | None = None
+# Threads waiting on worker results, one per worker so the pool never sits idle
+_LIMITER: trio.lowlevel.RunVar[trio.CapacityLimiter] = trio.lowlevel.RunVar("parse_limiter")
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return shared process pool, starting it on first use.
+
+    Workers are spawned instead of forked, because forking a process
+    that is running trio threads can deadlock the child.
+    """
+    global _EXECUTOR  # pylint: disable=global-statement
+    if _EXECUTOR is None:
+        _EXECUTOR = ProcessPoolExecutor(WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        atexit.register(shutdown)
+    return _EXECUTOR
+
+
+def shutdown() -> None:
+    """Stop worker processes, if started."""
+    global _EXECUTOR  # pylint: disable=global-statement
+    if _EXECUTOR is not None:
+        _EXECUTOR.shutdown(cancel_futures=True)
+        _EXECUTOR = None
+
+
+def get_limiter() -> trio.CapacityLimiter:
+    """Return limiter of threads waiting on workers for current trio run."""
+    try:
+        return _LIMITER.get()
+    except LookupError:
+        limiter = trio.CapacityLimiter(WORKERS)
+        _LIMITER.set(limiter)
+        return limiter
+
+
+async def parse(parser: Callable[[str], T], text: str) -> T:
+    """Return parser(text), run in a worker process so the event loop keeps going.
+
+    parser must be a module level function so it can be sent to the
+    worker. Short text is parsed right away instead.
+    """
+    if len(text) < INLINE_SIZE:
+        return parser(text)
+    future = get_executor().submit(parser, text)
+    return await trio.to_thread.run_sync(future.result, limiter=get_limiter())
+
+
+async def parse_many(parser: Callable[[str], T], texts: Iterable[str]) -> list[T]:
+    """Return parser(text) for every text in order, using every worker at once."""
+    texts = list(texts)
+    results: list[T | None] = [None] * len(texts)
+
+    async def parse_one(index: int) -> None:
+        results[index] = await parse(parser, texts[index])
+
+    async with trio.open_nursery() as nursery:
+        for index in range(len(texts)):
+            nursery.start_soon(parse_one, index)
+    return results  # type: ignore[return-value]
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
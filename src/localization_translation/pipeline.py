@@ -0,0 +1,123 @@
+"""Pipeline - Stages connected by bounded memory channels."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Pipeline - Stages connected by bounded memory channels
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Pipeline"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
+
+import trio
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable, Sequence
+
+# Items that may wait between two stages before the earlier one blocks
+BUFFER_SIZE: Final = 4
+
+
+class Stage(NamedTuple):
+    """Step of a pipeline.
+
+    function is called with every item the previous stage produced and
+    returns the items to hand to the next stage, which may be none or
+    several. workers copies of the stage run at once.
+    """
+
+    name: str
+    function: Callable[[Any], Awaitable[Iterable[Any]]]
+    workers: int = 1
+
+
+class Pipeline:
+    """Run items through stages, every stage working at the same time.
+
+    Stages are connected by memory channels holding at most buffer_size
+    items, so a fast stage blocks instead of piling up work, and memory
+    use stays the same no matter how many items go through.
+    """
+
+    __slots__ = ("buffer_size", "processed", "stages")
+
+    def __init__(self, stages: Sequence[Stage], buffer_size: int = BUFFER_SIZE) -> None:
+        """Initialize with stages in order and channel buffer size."""
+        self.stages = tuple(stages)
+        self.buffer_size = buffer_size
+        self.processed: dict[str, int] = {stage.name: 0 for stage in self.stages}
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        names = " -> ".join(stage.name for stage in self.stages)
+        return f"<{self.__class__.__name__} {names}>"
+
+    async def _worker(
+        self,
+        stage: Stage,
+        receive: trio.MemoryReceiveChannel[Any],
+        send: trio.MemorySendChannel[Any] | None,
+    ) -> None:
+        """Handle items from receive with stage, sending results to send if given."""
+        async with receive:
+            if send is None:
+                async for item in receive:
+                    await stage.function(item)
+                    self.processed[stage.name] += 1
+                return
+            async with send:
+                async for item in receive:
+                    for result in await stage.function(item):
+                        await send.send(result)
+                    self.processed[stage.name] += 1
+
+    async def run(self, items: Iterable[Any]) -> None:
+        """Feed items into first stage and wait for every stage to finish.
+
+        items is read lazily, only as fast as the first stage takes them.
+        Whatever the last stage returns is discarded.
+        """
+        async with trio.open_nursery() as nursery:
+            first_send, receive = trio.open_memory_channel[Any](self.buffer_size)
+            for index, stage in enumerate(self.stages):
+                send: trio.MemorySendChannel[Any] | None = None
+                next_receive: trio.MemoryReceiveChannel[Any] | None = None
+                if index + 1 < len(self.stages):
+                    send, next_receive = trio.open_memory_channel[Any](self.buffer_size)
+                async with receive:
+                    for _ in range(stage.workers):
+                        nursery.start_soon(
+                            self._worker,
+                            stage,
+                            receive.clone(),
+                            None if send is None else send.clone(),
+                        )
+                if send is not None:
+                    await send.aclose()
+                if next_receive is not None:
+                    receive = next_receive
+            async with first_send:
+                for item in items:
+                    await first_send.send(item)
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
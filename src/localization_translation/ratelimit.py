@@ -0,0 +1,139 @@
+"""Rate Limit - Adaptive request pacing and retry backoff."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Rate Limit - Adaptive request pacing and retry backoff
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Rate Limit"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+
+import random
+from typing import Final
+
+import trio
+
+BACKOFF_BASE: Final = 0.5
+BACKOFF_CAP: Final = 60.0
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = BACKOFF_BASE,
+    cap: float = BACKOFF_CAP,
+    rng: random.Random | None = None,
+) -> float:
+    """Return seconds to wait before retry number attempt (starting at 0).
+
+    Uses "full jitter", a random delay between zero and an exponentially
+    growing ceiling, so retrying clients do not all come back at once.
+    """
+    ceiling = min(cap, base * 2**attempt)
+    return (rng or random).uniform(0, ceiling)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return seconds from Retry-After header value, or None if missing or a date."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class AdaptiveRateLimiter:
+    """Pace requests to a host, adapting rate with AIMD.
+
+    Requests are spaced 1 / rate seconds apart. Every success
+    additively increases the rate, slow responses decrease it a little,
+    and throttling (HTTP 429, server errors, block pages) multiplicatively
+    decreases it, so throughput settles just under what the endpoint
+    actually allows.
+    """
+
+    __slots__ = (
+        "clock",
+        "decrease",
+        "increase",
+        "latency_target",
+        "max_rate",
+        "min_rate",
+        "next_time",
+        "rate",
+        "slow_decrease",
+    )
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        min_rate: float = 0.25,
+        max_rate: float = 200.0,
+        increase: float = 0.25,
+        decrease: float = 0.5,
+        latency_target: float = 2.0,
+        slow_decrease: float = 0.9,
+    ) -> None:
+        """Initialize with starting rate (requests per second) and AIMD parameters."""
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.slow_decrease = slow_decrease
+        self.next_time = 0.0
+        self.clock: trio.abc.Clock | None = None
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} {self.rate:.2f} requests/second>"
+
+    def current_time(self) -> float:
+        """Return current time, forgetting schedule made under a different trio run."""
+        clock = trio.lowlevel.current_clock()
+        if clock is not self.clock:
+            self.clock = clock
+            self.next_time = 0.0
+        return trio.current_time()
+
+    async def wait(self) -> None:
+        """Wait until the next request may be sent."""
+        now = self.current_time()
+        send_at = max(now, self.next_time)
+        self.next_time = send_at + 1 / self.rate
+        await trio.sleep_until(send_at)
+
+    def succeeded(self, latency: float) -> None:
+        """Record a successful request that took latency seconds."""
+        if latency > self.latency_target:
+            self.rate = max(self.min_rate, self.rate * self.slow_decrease)
+        else:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def throttled(self, retry_after: float | None = None) -> None:
+        """Record being throttled, holding off all requests for retry_after seconds if given."""
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        if retry_after is not None:
+            self.next_time = max(self.next_time, self.current_time() + retry_after)
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
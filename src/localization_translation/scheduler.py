@@ -0,0 +1,168 @@
+"""Scheduler - Limit how many requests are in flight at once."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Scheduler - Limit how many requests are in flight at once
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Scheduler"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Final, TypeVar
+from urllib.parse import urlsplit
+
+import trio
+
+from localization_translation import ratelimit
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+
+MAX_CONCURRENT: Final = 32
+MAX_PER_HOST: Final = 8
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def get_host(url: str) -> str:
+    """Return host name of URL, or URL itself if it is just a host."""
+    return urlsplit(url).hostname or url
+
+
+class RequestScheduler:
+    """Cap requests in flight, both overall and for each host.
+
+    Every request must hold a token from the global limiter and from the
+    limiter for the host it is talking to. Each host also gets an
+    adaptive rate limiter that requests can use to pace themselves.
+    """
+
+    __slots__ = ("_global", "host_limits", "hosts", "max_concurrent", "max_per_host", "rates")
+
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENT,
+        max_per_host: int = MAX_PER_HOST,
+        host_limits: dict[str, int] | None = None,
+    ) -> None:
+        """Initialize with global cap, default per host cap, and caps for specific hosts."""
+        self.max_concurrent = max_concurrent
+        self.max_per_host = max_per_host
+        self.host_limits: dict[str, int] = dict(host_limits or {})
+        # Limiters are created lazily so schedulers can be made outside of trio.run
+        self._global: trio.CapacityLimiter | None = None
+        self.hosts: dict[str, trio.CapacityLimiter] = {}
+        self.rates: dict[str, ratelimit.AdaptiveRateLimiter] = {}
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}({self.max_concurrent!r}, {self.max_per_host!r}, {self.host_limits!r})"
+
+    def set_limits(
+        self,
+        max_concurrent: int | None = None,
+        max_per_host: int | None = None,
+        host: str | None = None,
+    ) -> None:
+        """Change limits. If host is given, max_per_host only applies to that host."""
+        if max_concurrent is not None:
+            self.max_concurrent = max_concurrent
+            if self._global is not None:
+                self._global.total_tokens = max_concurrent
+        if max_per_host is None:
+            return
+        if host is not None:
+            self.host_limits[host] = max_per_host
+            if host in self.hosts:
+                self.hosts[host].total_tokens = max_per_host
+            return
+        self.max_per_host = max_per_host
+        for name, limiter in self.hosts.items():
+            if name not in self.host_limits:
+                limiter.total_tokens = max_per_host
+
+    def global_limiter(self) -> trio.CapacityLimiter:
+        """Return limiter shared by all requests."""
+        if self._global is None:
+            self._global = trio.CapacityLimiter(self.max_concurrent)
+        return self._global
+
+    def host_limiter(self, host: str) -> trio.CapacityLimiter:
+        """Return limiter for requests to host."""
+        if host not in self.hosts:
+            self.hosts[host] = trio.CapacityLimiter(self.host_limits.get(host, self.max_per_host))
+        return self.hosts[host]
+
+    def rate_limiter(self, url: str) -> ratelimit.AdaptiveRateLimiter:
+        """Return adaptive rate limiter for the host of URL."""
+        host = get_host(url)
+        if host not in self.rates:
+            self.rates[host] = ratelimit.AdaptiveRateLimiter()
+        return self.rates[host]
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Wait until a request to URL may be made and hold the slot until exit."""
+        # Host first, so requests waiting on a busy host
+        # do not sit on global tokens other hosts could use.
+        async with self.host_limiter(get_host(url)), self.global_limiter():
+            yield
+
+    async def run(self, url: str, function: Callable[[], Awaitable[T]]) -> T:
+        """Return result of awaiting function once a slot for URL is free."""
+        async with self.slot(url):
+            return await function()
+
+    async def map(
+        self,
+        function: Callable[[T], Awaitable[R]],
+        items: Iterable[T],
+        workers: int | None = None,
+    ) -> list[R]:
+        """Return results of function for every item, in order.
+
+        Unlike starting one task per item, at most workers tasks (default
+        max_concurrent) ever exist, fed from a memory channel.
+        """
+        jobs = list(enumerate(items))
+        results: dict[int, R] = {}
+        worker_count = min(workers or self.max_concurrent, len(jobs))
+
+        send_channel, receive_channel = trio.open_memory_channel[tuple[int, T]](0)
+
+        async def worker(receive: trio.MemoryReceiveChannel[tuple[int, T]]) -> None:
+            async with receive:
+                async for index, item in receive:
+                    results[index] = await function(item)
+
+        async with trio.open_nursery() as nursery:
+            async with receive_channel:
+                for _ in range(worker_count):
+                    nursery.start_soon(worker, receive_channel.clone())
+            async with send_channel:
+                for job in jobs:
+                    await send_channel.send(job)
+        return [results[i] for i in range(len(jobs))]
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
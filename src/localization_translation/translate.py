@@ -23,27 +23,56 @@ __author__ = "CoolCat467"
 __license__ = "GNU General Public License Version 3"
 
 
+import atexit
 import json
 import random
-import urllib.request
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from typing import TYPE_CHECKING, Any, Final, TypeVar, assert_never
-from urllib.parse import urlencode
+from urllib.parse import quote_plus, urlencode
 
 import httpx
 import trio
 
-from localization_translation import agents
+from localization_translation import agents, ratelimit, scheduler, translation_memory
 
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Callable, Sequence
 
+    from localization_translation.backends import TranslationBackend
+
 TIMEOUT: Final[int] = 4
+GOOGLE_TRANSLATE_URL: Final = "https://translate.googleapis.com/translate_a/single"
 AGENT = random.randint(0, 100000)  # noqa: S311
+# Shared client of the synchronous API, see get_sync_client
+_SYNC_CLIENT: httpx.Client | None = None
+
+# Sentences are joined with this when translated together in one request.
+# Google leaves the section sign alone, but it likes to eat or add
+# whitespace around it, so split on BATCH_SPLIT instead of the literal
+# and put back the whitespace each sentence started and ended with.
+BATCH_SEPARATOR: Final = "\n\u00a7\u00a7\n"
+BATCH_SPLIT: Final = re.compile(r"\s*\u00a7\s*\u00a7\s*")
+# Budget for the URL encoded length of the query text of one request.
+# Google starts rejecting GET requests with URLs somewhere past 16 KB,
+# so stay well under that.
+MAX_QUERY_LENGTH: Final = 4000
+MAX_BATCH_SIZE: Final = 128
+
+# All translation requests wait for a slot from this scheduler
+SCHEDULER: Final = scheduler.RequestScheduler()
+# Attempts per request before giving up
+MAX_ATTEMPTS: Final = 8
 
 T = TypeVar("T")
 
 
+class RequestError(Exception):
+    """Raised when a request still fails after using up its retry budget."""
+
+
 async def gather(*tasks: Callable[[], Awaitable[T]]) -> list[T]:
     """Gather for trio."""
 
@@ -70,7 +99,12 @@ async def gather(*tasks: Callable[[], Awaitable[T]]) -> list[T]:
 ##    return 'http://clients5.google.com/translate_a/t?'+urlencode(query)
 
 
-def get_translation_url(sentence: str, to_language: str, source_language: str = "auto") -> str:
+def get_translation_url(
+    sentence: str,
+    to_language: str,
+    source_language: str = "auto",
+    base_url: str = GOOGLE_TRANSLATE_URL,
+) -> str:
     """Return the URL you should visit to get query translated to language to_language."""
     query = {
         "client": "gtx",
@@ -79,7 +113,52 @@ def get_translation_url(sentence: str, to_language: str, source_language: str =
         "tl": to_language,
         "q": sentence,
     }
-    return "https://translate.googleapis.com/translate_a/single?" + urlencode(query)
+    return f"{base_url}?{urlencode(query)}"
+
+
+def get_batch_translation_url(
+    sentences: Sequence[str],
+    to_language: str,
+    source_language: str = "auto",
+    base_url: str = GOOGLE_TRANSLATE_URL,
+) -> str:
+    """Return the URL to visit to get all sentences translated in one request."""
+    return get_translation_url(BATCH_SEPARATOR.join(sentences), to_language, source_language, base_url)
+
+
+def query_length(sentence: str) -> int:
+    """Return length of sentence once URL encoded as a query value."""
+    return len(quote_plus(sentence))
+
+
+def pack_batches(
+    sentences: Sequence[str],
+    max_length: int = MAX_QUERY_LENGTH,
+    max_size: int = MAX_BATCH_SIZE,
+) -> list[list[int]]:
+    """Return groups of indices into sentences to translate together.
+
+    Each group joined with BATCH_SEPARATOR stays within max_length once
+    URL encoded and holds at most max_size sentences. Sentences that are
+    too long on their own get a group to themselves.
+    """
+    separator_length = query_length(BATCH_SEPARATOR)
+    batches: list[list[int]] = []
+    current: list[int] = []
+    length = 0
+    for index, sentence in enumerate(sentences):
+        size = query_length(sentence)
+        if current and (length + separator_length + size > max_length or len(current) >= max_size):
+            batches.append(current)
+            current = []
+            length = 0
+        if current:
+            length += separator_length
+        current.append(index)
+        length += size
+    if current:
+        batches.append(current)
+    return batches
 
 
 def process_response(result: list[str] | list[list[Any]]) -> str:
@@ -96,24 +175,169 @@ def process_response(result: list[str] | list[list[Any]]) -> str:
     assert_never()
 
 
+def process_batch_response(result: list[Any]) -> str:
+    """Return full translated text from response, joining all segments.
+
+    Long queries are split up into sentences by Google, with each
+    translated sentence the first item of a segment list.
+    """
+    if not result or not isinstance(result[0], list):
+        raise ValueError(f"Unexpected response {result!r}, expected list of segments")
+    return "".join(segment[0] for segment in result[0] if isinstance(segment, list) and isinstance(segment[0], str))
+
+
+def restore_whitespace(original: str, translated: str) -> str:
+    """Return translated with the leading and trailing whitespace of original."""
+    stripped = original.strip()
+    if not stripped:
+        return original
+    start = original.index(stripped)
+    return original[:start] + translated.strip() + original[start + len(stripped) :]
+
+
+def split_batch(text: str, sentences: Sequence[str]) -> list[str] | None:
+    """Split translated batch text back into one translation per sentence.
+
+    Splitting eats whitespace around separators, so every translation
+    gets the leading and trailing whitespace of its sentence back.
+    Return None if the separator was mangled and the number of pieces
+    does not match.
+    """
+    parts = BATCH_SPLIT.split(text.strip())
+    if len(parts) != len(sentences):
+        return None
+    return [restore_whitespace(sentence, part) for sentence, part in zip(sentences, parts, strict=True)]
+
+
 def is_url(text: str) -> bool:
     """Return True if text is probably a URL."""
     return text.startswith("http") and "://" in text and "." in text and " " not in text
 
 
-def translate_sync(sentence: str | int, to_lang: str, source_lang: str = "auto") -> str | int:
-    """Return sentence translated from source_lang to to_lang."""
+def request_headers() -> dict[str, str]:
+    """Return headers for a translation request, using the next user agent."""
+    global AGENT  # pylint: disable=global-statement
+    AGENT = (AGENT + 1) % len(agents.USER_AGENTS)
+    return {
+        "User-Agent": agents.USER_AGENTS[AGENT],
+        "Accept": "*/*",
+        "Accept-Language": "en-US,en-GB; q=0.5",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    }
+
+
+def get_sync_client() -> httpx.Client:
+    """Return shared synchronous client, creating it on first use.
+
+    The client keeps connections alive and speaks HTTP/2, so repeated
+    calls do not pay for a new TCP and TLS handshake every time.
+    """
+    global _SYNC_CLIENT  # pylint: disable=global-statement
+    if _SYNC_CLIENT is None or _SYNC_CLIENT.is_closed:
+        _SYNC_CLIENT = httpx.Client(http2=True, timeout=TIMEOUT)
+    return _SYNC_CLIENT
+
+
+@atexit.register
+def close_sync_client() -> None:
+    """Close shared synchronous client, if there is one."""
+    if _SYNC_CLIENT is not None:
+        _SYNC_CLIENT.close()
+
+
+def get_response_json_sync(client: httpx.Client, url: str, attempts: int = MAX_ATTEMPTS) -> Any:
+    """Return decoded json response from URL, rotating user agents.
+
+    Like get_response_json, but blocking. Failed attempts are retried
+    after a jittered exponential backoff, at most attempts times in total.
+    Other error responses raise RequestError right away.
+    """
+    problem = "no attempts made"
+    for attempt in range(attempts):
+        retry_after: float | None = None
+        try:
+            response = client.get(url, headers=request_headers())
+        except (httpx.TimeoutException, httpx.NetworkError) as exc:
+            problem = repr(exc)
+        else:
+            if response.status_code == 429 or response.is_server_error:
+                problem = f"HTTP {response.status_code}"
+                retry_after = ratelimit.parse_retry_after(response.headers.get("Retry-After"))
+            elif response.is_error:
+                # Other errors such as 403 will not go away by asking again
+                raise RequestError(f"Giving up on {url!r}, HTTP {response.status_code} is not retried")
+            else:
+                try:
+                    return response.json()
+                except json.decoder.JSONDecodeError:
+                    problem = f"non-json response {response.text[:80]!r}"
+        if attempt + 1 < attempts:
+            time.sleep(max(retry_after or 0.0, ratelimit.backoff_delay(attempt)))
+    raise RequestError(f"Giving up on {url!r} after {attempts} attempts, last problem: {problem}")
+
+
+def translate_sync(
+    sentence: str | int,
+    to_lang: str,
+    source_lang: str = "auto",
+    client: httpx.Client | None = None,
+    base_url: str = GOOGLE_TRANSLATE_URL,
+) -> str | int:
+    """Return sentence translated from source_lang to to_lang.
+
+    Uses the shared client from get_sync_client unless client is given.
+    """
     if isinstance(sentence, int) or is_url(sentence):
         # skip numbers and URLs
         return sentence
 
     # Get URL from function, which uses urllib to generate proper query
-    url = get_translation_url(sentence, to_lang, source_lang)
+    url = get_translation_url(sentence, to_lang, source_lang, base_url)
     if not url.startswith("http"):
         raise ValueError("URL not http(s), is this intended?")
-    with urllib.request.urlopen(url, timeout=0.5) as file:  # noqa: S310
-        request_result = json.loads(file.read())
-    return process_response(request_result)
+    return process_response(get_response_json_sync(client or get_sync_client(), url))
+
+
+def translate_sync_batch(
+    sentences: Sequence[str | int],
+    to_lang: str,
+    source_lang: str = "auto",
+    client: httpx.Client | None = None,
+    base_url: str = GOOGLE_TRANSLATE_URL,
+    workers: int = scheduler.MAX_PER_HOST,
+) -> list[str | int]:
+    """Return sentences translated from source_lang to to_lang, blocking.
+
+    Like translate_async, sentences are packed into as few requests as
+    possible and numbers and URLs are passed through untouched. Up to
+    workers requests are sent at once from a thread pool sharing one
+    connection pool.
+    """
+    client = client or get_sync_client()
+    results = list(sentences)
+    indices = [idx for idx, sentence in enumerate(sentences) if not isinstance(sentence, int) and not is_url(sentence)]
+    queries = [str(sentences[idx]) for idx in indices]
+
+    def translate_batch(batch: list[int]) -> list[str]:
+        """Return translations of batch of query indices."""
+        batch_queries = [queries[i] for i in batch]
+        if len(batch_queries) == 1:
+            return [str(translate_sync(batch_queries[0], to_lang, source_lang, client, base_url))]
+        url = get_batch_translation_url(batch_queries, to_lang, source_lang, base_url)
+        text = process_batch_response(get_response_json_sync(client, url))
+        split = split_batch(text, batch_queries)
+        if split is not None:
+            return split
+        print(f"Batch separator mangled, translating {len(batch_queries)} sentences separately")
+        return [str(translate_sync(query, to_lang, source_lang, client, base_url)) for query in batch_queries]
+
+    batches = pack_batches(queries)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(batches)))) as executor:
+        for batch, translated in zip(batches, executor.map(translate_batch, batches), strict=True):
+            for i, text in zip(batch, translated, strict=True):
+                results[indices[i]] = text
+    return results
 
 
 async def get_translated_coroutine(
@@ -121,41 +345,104 @@ async def get_translated_coroutine(
     sentence: str | int,
     to_lang: str,
     source_lang: str = "auto",
+    memory: translation_memory.TranslationMemory | None = None,
+    base_url: str = GOOGLE_TRANSLATE_URL,
 ) -> str | int:
-    """Return the sentence translated, asynchronously."""
-    global AGENT  # pylint: disable=global-statement
+    """Return the sentence translated, asynchronously.
 
+    If memory is given, look there first and remember new translations.
+    """
     if isinstance(sentence, int) or is_url(sentence):
         # skip numbers and URLs
         return sentence
+    if memory is not None:
+        remembered = memory.get(sentence, source_lang, to_lang)
+        if remembered is not None:
+            return remembered
     # Make sure we have a timeout, so that in the event of network failures
     # or something code doesn't get stuck
     # Get URL from function, which uses urllib to generate proper query
-    url = get_translation_url(sentence, to_lang, source_lang)
-
-    headers = {
-        "User-Agent": "",
-        "Accept": "*/*",
-        "Accept-Language": "en-US,en-GB; q=0.5",
-        "Accept-Encoding": "gzip, deflate",
-        "Connection": "keep-alive",
-    }
-
-    while True:
-        AGENT = (AGENT + 1) % len(agents.USER_AGENTS)
-        headers["User-Agent"] = agents.USER_AGENTS[AGENT]
-
+    url = get_translation_url(sentence, to_lang, source_lang, base_url)
+
+    result = process_response(await get_response_json(client, url))
+    if memory is not None:
+        memory.set(sentence, result, source_lang, to_lang)
+    return result
+
+
+async def get_response_json(client: httpx.AsyncClient, url: str, attempts: int = MAX_ATTEMPTS) -> Any:
+    """Return decoded json response from URL, rotating user agents.
+
+    Requests are paced by the adaptive rate limiter for the host. Timeouts,
+    HTTP 429 and 5xx responses, and non-json pages (such as captcha pages)
+    slow the rate down and are retried after a jittered exponential
+    backoff, at most attempts times in total. Other error responses
+    raise RequestError right away.
+    """
+    limiter = SCHEDULER.rate_limiter(url)
+
+    problem = "no attempts made"
+    for attempt in range(attempts):
+        headers = request_headers()
+        await limiter.wait()
+        retry_after: float | None = None
         try:
             # Go to that URL and get our translated response
-            response = await client.get(url, headers=headers)
-            # Wait for our response and make it json so we can look at
-            # it like a dictionary
-            return process_response(response.json())
-        except httpx.ConnectTimeout:
-            pass
-        except json.decoder.JSONDecodeError:
-            print(f"{type(response) = }\n{response = }")
-            raise
+            async with SCHEDULER.slot(url):
+                start = trio.current_time()
+                response = await client.get(url, headers=headers)
+        except (httpx.TimeoutException, httpx.NetworkError) as exc:
+            problem = repr(exc)
+        else:
+            if response.status_code == 429 or response.is_server_error:
+                problem = f"HTTP {response.status_code}"
+                retry_after = ratelimit.parse_retry_after(response.headers.get("Retry-After"))
+            elif response.is_error:
+                # Other errors such as 403 will not go away by asking again
+                raise RequestError(f"Giving up on {url!r}, HTTP {response.status_code} is not retried")
+            else:
+                try:
+                    # Wait for our response and make it json so we can look at
+                    # it like a dictionary
+                    data = response.json()
+                except json.decoder.JSONDecodeError:
+                    problem = f"non-json response {response.text[:80]!r}"
+                else:
+                    limiter.succeeded(trio.current_time() - start)
+                    return data
+        limiter.throttled(retry_after)
+        if attempt + 1 < attempts:
+            await trio.sleep(max(retry_after or 0.0, ratelimit.backoff_delay(attempt)))
+    raise RequestError(f"Giving up on {url!r} after {attempts} attempts, last problem: {problem}")
+
+
+async def get_translated_batch_coroutine(
+    client: httpx.AsyncClient,
+    sentences: Sequence[str],
+    to_lang: str,
+    source_lang: str = "auto",
+    base_url: str = GOOGLE_TRANSLATE_URL,
+) -> list[str]:
+    """Return sentences translated in one request, asynchronously.
+
+    If the separators do not survive translation, fall back to
+    translating each sentence on its own.
+    """
+    if len(sentences) == 1:
+        return [str(await get_translated_coroutine(client, sentences[0], to_lang, source_lang, base_url=base_url))]
+    url = get_batch_translation_url(sentences, to_lang, source_lang, base_url)
+    text = process_batch_response(await get_response_json(client, url))
+    results = split_batch(text, sentences)
+    if results is not None:
+        return results
+    print(f"Batch separator mangled, translating {len(sentences)} sentences separately")
+    return [
+        str(result)
+        for result in await SCHEDULER.map(
+            partial(get_translated_coroutine, client, to_lang=to_lang, source_lang=source_lang, base_url=base_url),
+            sentences,
+        )
+    ]
 
 
 async def translate_async(
@@ -163,12 +450,161 @@ async def translate_async(
     sentences: Sequence[str | int],
     to_lang: str,
     source_lang: str,
+    memory: translation_memory.TranslationMemory | None = None,
+    backend: TranslationBackend | None = None,
+    on_batch: Callable[[dict[int, str]], object] | None = None,
 ) -> list[str | int]:
-    """Translate multiple sentences asynchronously."""
-    coros: list[Callable[[], Awaitable[str | int]]] = [
-        partial(get_translated_coroutine, client, q, to_lang, source_lang) for q in sentences
-    ]
-    return await gather(*coros)
+    """Translate multiple sentences asynchronously.
+
+    Sentences are packed into as few requests as fit in the URL length
+    budget. Numbers and URLs are passed through untouched. If memory is
+    given, only sentences it remembers from the same backend are not
+    requested. If backend is given, batches are sent to it instead of
+    Google Translate, sized by its capabilities. If on_batch is given, it is called with a
+    dictionary of sentence index to translation as each request finishes.
+    """
+    results = list(sentences)
+    indices = [idx for idx, sentence in enumerate(sentences) if not isinstance(sentence, int) and not is_url(sentence)]
+
+    backend_name = translation_memory.DEFAULT_BACKEND if backend is None else backend.name
+    if memory is not None:
+        remembered = memory.get_many((str(sentences[idx]) for idx in indices), source_lang, to_lang, backend_name)
+        missing = []
+        for idx in indices:
+            text = remembered.get(str(sentences[idx]))
+            if text is None:
+                missing.append(idx)
+            else:
+                results[idx] = text
+        indices = missing
+
+    queries = [str(sentences[idx]) for idx in indices]
+
+    translate_batch: Callable[[Sequence[str]], Awaitable[list[str]]]
+    if backend is None:
+        batches = pack_batches(queries)
+        translate_batch = partial(get_translated_batch_coroutine, client, to_lang=to_lang, source_lang=source_lang)
+    else:
+        capabilities = backend.capabilities
+        batches = pack_batches(queries, capabilities.max_chars, capabilities.max_batch_size)
+        translate_batch = partial(backend.translate_batch, to_lang=to_lang, source_lang=source_lang)
+
+    async def run_batch(batch: list[int]) -> None:
+        """Translate batch of query indices, saving results as soon as they arrive."""
+        translated = await translate_batch([queries[i] for i in batch])
+        for i, text in zip(batch, translated, strict=True):
+            results[indices[i]] = text
+        if memory is not None:
+            memory.set_many(
+                {queries[i]: text for i, text in zip(batch, translated, strict=True)},
+                source_lang,
+                to_lang,
+                backend_name,
+            )
+        if on_batch is not None:
+            on_batch({indices[i]: text for i, text in zip(batch, translated, strict=True)})
+
+    await SCHEDULER.map(run_batch, batches)
+    return results
+
+
+class Deduplicator:
+    """Translate each unique (text, source language, target language) only once per run.
+
+    Results are kept in memory and shared with every later request for
+    the same text. Requests for text that is already being translated
+    wait for that translation instead of asking again.
+    """
+
+    __slots__ = ("pending", "requested", "results", "reused")
+
+    def __init__(self) -> None:
+        """Initialize empty results."""
+        self.results: dict[tuple[str, str, str], str] = {}
+        self.pending: dict[tuple[str, str, str], trio.Event] = {}
+        self.requested = 0
+        self.reused = 0
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} {self.requested} requested, {self.reused} reused>"
+
+    @staticmethod
+    def _report(
+        on_batch: Callable[[dict[int, str]], object],
+        positions: list[list[int]],
+        translated: dict[int, str],
+    ) -> None:
+        """Call on_batch with claimed text translations spread to every position of that text."""
+        on_batch({idx: text for i, text in translated.items() for idx in positions[i]})
+
+    async def translate(
+        self,
+        client: httpx.AsyncClient,
+        sentences: Sequence[str | int],
+        to_lang: str,
+        source_lang: str,
+        memory: translation_memory.TranslationMemory | None = None,
+        backend: TranslationBackend | None = None,
+        on_batch: Callable[[dict[int, str]], object] | None = None,
+    ) -> list[str | int]:
+        """Translate multiple sentences like translate_async, reusing earlier results.
+
+        on_batch is also called with reused results.
+        """
+        results = list(sentences)
+        wanted: dict[str, list[int]] = {}
+        for idx, sentence in enumerate(sentences):
+            if isinstance(sentence, int) or is_url(sentence):
+                continue
+            wanted.setdefault(sentence, []).append(idx)
+
+        while wanted:
+            claimed: list[str] = []
+            waiting: list[trio.Event] = []
+            reused: dict[int, str] = {}
+            for text in tuple(wanted):
+                key = (text, source_lang, to_lang)
+                if key in self.results:
+                    self.reused += len(wanted[text])
+                    for idx in wanted.pop(text):
+                        results[idx] = reused[idx] = self.results[key]
+                elif key in self.pending:
+                    waiting.append(self.pending[key])
+                else:
+                    self.pending[key] = trio.Event()
+                    claimed.append(text)
+            if reused and on_batch is not None:
+                on_batch(reused)
+            if claimed:
+                self.requested += len(claimed)
+                claimed_batch = None
+                if on_batch is not None:
+                    claimed_batch = partial(self._report, on_batch, [wanted[text] for text in claimed])
+                try:
+                    translated = await translate_async(
+                        client,
+                        claimed,
+                        to_lang,
+                        source_lang,
+                        memory,
+                        backend,
+                        claimed_batch,
+                    )
+                    for text, new in zip(claimed, translated, strict=True):
+                        self.results[(text, source_lang, to_lang)] = str(new)
+                        # Only repeats of claimed text within sentences are reuses
+                        positions = wanted.pop(text)
+                        self.reused += len(positions) - 1
+                        for idx in positions:
+                            results[idx] = str(new)
+                finally:
+                    # If translation failed, waiters find no result and claim it themselves
+                    for text in claimed:
+                        self.pending.pop((text, source_lang, to_lang)).set()
+            for event in waiting:
+                await event.wait()
+        return results
 
 
 if __name__ == "__main__":
@@ -0,0 +1,221 @@
+"""Translation Memory - Remember translations between runs."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Translation Memory - Remember translations between runs
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Translation Memory"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+
+import sqlite3
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from types import TracebackType
+    from typing import Self
+
+MAX_ENTRIES: Final = 1_000_000
+# Backend of translations made through Google Translate directly
+DEFAULT_BACKEND: Final = "google"
+
+SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS translations (
+    backend TEXT NOT NULL,
+    source_lang TEXT NOT NULL,
+    to_lang TEXT NOT NULL,
+    text TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    used INTEGER NOT NULL,
+    PRIMARY KEY (backend, source_lang, to_lang, text)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS translations_used ON translations (used);
+"""
+# Databases from before backends were remembered only hold Google translations
+ADD_BACKEND: Final = f"""
+DROP INDEX IF EXISTS translations_used;
+ALTER TABLE translations RENAME TO translations_old;
+{SCHEMA}
+INSERT INTO translations
+    SELECT '{DEFAULT_BACKEND}', source_lang, to_lang, text, translation, used FROM translations_old;
+DROP TABLE translations_old;
+"""  # noqa: S608
+
+
+class TranslationMemory:
+    """Persistent store of translations keyed by (text, source language, target language, backend).
+
+    Entries are stored in an SQLite database. When there are more than
+    max_entries, the least recently used entries are evicted.
+    """
+
+    __slots__ = ("clock", "connection", "entries", "hits", "max_entries", "misses")
+
+    def __init__(self, path: str = ":memory:", max_entries: int = MAX_ENTRIES) -> None:
+        """Open or create translation memory database at path."""
+        self.connection = sqlite3.connect(path)
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(translations)")]
+        self.connection.executescript(ADD_BACKEND if columns and "backend" not in columns else SCHEMA)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Logical clock for least recently used eviction
+        (last_used,) = self.connection.execute("SELECT COALESCE(MAX(used), 0) FROM translations").fetchone()
+        self.clock: int = last_used
+        # Kept up to date from changed row counts, counting rows is a full table scan
+        (entries,) = self.connection.execute("SELECT COUNT(*) FROM translations").fetchone()
+        self.entries: int = entries
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} {len(self)} entries, {self.hits} hits, {self.misses} misses>"
+
+    def __len__(self) -> int:
+        """Return number of stored translations."""
+        return self.entries
+
+    def __enter__(self) -> Self:
+        """Return self for context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close database."""
+        self.close()
+
+    def close(self) -> None:
+        """Commit pending changes and close database."""
+        self.connection.commit()
+        self.connection.close()
+
+    def tick(self) -> int:
+        """Return next logical clock time."""
+        self.clock += 1
+        return self.clock
+
+    def get(self, text: str, source_lang: str, to_lang: str, backend: str = DEFAULT_BACKEND) -> str | None:
+        """Return remembered translation of text by backend or None if not stored."""
+        return self.get_many((text,), source_lang, to_lang, backend).get(text)
+
+    def get_many(
+        self,
+        texts: Iterable[str],
+        source_lang: str,
+        to_lang: str,
+        backend: str = DEFAULT_BACKEND,
+    ) -> dict[str, str]:
+        """Return dictionary of text to translation for all texts remembered from backend."""
+        found: dict[str, str] = {}
+        cursor = self.connection.cursor()
+        for text in dict.fromkeys(texts):
+            row = cursor.execute(
+                "SELECT translation FROM translations"
+                " WHERE backend = ? AND source_lang = ? AND to_lang = ? AND text = ?",
+                (backend, source_lang, to_lang, text),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                continue
+            self.hits += 1
+            found[text] = row[0]
+        if found:
+            used = self.tick()
+            cursor.executemany(
+                "UPDATE translations SET used = ? WHERE backend = ? AND source_lang = ? AND to_lang = ? AND text = ?",
+                [(used, backend, source_lang, to_lang, text) for text in found],
+            )
+        return found
+
+    def set(
+        self,
+        text: str,
+        translation: str,
+        source_lang: str,
+        to_lang: str,
+        backend: str = DEFAULT_BACKEND,
+    ) -> None:
+        """Remember translation of text by backend."""
+        self.set_many({text: translation}, source_lang, to_lang, backend)
+
+    def set_many(
+        self,
+        translations: dict[str, str],
+        source_lang: str,
+        to_lang: str,
+        backend: str = DEFAULT_BACKEND,
+    ) -> None:
+        """Remember translations by backend, a dictionary of text to translated text."""
+        if not translations:
+            return
+        used = self.tick()
+        # Update known texts first, so rows the insert adds are all new
+        self.connection.executemany(
+            "UPDATE translations SET translation = ?, used = ?"
+            " WHERE backend = ? AND source_lang = ? AND to_lang = ? AND text = ?",
+            [(translation, used, backend, source_lang, to_lang, text) for text, translation in translations.items()],
+        )
+        cursor = self.connection.executemany(
+            "INSERT OR IGNORE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+            [(backend, source_lang, to_lang, text, translation, used) for text, translation in translations.items()],
+        )
+        self.entries += cursor.rowcount
+        self.evict()
+        self.connection.commit()
+
+    def evict(self) -> int:
+        """Remove least recently used entries over max_entries. Return number removed."""
+        extra = self.entries - self.max_entries
+        if extra <= 0:
+            return 0
+        cursor = self.connection.execute(
+            "DELETE FROM translations WHERE (backend, source_lang, to_lang, text) IN "
+            "(SELECT backend, source_lang, to_lang, text FROM translations ORDER BY used LIMIT ?)",
+            (extra,),
+        )
+        self.entries -= cursor.rowcount
+        return cursor.rowcount
+
+    def invalidate(self, to_lang: str | None = None, source_lang: str | None = None) -> int:
+        """Forget translations to to_lang and or from source_lang, everything if neither given.
+
+        Return number of entries removed.
+        """
+        conditions: list[str] = []
+        arguments: list[str] = []
+        if to_lang is not None:
+            conditions.append("to_lang = ?")
+            arguments.append(to_lang)
+        if source_lang is not None:
+            conditions.append("source_lang = ?")
+            arguments.append(source_lang)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        cursor = self.connection.execute(f"DELETE FROM translations{where}", arguments)  # noqa: S608
+        self.connection.commit()
+        self.entries -= cursor.rowcount
+        return cursor.rowcount
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
@@ -0,0 +1,197 @@
+"""Value Store - Columns of flattened values sharing one string table."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Value Store - Columns of flattened values sharing one string table
+# Copyright (C) 2026  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Value Store"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+
+import operator
+from array import array
+from itertools import compress
+from typing import TYPE_CHECKING, Final
+
+from localization_translation import extricate
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+# Array type code of string indexes, 4 bytes each instead of a pointer
+INDEX_TYPE: Final = "I"
+# Indexes compared at once when looking for changes
+CHUNK_SIZE: Final = 64
+
+
+class StringTable:
+    """Every distinct string once, numbered in order of first add."""
+
+    __slots__ = ("indexes", "strings")
+
+    def __init__(self) -> None:
+        """Initialize empty StringTable."""
+        self.strings: list[str] = []
+        self.indexes: dict[str, int] = {}
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} {len(self.strings)} strings>"
+
+    def __len__(self) -> int:
+        """Return number of distinct strings."""
+        return len(self.strings)
+
+    def __getitem__(self, index: int) -> str:
+        """Return string with given index."""
+        return self.strings[index]
+
+    def add(self, text: str) -> int:
+        """Return index of text, adding it if it is new."""
+        index = self.indexes.get(text)
+        if index is None:
+            index = self.indexes[text] = len(self.strings)
+            self.strings.append(text)
+        return index
+
+    def add_many(self, texts: Iterable[str]) -> array[int]:
+        """Return array of index of every text, adding new ones."""
+        indexes = self.indexes
+        strings = self.strings
+        # New strings get the next index, and setdefault only stores
+        # it when text is missing
+        result = array(INDEX_TYPE)
+        for text in texts:
+            index = indexes.setdefault(text, len(strings))
+            if index == len(strings):
+                strings.append(text)
+            result.append(index)
+        return result
+
+    def get_many(self, indexes: Iterable[int]) -> list[str]:
+        """Return string of every index."""
+        return list(map(self.strings.__getitem__, indexes))
+
+
+class ValueStore:
+    """Flattened values of many files in many languages.
+
+    Every file has its keys once, and every language of a file is a
+    column of string table indexes, one per key. Strings repeated across
+    files and languages are only stored once, and comparing columns is
+    comparing integers.
+    """
+
+    __slots__ = ("columns", "keys", "table")
+
+    def __init__(self) -> None:
+        """Initialize empty ValueStore."""
+        self.table = StringTable()
+        self.keys: dict[str, list[extricate.FlatKey]] = {}
+        # Column of every (file, language)
+        self.columns: dict[tuple[str, str], array[int]] = {}
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return (
+            f"<{self.__class__.__name__} {len(self.keys)} files, "
+            f"{len(self.columns)} columns, {len(self.table)} strings>"
+        )
+
+    def add_file(self, name: str, keys: Sequence[extricate.FlatKey]) -> None:
+        """Add file name with given keys.
+
+        If file name is already there with other keys, columns of the
+        old file are removed, as their values no longer line up.
+        """
+        keys = list(keys)
+        if self.keys.get(name, keys) != keys:
+            for file, language in tuple(self.columns):
+                if file == name:
+                    del self.columns[file, language]
+        self.keys[name] = keys
+
+    def add_data(self, name: str, language: str, data: object) -> None:
+        """Add file name from data, with its values in language."""
+        keys, values = extricate.flatten_paths(data)
+        self.add_file(name, keys)
+        self.set_values(name, language, values)
+
+    def languages(self, name: str) -> list[str]:
+        """Return languages file name has values in."""
+        return [language for file, language in self.columns if file == name]
+
+    def set_values(self, name: str, language: str, values: Sequence[str]) -> list[int]:
+        """Set values of file name in language. Return indexes of keys whose value changed.
+
+        Every key is changed if language had no values before.
+        """
+        count = len(self.keys[name])
+        if len(values) != count:
+            raise ValueError(f"Expected {count} values, got {len(values)}")
+        column = self.table.add_many(values)
+        old = self.columns.get((name, language))
+        self.columns[name, language] = column
+        if old is None:
+            return list(range(count))
+        return changed_indexes(old, column)
+
+    def get_values(self, name: str, language: str) -> list[str]:
+        """Return values of file name in language."""
+        return self.table.get_many(self.columns[name, language])
+
+    def get_data(self, name: str, language: str) -> object:
+        """Return data of file name in language."""
+        return extricate.unflatten_paths(self.keys[name], self.get_values(name, language))
+
+    def changed(self, name: str, language: str, other: str) -> list[int]:
+        """Return indexes of keys of file name whose value differs between language and other.
+
+        For example, keys of a translation still the same as English
+        were probably never translated.
+        """
+        return changed_indexes(self.columns[name, language], self.columns[name, other])
+
+    def changed_keys(self, name: str, language: str, other: str) -> list[extricate.FlatKey]:
+        """Return keys of file name whose value differs between language and other."""
+        keys = self.keys[name]
+        return [keys[index] for index in self.changed(name, language, other)]
+
+
+def changed_indexes(old: array[int], new: array[int]) -> list[int]:
+    """Return indexes where columns old and new differ.
+
+    Columns are compared a chunk at a time, and only chunks that differ
+    are compared index by index.
+    """
+    if old == new:
+        return []
+    changed: list[int] = []
+    for start in range(0, len(new), CHUNK_SIZE):
+        end = start + CHUNK_SIZE
+        old_chunk = old[start:end]
+        new_chunk = new[start:end]
+        if old_chunk != new_chunk:
+            changed.extend(compress(range(start, end), map(operator.ne, old_chunk, new_chunk)))
+    return changed
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
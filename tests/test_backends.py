@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from urllib.parse import urlsplit
+
+import httpx
+import pytest
+import trio
+
+from localization_translation import backends, translate
+from localization_translation.mock_server import MockTranslateServer
+
+
+def test_health_tracker() -> None:
+    tracker = backends.HealthTracker()
+    assert tracker.report() == backends.BackendHealth(True, 0, 0, 0.0, None)
+    tracker.succeeded(0.5)
+    tracker.succeeded(1.5)
+    for _ in range(backends.UNHEALTHY_FAILURES):
+        tracker.failed("boom")
+    report = tracker.report()
+    assert not report.healthy
+    assert report.average_latency == 1.0
+    assert report.last_error == "boom"
+    tracker.succeeded(1.0)
+    assert tracker.report().healthy
+
+
+def test_mock_server_respond() -> None:
+    server = MockTranslateServer(fail_every=3)
+    url = urlsplit(translate.get_translation_url("Hello\nWorld", "es", "en", server.url))
+    target = f"{url.path}?{url.query}"
+    status, body = server.respond(target)
+    assert status == 200
+    assert translate.process_batch_response(httpx.Response(200, content=body).json()) == "hELLO\nwORLD"
+    assert server.respond("/elsewhere")[0] == 404
+    assert server.respond(target)[0] == 429
+
+
+@pytest.mark.trio
+async def test_mock_server_backend() -> None:
+    server = MockTranslateServer()
+    async with trio.open_nursery() as nursery:
+        await nursery.start(server.serve)
+        async with httpx.AsyncClient() as client:
+            backend = backends.MockServerBackend(client, server)
+            assert backend.capabilities.max_batch_size == translate.MAX_BATCH_SIZE
+            sentences: list[str | int] = ["Hello", "World", 7, "OK"]
+            results = await translate.translate_async(client, sentences, "es", "en", backend=backend)
+        nursery.cancel_scope.cancel()
+    assert results == ["hELLO", "wORLD", 7, "ok"]
+    assert server.requests == 1
+    health = backend.health()
+    assert health.healthy
+    assert health.requests == 1
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+import pytest
+
+from localization_translation import cli
+
+
+def test_positive_int() -> None:
+    assert cli.positive_int("3") == 3
+
+
+@pytest.mark.parametrize("value", ["0", "-2", "many"])
+def test_positive_int_rejects(value: str) -> None:
+    with pytest.raises(argparse.ArgumentTypeError):
+        cli.positive_int(value)
+
+
+@pytest.mark.parametrize("option", ["--max-requests", "--max-per-host"])
+def test_limits_must_be_positive(
+    option: str,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.setattr(sys, "argv", ["mineos_translate", "--unhandled", option, "0"])
+    with pytest.raises(SystemExit) as exc_info:
+        cli.main()
+    assert exc_info.value.code == 2
+    assert "must be at least 1" in capsys.readouterr().err
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import pytest
+
+from localization_translation import convert
+
+LINES = ["{", "\tfirst = 1,", "\tnested = {", "\t\tsecond = 2,", "\t},", "}"]
+
+
+def insert_each(lines: list[str], start: int, comments: dict[int, str]) -> list[str]:
+    result = list(lines)
+    for offset, comment in comments.items():
+        pos = start + offset
+        indent = "" if pos >= len(result) else result[pos].count("\t") * "\t"
+        result.insert(pos, f"{indent}-- {comment}" if comment else indent)
+    return result
+
+
+@pytest.mark.parametrize(
+    "comments",
+    [
+        {},
+        {0: "top", 2: "", 3: "inner"},
+        {1: "a", 2: "b", 3: "c"},
+        {4: "late", 9: "past end", 12: "further"},
+        # Not ascending, inserted one by one
+        {3: "c", 1: "a"},
+        {-1: "negative", 2: "b"},
+    ],
+)
+def test_insert_comments_matches_insert(comments: dict[int, str]) -> None:
+    for start in (0, 2):
+        lines = list(LINES)
+        convert.insert_comments(lines, start, comments)
+        assert lines == insert_each(LINES, start, comments)
+
+
+def test_dict_to_lang_keeps_comments() -> None:
+    text = '{\n\t-- Greeting\n\tgreeting = "Hello",\n\n\tmenu = {\n\t\t-- Open\n\t\topen = "Open",\n\t},\n}'
+    data, comments = convert.lang_to_json(text)
+    result = convert.dict_to_lang(data, comments)
+    assert "\t-- Greeting\n\tgreeting" in result
+    assert "\t\t-- Open\n\t\topen" in result
+    assert convert.lang_to_json(result) == (data, comments)
+
+
+FILES_CFG = """{
+\t-- Files to install
+\tfiles = {
+\t\t-- Core
+\t\t"OS.lua",
+\t\t"Libraries/A.lua",
+\t\t-- Apps
+\t\t"Applications/B.app",
+\t\t"Applications/C.app"
+\t},
+\t-- Localizations
+\tlocalizations = {
+\t\tenglish = "English.lang",
+\t\t-- Russian
+\t\trussian = "Russian.lang"
+\t}
+}"""
+
+
+def test_diff_runs_is_longest_common_subsequence() -> None:
+    old = list("abcabba")
+    new = list("cbabac")
+    runs = convert.diff_runs(old, new)
+    pairs = [(x + index, y + index) for x, y, length in runs for index in range(length)]
+    assert all(old[x] == new[y] for x, y in pairs)
+    assert pairs == sorted(pairs)
+    assert len({x for x, _ in pairs}) == len({y for _, y in pairs}) == len(pairs) == 4
+    assert convert.diff_runs(old, old) == [(0, 0, len(old))]
+    assert convert.diff_runs([], new) == []
+
+
+def test_update_comment_positions_moves_comments() -> None:
+    old, comments = convert.lang_to_json(FILES_CFG)
+    expected_text = (
+        FILES_CFG.replace('"OS.lua",\n', '"OS.lua",\n\t\t"Libraries/Z.lua",\n')
+        .replace('"English.lang",\n', '"English.lang",\n\t\tfrench = "French.lang",\n')
+        .replace('\t\t"Applications/C.app"\n', '\t\t"Applications/C.app",\n\t\t"Applications/D.app"\n')
+    )
+    new, expected = convert.lang_to_json(expected_text)
+    result = convert.update_comment_positions(comments, new, old)
+    assert result == expected
+    assert convert.dict_to_lang(new, result) == expected_text
+
+
+def test_update_comment_positions_removed_line() -> None:
+    old, comments = convert.lang_to_json(FILES_CFG)
+    new = {
+        "files": ["OS.lua", "Applications/B.app", "Applications/C.app"],
+        "localizations": {"english": "English.lang"},
+    }
+    result = convert.update_comment_positions(comments, new, old)
+    # Comment before removed line goes before the line after it
+    lines = convert.dict_to_lang(new, result).splitlines()
+    assert [line.strip() for line in lines[10:14]] == [
+        "localizations = {",
+        'english = "English.lang"',
+        "-- Russian",
+        "}",
+    ]
+    assert sum(map(len, result.values())) == sum(map(len, comments.values()))
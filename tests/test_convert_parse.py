@@ -1,8 +1,23 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import pytest
 
-from localization_translation.convert_parse import CommentData, TokenType, dict_to_lang, lang_to_dict
+from localization_translation.convert_parse import (
+    CommentData,
+    TokenType,
+    dict_to_lang,
+    document_to_lang,
+    lang_to_dict,
+    lang_to_document,
+    read_lang_file,
+)
 from localization_translation.lua_parser import ParseError
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
 # A very simple empty table
 SIMPLE_EMPTY = "{}"
 
@@ -311,3 +326,55 @@ def test_invalid_input_raises_value_error() -> None:
     bad = "{ a = 1, b = 2 "
     with pytest.raises(ParseError, match="Expected ',', ';', or '}', got '' \\(1:14\\)"):
         lang_to_dict(bad)
+
+
+@pytest.mark.parametrize(
+    "src",
+    [SIMPLE_EMPTY, SIMPLE_FLAT, NESTED_DICT, PURE_LIST, MIXED_KEYS, VK_LOCALIZATION],
+)
+def test_document_roundtrip_is_exact(src: str) -> None:
+    data, document = lang_to_document(src)
+    assert data == lang_to_dict(src)[0]
+    assert document_to_lang(data, document) == src
+
+
+def test_document_splices_changed_values() -> None:
+    src = """{
+\t-- Comment stays
+\tname = 'Alice', -- so does this
+\tcount = 0x10,
+\tlist = {"a", "b",},
+\tplain = "same",
+}"""
+    data, document = lang_to_document(src)
+    data["plain"] = 'Changed "quoted"'
+    data["list"][2] = "B"
+    data["count"] = 16
+    data["added"] = {1: "x"}
+    del data["name"]
+    assert (
+        document_to_lang(data, document)
+        == """{
+\t-- Comment stays
+\tname = 'Alice', -- so does this
+\tcount = 0x10,
+\tlist = {"a", "B",},
+\tplain = "Changed \\"quoted\\"",
+\tadded = {
+\t\t[1] = "x",
+\t},
+}"""
+    )
+    # Document is not changed, so it can be written again with other data
+    assert document_to_lang(lang_to_dict(src)[0], document) == src
+
+
+def test_read_lang_file(tmp_path: Path) -> None:
+    path = tmp_path / "English.lang"
+    path.write_text(VK_LOCALIZATION, encoding="utf-8")
+    assert read_lang_file(str(path)) == lang_to_dict(VK_LOCALIZATION)[0]
+    path.write_text('{ "ünïcödé", [[long\nstring]] }', encoding="utf-8")
+    assert read_lang_file(str(path), convert_lists=True) == ["ünïcödé", "long\nstring"]
+    path.write_text("", encoding="utf-8")
+    with pytest.raises(ParseError):
+        read_lang_file(str(path))
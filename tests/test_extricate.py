@@ -150,3 +150,129 @@ def test_take_apart_and_recombine(test_v: object) -> None:
     assert len(keys) == len(values)
     result = extricate.list_to_dict(keys, values)
     assert test_v == result
+
+
+@pytest.mark.parametrize(
+    "test_v",
+    [
+        {"cat": {3: "5", 7: [4, 3, 3], 4: ["cat", {"meep": "e", "": [235, "woe", [], None, {}]}]}},
+        [[[["cat", 0], 4], "8"], ["3", "nine", ["14"]]],
+        {"on": True, "off": False, "ratio": 1.5},
+        "cat",
+        {},
+    ],
+)
+def test_flatten_paths_matches_strings(test_v: object) -> None:
+    keys, values = extricate.flatten_paths(test_v)
+    assert ([extricate.key_to_string(key) for key in keys], values) == extricate.dict_to_list(test_v)
+    string_keys = extricate.dict_to_list(test_v)[0]
+    assert [extricate.string_to_key(key) for key in string_keys] == keys
+    assert extricate.unflatten_paths(keys, values) == test_v
+
+
+def test_flat_key_layout() -> None:
+    keys, values = extricate.flatten_paths({"menu": ["Open", {}]})
+    dict_char, list_char = extricate.TYPE_CHAR["dict"], extricate.TYPE_CHAR["list"]
+    assert keys == [
+        extricate.FlatKey(dict_char + list_char + extricate.TYPE_CHAR["str"], ("menu", 0)),
+        extricate.FlatKey(dict_char + list_char + dict_char, ("menu", 1)),
+    ]
+    assert values == ["Open", ""]
+    with pytest.raises(ValueError, match="CHAR_TYPE"):
+        extricate.key_to_string(extricate.FlatKey(dict_char + dict_char, (f"a{extricate.SEP}",)))
+
+
+def test_flatten_plan_rebuild() -> None:
+    data = {"menu": {"open": "Open", "recent": ["One", "Two"], "empty": {}}, "count": 3, "on": False}
+    plan = extricate.FlattenPlan(data)
+    assert plan.values == ["Open", "One", "Two", "", "3", "False"]
+    assert plan.string_keys() == extricate.dict_to_list(data)[0]
+    rebuilt = plan.rebuild(["Ouvrir", "Un", "Deux", "", "3", "False"])
+    assert rebuilt == {"menu": {"open": "Ouvrir", "recent": ["Un", "Deux"], "empty": {}}, "count": 3, "on": False}
+    assert list(rebuilt) == list(data)
+    # Rebuilt data shares nothing with earlier results
+    assert plan.rebuild(plan.values) == data
+    assert rebuilt["menu"]["open"] == "Ouvrir"
+    with pytest.raises(ValueError, match="Expected 6 values"):
+        plan.rebuild(["Open"])
+
+
+def nest(depth: int) -> object:
+    data: object = "bottom"
+    for level in range(depth):
+        data = {f"level{level}": data, "count": level} if level % 2 else [data, "side"]
+    return data
+
+
+def check_nest(data: object, depth: int) -> None:
+    # Walk down without recursion, comparing deep data with == would recurse
+    for level in reversed(range(depth)):
+        if level % 2:
+            assert isinstance(data, dict)
+            assert data["count"] == level
+            data = data[f"level{level}"]
+        else:
+            assert isinstance(data, list)
+            assert data[1] == "side"
+            data = data[0]
+    assert data == "bottom"
+
+
+def test_deep_nesting() -> None:
+    # Far past the recursion limit
+    depth = 5000
+    keys, values = extricate.flatten_paths(nest(depth))
+    assert len(keys) == depth + 1
+    check_nest(extricate.unflatten_paths(keys, values), depth)
+    # String keys grow with depth squared, so keep those shallower
+    depth = 1500
+    keys_text, values = extricate.dict_to_list(nest(depth))
+    check_nest(extricate.list_to_dict(keys_text, values), depth)
+
+
+def test_iter_flatten_is_lazy() -> None:
+    items = extricate.iter_flatten({"first": "One", "bad": object()})
+    assert next(items) == (
+        extricate.FlatKey(extricate.TYPE_CHAR["dict"] + extricate.TYPE_CHAR["str"], ("first",)),
+        "One",
+    )
+    with pytest.raises(TypeError, match="object"):
+        next(items)
+
+
+def test_dict_builder_streaming() -> None:
+    data = {"a": {"b": ["x", "y"], "c": 3}, "d": [], "e": True}
+    keys, values = extricate.dict_to_list(data)
+    flat_keys, _ = extricate.flatten_paths(data)
+    builder = extricate.DictBuilder()
+    # String and FlatKey keys can be mixed
+    for index, (key, value) in enumerate(zip(keys, values, strict=True)):
+        builder.add(flat_keys[index] if index % 2 else key, value)
+        assert builder.count == index + 1
+    assert builder.data == data
+    assert extricate.DictBuilder().data is None
+    assert repr(builder) == f"<DictBuilder {len(values)} items>"
+
+
+def test_dict_builder_bad_key() -> None:
+    builder = extricate.DictBuilder()
+    with pytest.raises(ValueError, match="unrecognized"):
+        builder.add(extricate.FlatKey("\x05z", ("a",)), "value")
+
+
+def test_flat_data_fast_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    data = {"title": "Settings", "count": 3, "ratio": 1.5, "shown": False, "none": None}
+    keys, values = extricate.dict_to_list(data)
+    assert keys == list(extricate.iter_key_strings(extricate.flatten_paths(data)[0]))
+
+    def not_called() -> None:
+        raise AssertionError("flat data should not take the general path")
+
+    # Flat lang files are by far the most common, keep them off the general path
+    with monkeypatch.context() as patch:
+        patch.setattr(extricate, "flatten_paths", not_called)
+        patch.setattr(extricate, "DictBuilder", not_called)
+        assert extricate.dict_to_list(data) == (keys, values)
+        assert extricate.list_to_dict(keys, values) == data
+    with pytest.raises(ValueError, match="zip"):
+        extricate.list_to_dict(keys, values[:-1])
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+
+from localization_translation import extricate, journal, mineos_auto_trans
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import trio.testing
+
+
+def test_restore_after_reopen(tmp_path: Path) -> None:
+    path = str(tmp_path / "journal.jsonl")
+    keys = ["a", "b", "c"]
+    sentences = ["one", "two", "three"]
+    log = journal.Journal(path)
+    log.progress("Folder", "german").record(keys, sentences, {0: "eins", 2: "drei"})
+    # Run crashed, so the journal was never compacted
+    log.close()
+    reopened = journal.Journal(path)
+    progress = reopened.progress("Folder", "german")
+    assert progress.restore(keys, sentences) == {0: "eins", 2: "drei"}
+    # Source text changed since it was recorded
+    assert progress.restore(keys, ["one", "two", "THREE"]) == {0: "eins"}
+    assert reopened.progress("Folder", "french").restore(keys, sentences) == {}
+    reopened.close()
+
+
+def test_torn_line_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "journal.jsonl"
+    log = journal.Journal(str(path))
+    log.record("Folder", "german", {"a": ("one", "eins")})
+    log.close()
+    with path.open("a", encoding="utf-8") as file:
+        file.write('{"file": "Folder", "lang": "ger')
+    log = journal.Journal(str(path))
+    assert log.values == {("Folder", "german"): {"a": ("one", "eins")}}
+    log.close()
+
+
+def test_compact_keeps_only_unfinished(tmp_path: Path) -> None:
+    path = tmp_path / "journal.jsonl"
+    with journal.Journal(str(path)) as log:
+        log.record("Folder", "german", {"a": ("one", "eins")})
+        log.record("Folder", "french", {"a": ("one", "un")})
+        log.finish("Folder", "german")
+    assert path.read_text(encoding="utf-8").count("\n") == 1
+    with journal.Journal(str(path)) as log:
+        assert set(log.values) == {("Folder", "french")}
+        log.finish("Folder", "french")
+    assert not path.exists()
+
+
+@pytest.mark.trio
+async def test_translate_file_resumes(tmp_path: Path, autojump_clock: trio.testing.MockClock) -> None:
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = request.url.params["q"]
+        requested.extend(line.strip() for line in query.split("§§"))
+        segments = [[line.upper(), line, None, None, 10] for line in query.splitlines(True)]
+        return httpx.Response(200, json=[segments, None, "en"])
+
+    data = {"greeting": "hello", "farewell": "goodbye", "count": 3}
+    keys = extricate.dict_to_list(data)[0]
+    path = str(tmp_path / "journal.jsonl")
+    with journal.Journal(path) as log:
+        log.progress("Folder", "german").record(keys, ["hello"], {0: "HALLO"})
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            result = await mineos_auto_trans.translate_file(
+                data,
+                client,
+                "de",
+                "en",
+                progress=log.progress("Folder", "german"),
+            )
+        assert result == {"greeting": "HALLO", "farewell": "GOODBYE", "count": 3}
+        assert "hello" not in requested
+        assert log.values[("Folder", "german")][keys[1]] == ("goodbye", "GOODBYE")
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from localization_translation import lua_document, lua_parser
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SOURCE = """{
+\t-- Greetings
+\thello = "Hello", -- shown on start
+\tbye = 'Bye',
+\tnested = {
+\t\ta = 1,
+\t\t"x"
+\t},
+\tempty = {},
+\tinline = {1, 2},
+\t["odd key"] = [[long]]
+}
+"""
+
+
+def test_unchanged_document_is_identical() -> None:
+    document = lua_document.LuaDocument(SOURCE)
+    assert document.text() == SOURCE
+    assert document.get(["nested"]) == {"a": 1, 1: "x"}
+    assert document.get(["odd key"]) == "long"
+
+
+def test_replace_keeps_everything_else() -> None:
+    document = lua_document.LuaDocument(SOURCE)
+    document.set(["hello"], 'Hi "there"')
+    document.set(["nested", 1], "y")
+    assert document.text() == SOURCE.replace('"Hello"', '"Hi \\"there\\""').replace('"x"', '"y"')
+    assert document.get(["hello"]) == 'Hi "there"'
+    assert document.get(["nested"]) == {"a": 1, 1: "y"}
+
+
+def test_add_fields() -> None:
+    document = lua_document.LuaDocument(SOURCE)
+    document.update({"new": "N", "table": {"x": [1, 2]}})
+    document.set(["nested", "b"], True)
+    document.set(["empty", "k"], "v")
+    document.set(["inline", 3], 3)
+    document.set(["table", "y"], None)
+    assert (
+        document.text()
+        == """{
+\t-- Greetings
+\thello = "Hello", -- shown on start
+\tbye = 'Bye',
+\tnested = {
+\t\ta = 1,
+\t\t"x",
+\t\tb = true
+\t},
+\tempty = {
+\t\tk = "v",
+\t},
+\tinline = {1, 2, [3] = 3},
+\t["odd key"] = [[long]],
+\tnew = "N",
+\ttable = {
+\t\tx = {
+\t\t\t1,
+\t\t\t2,
+\t\t},
+\t\ty = nil,
+\t}
+}
+"""
+    )
+    assert document.get(["table", "x", 2]) == 2
+    assert lua_document.parse_value(document.text()) == document.get()
+
+
+def test_edit_inside_replaced_table() -> None:
+    document = lua_document.LuaDocument(SOURCE)
+    document.set(["nested", "a"], 5)
+    document.replace_text(["nested"], "{z = 1}")
+    document.set(["nested", "w"], 2)
+    assert document.get(["nested"]) == {"z": 1, "w": 2}
+    assert "a = 5" not in document.text()
+    assert lua_document.parse_value(document.text())["nested"] == {"z": 1, "w": 2}  # type: ignore[index]
+
+
+def test_errors() -> None:
+    document = lua_document.LuaDocument(SOURCE)
+    with pytest.raises(lua_parser.ParseError):
+        document.replace_text(["hello"], "{")
+    with pytest.raises(KeyError):
+        document.set(["missing", "key"], 1)
+    with pytest.raises(KeyError):
+        document.set(["hello", "key"], 1)
+    with pytest.raises(lua_parser.ParseError):
+        lua_document.LuaDocument("{a = 1 b = 2}")
+
+
+def test_update_lang_file(tmp_path: Path) -> None:
+    path = tmp_path / "English.lang"
+    path.write_text(SOURCE, encoding="utf-8")
+    lua_document.update_lang_file(str(path), {"bye": "Goodbye"})
+    assert path.read_text(encoding="utf-8") == SOURCE.replace("'Bye'", '"Goodbye"')
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import pytest
+import trio
+
+from localization_translation import (
+    convert,
+    convert_parse,
+    extricate,
+    journal,
+    lua_document,
+    mineos_auto_trans,
+    translate,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+FOLDER = "Applications/Test.app/Localizations"
+
+
+def write_cached(cache: str, path: str, data: dict[str, Any]) -> None:
+    """Write lang file data to cache folder as if it was downloaded."""
+    filename = os.path.join(cache, *path.split("/"))
+    mineos_auto_trans.ensure_folder_exists(filename)
+    convert.write_lang_file(filename, data, {})
+
+
+@pytest.mark.trio
+async def test_failed_language_does_not_stop_run(tmp_path: Path) -> None:
+    cache = str(tmp_path / "cache")
+    upload = str(tmp_path / "upload")
+    write_cached(cache, "Installer/Files.cfg", {"Applications": [f"{FOLDER}/English.lang"]})
+    write_cached(cache, f"{FOLDER}/English.lang", {"ok": "OK"})
+
+    async def trans_coro(
+        english: dict[str, Any],
+        to_lang: str,
+        folder: str,
+        plan: extricate.FlattenPlan,
+    ) -> dict[str, Any]:
+        if to_lang == "spanish":
+            raise translate.RequestError("gave up")
+        return {"ok": to_lang}
+
+    def get_unhandled(handled: set[str], folder: str) -> set[str]:
+        return {"spanish", "french"}
+
+    with journal.Journal(str(tmp_path / "journal.jsonl")) as checkpoint:
+        async with httpx.AsyncClient() as client:
+            await mineos_auto_trans.abstract_translate(client, upload, cache, get_unhandled, trans_coro, checkpoint)
+        assert checkpoint.done == {(FOLDER, "french")}
+
+    localizations = os.path.join(upload, *FOLDER.split("/"))
+    assert os.listdir(localizations) == ["French.lang"]
+    files, _ = convert.read_lang_file(os.path.join(upload, "Installer", "Files.cfg"))
+    assert sorted(files["Applications"]) == [f"{FOLDER}/English.lang", f"{FOLDER}/French.lang"]
+
+
+@pytest.mark.trio
+async def test_languages_of_folder_share_plan(tmp_path: Path) -> None:
+    cache = str(tmp_path / "cache")
+    upload = str(tmp_path / "upload")
+    write_cached(cache, "Installer/Files.cfg", {"Applications": [f"{FOLDER}/English.lang"]})
+    write_cached(cache, f"{FOLDER}/English.lang", {"ok": "OK"})
+    plans: list[extricate.FlattenPlan] = []
+
+    async def trans_coro(
+        english: dict[str, Any],
+        to_lang: str,
+        folder: str,
+        plan: extricate.FlattenPlan,
+    ) -> dict[str, Any]:
+        plans.append(plan)
+        return dict(plan.rebuild([to_lang]))
+
+    def get_unhandled(handled: set[str], folder: str) -> set[str]:
+        return {"spanish", "french"}
+
+    async with httpx.AsyncClient() as client:
+        await mineos_auto_trans.abstract_translate(client, upload, cache, get_unhandled, trans_coro)
+
+    assert len(plans) == 2
+    assert plans[0] is plans[1]
+    assert plans[0].values == ["OK"]
+    localizations = os.path.join(upload, *FOLDER.split("/"))
+    assert convert_parse.read_lang_file(os.path.join(localizations, "French.lang")) == {"ok": "french"}
+
+
+@pytest.mark.trio
+async def test_done_language_is_skipped(tmp_path: Path) -> None:
+    cache = str(tmp_path / "cache")
+    upload = str(tmp_path / "upload")
+    write_cached(cache, "Installer/Files.cfg", {"Applications": [f"{FOLDER}/English.lang"]})
+    write_cached(cache, f"{FOLDER}/English.lang", {"ok": "OK"})
+    translated: list[str] = []
+
+    async def trans_coro(
+        english: dict[str, Any],
+        to_lang: str,
+        folder: str,
+        plan: extricate.FlattenPlan,
+    ) -> dict[str, Any]:
+        translated.append(to_lang)
+        return {"ok": to_lang}
+
+    def get_unhandled(handled: set[str], folder: str) -> set[str]:
+        return {"spanish", "french"}
+
+    with journal.Journal(str(tmp_path / "journal.jsonl")) as checkpoint:
+        # Interrupted run that got as far as saving Spanish
+        checkpoint.finish(FOLDER, "spanish")
+        async with httpx.AsyncClient() as client:
+            await mineos_auto_trans.abstract_translate(client, upload, cache, get_unhandled, trans_coro, checkpoint)
+
+    assert translated == ["french"]
+
+
+async def nursery_error(*errors: Exception) -> BaseException:
+    """Return what a nursery raises when its tasks raise errors."""
+
+    async def fail(error: Exception) -> None:
+        raise error
+
+    try:
+        async with trio.open_nursery() as nursery:
+            for error in errors:
+                nursery.start_soon(fail, error)
+    except Exception as exc:
+        return exc
+    raise AssertionError("nursery did not raise")
+
+
+@pytest.mark.trio
+async def test_request_errors() -> None:
+    error = translate.RequestError("gave up")
+    assert mineos_auto_trans.request_errors(error) == [error]
+    assert mineos_auto_trans.request_errors(await nursery_error(error)) == [error]
+    assert mineos_auto_trans.request_errors(await nursery_error(error, ValueError())) is None
+    assert mineos_auto_trans.request_errors(ValueError()) is None
+
+
+@pytest.mark.trio
+async def test_forbidden_response_does_not_stop_run(tmp_path: Path) -> None:
+    cache = str(tmp_path / "cache")
+    upload = str(tmp_path / "upload")
+    write_cached(cache, "Installer/Files.cfg", {"Applications": [f"{FOLDER}/English.lang"]})
+    write_cached(cache, f"{FOLDER}/English.lang", {"ok": "OK"})
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params["tl"] == "es":
+            return httpx.Response(403)
+        return httpx.Response(200, json=[[["Bien", "OK", None]], None, "en"])
+
+    async def trans_coro(
+        english: dict[str, Any],
+        to_lang: str,
+        folder: str,
+        plan: extricate.FlattenPlan,
+    ) -> dict[str, Any]:
+        code = "es" if to_lang == "spanish" else "fr"
+        return await mineos_auto_trans.translate_file(english, client, code, "en", plan=plan)
+
+    def get_unhandled(handled: set[str], folder: str) -> set[str]:
+        return {"spanish", "french"}
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        await mineos_auto_trans.abstract_translate(client, upload, cache, get_unhandled, trans_coro)
+
+    localizations = os.path.join(upload, *FOLDER.split("/"))
+    assert os.listdir(localizations) == ["French.lang"]
+    assert convert_parse.read_lang_file(os.path.join(localizations, "French.lang")) == {"ok": "Bien"}
+
+
+@pytest.mark.trio
+async def test_document_edits_keep_language_file(tmp_path: Path) -> None:
+    cache = str(tmp_path / "cache")
+    upload = str(tmp_path / "upload")
+    write_cached(cache, "Installer/Files.cfg", {"Applications": [f"{FOLDER}/English.lang", f"{FOLDER}/Spanish.lang"]})
+    write_cached(cache, f"{FOLDER}/English.lang", {"ok": "OK", "new": "New"})
+    spanish = '{\n\t-- Kept as it is\n\tok = "Vale" ,\n}\n'
+    (tmp_path / "cache" / FOLDER / "Spanish.lang").write_text(spanish, encoding="utf-8")
+
+    async def trans_coro(
+        english: dict[str, Any],
+        to_lang: str,
+        folder: str,
+        plan: extricate.FlattenPlan,
+    ) -> lua_document.LuaDocument:
+        text = await mineos_auto_trans.download_file(f"{folder}/Spanish.lang", cache, client)
+        document = lua_document.LuaDocument(text)
+        document.set(("new",), "Nuevo")
+        return document
+
+    def get_unhandled(handled: set[str], folder: str) -> set[str]:
+        return {"spanish"}
+
+    async with httpx.AsyncClient() as client:
+        await mineos_auto_trans.abstract_translate(client, upload, cache, get_unhandled, trans_coro)
+
+    written = (tmp_path / "upload" / FOLDER / "Spanish.lang").read_text(encoding="utf-8")
+    assert written.startswith('{\n\t-- Kept as it is\n\tok = "Vale" ,')
+    assert lua_document.LuaDocument(written).get() == {"ok": "Vale", "new": "Nuevo"}
+
+
+@pytest.mark.trio
+async def test_cache_file_reads_values_from_cache(tmp_path: Path) -> None:
+    cache = str(tmp_path / "cache")
+    write_cached(cache, f"{FOLDER}/Spanish.lang", {"ok": "Vale"})
+    async with httpx.AsyncClient() as client:
+        filename = await mineos_auto_trans.cache_file(f"{FOLDER}/Spanish.lang", cache, client)
+    assert filename == os.path.join(cache, *FOLDER.split("/"), "Spanish.lang")
+    assert convert_parse.read_lang_file(filename) == {"ok": "Vale"}
+
+
+@pytest.mark.trio
+async def test_broken_values_translated_in_one_request(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    cache = str(tmp_path / "mineos_cache")
+    write_cached(cache, "Installer/Files.cfg", {"Applications": [f"{FOLDER}/English.lang", f"{FOLDER}/Spanish.lang"]})
+    write_cached(cache, f"{FOLDER}/English.lang", {"apple": "Apple", "banana": "Banana", "cat": "Cat"})
+    write_cached(cache, f"{FOLDER}/Spanish.lang", {"apple": "Apple", "banana": "Banana", "cat": "Gato"})
+    queries: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = request.url.params["q"]
+        queries.append(query)
+        segments = [[line.replace("p", "q").replace("n", "m"), line, None, None, 10] for line in query.splitlines(True)]
+        return httpx.Response(200, json=[segments, None, "en"])
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        await mineos_auto_trans.translate_broken_values(client)
+
+    assert len(queries) == 1
+    written = tmp_path / "mineos_upload" / FOLDER / "Spanish.lang"
+    assert convert_parse.read_lang_file(str(written)) == {"apple": "Aqqle", "banana": "Bamama", "cat": "Gato"}
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+import trio
+
+from localization_translation import convert, parse_cache
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+TEXT = '{\n\tgreeting = "Hello",\n\tcount = 3,\n}'
+
+
+@pytest.mark.trio
+async def test_second_parse_is_hit(tmp_path: Path) -> None:
+    cache = parse_cache.ParseCache(str(tmp_path))
+    first = await cache.parse(convert.lang_to_json, TEXT)
+    second = await cache.parse(convert.lang_to_json, TEXT)
+    assert first == second == convert.lang_to_json(TEXT)
+    # Every hit is a fresh copy, so changing one result does not change the next
+    assert first is not second
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Entries outlive the cache object
+    reopened = parse_cache.ParseCache(str(tmp_path))
+    assert await reopened.parse(convert.lang_to_json, TEXT) == first
+    assert reopened.hits == 1
+
+
+@pytest.mark.trio
+async def test_changed_text_or_version_is_miss(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = parse_cache.ParseCache(str(tmp_path))
+    await cache.parse(convert.lang_to_json, TEXT)
+    await cache.parse(convert.lang_to_json, TEXT.replace("Hello", "Hi"))
+    monkeypatch.setattr(parse_cache, "PARSER_VERSION", parse_cache.PARSER_VERSION + 1)
+    await cache.parse(convert.lang_to_json, TEXT)
+    assert (cache.hits, cache.misses) == (0, 3)
+
+
+@pytest.mark.trio
+async def test_corrupt_entry_is_miss(tmp_path: Path) -> None:
+    cache = parse_cache.ParseCache(str(tmp_path))
+    key = cache.key(convert.lang_to_json, TEXT)
+    await cache.parse(convert.lang_to_json, TEXT)
+    await trio.Path(cache.path(key)).write_bytes(b"\x80\x05not a pickle")
+    assert await cache.parse(convert.lang_to_json, TEXT) == convert.lang_to_json(TEXT)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert cache.load(key)[0]
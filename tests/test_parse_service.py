@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from localization_translation import convert, parse_service
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+def generate_lang(keys: int, name: str = "key") -> str:
+    lines = ["{", *(f'\t{name}{index} = "Value number {index}",' for index in range(keys)), "}"]
+    return "\n".join(lines)
+
+
+@pytest.fixture
+def executor() -> Iterator[None]:
+    yield
+    parse_service.shutdown()
+
+
+@pytest.mark.trio
+async def test_parse_in_worker(executor: None) -> None:
+    text = generate_lang(500)
+    assert len(text) >= parse_service.INLINE_SIZE
+    assert await parse_service.parse(convert.lang_to_json, text) == convert.lang_to_json(text)
+    assert parse_service._EXECUTOR is not None
+
+
+@pytest.mark.trio
+async def test_short_text_parsed_inline(executor: None) -> None:
+    text = generate_lang(3)
+    assert await parse_service.parse(convert.lang_to_json, text) == convert.lang_to_json(text)
+    assert parse_service._EXECUTOR is None
+
+
+@pytest.mark.trio
+async def test_parse_many_keeps_order(executor: None) -> None:
+    texts = [generate_lang(300 if index % 2 else 2, f"file{index}_") for index in range(6)]
+    results = await parse_service.parse_many(convert.lang_to_json, texts)
+    assert results == [convert.lang_to_json(text) for text in texts]
@@ -41,7 +41,7 @@ def test_tokenization() -> None:
     parser = lua_parser.Parser(tokens)
     assert str(parser.parse_identifier()) == ("Assignment[Identifier['a'], String['also\\n123\"']]")
     assert str(parser.parse_identifier()) == ("Assignment[Identifier['a'], String['also\\n123\"']]")
-    assert str(parser.parse_identifier()) == ("Assignment[Identifier['a'], String['97lo1004923\"']]")
+    assert str(parser.parse_identifier()) == ("Assignment[Identifier['a'], String['alo\\n123\"']]")
     assert str(parser.parse_identifier()) == ("Assignment[Identifier['c'], Float[3.141592653589793]]")
     assert str(parser.parse_identifier()) == ("Assignment[Identifier['j'], Float[3.1416]]")
     assert str(parser.parse_identifier()) == ("Assignment[Identifier['e'], Integer[12499674]]")
@@ -71,6 +71,7 @@ def test_weather_table() -> None:
 }"""
     value = lua_parser.Parser(tuple(lua_parser.tokenize(table_source))).parse_table()
     parsed = lua_parser.parse_lua_table(value)[0]
+    assert lua_parser.read_lua_table(tuple(lua_parser.tokenize(table_source))) == lua_parser.parse_lua_table(value)
     assert parsed == {
         "winds": {
             0: "N",
@@ -277,6 +278,7 @@ def test_vk_table() -> None:
     value = lua_parser.Parser(tuple(lua_parser.tokenize(table_source))).parse_table()
     # types:                  ^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
     parsed = lua_parser.parse_lua_table(value)[0]
+    assert lua_parser.read_lua_table(tuple(lua_parser.tokenize(table_source))) == lua_parser.parse_lua_table(value)
     assert parsed == {
         "leftBarOffset": 5,
         "settingsStyle": "Color scheme",
@@ -447,3 +449,185 @@ def test_vk_table() -> None:
         "settings": "Settings",
         "exit": "Logout",
     }
+
+
+def test_tokenize_cst_positions() -> None:
+    text = '{\n\tname = "a \\"b\\"", -- note\n\t[2] = 0x1F, n=-3.5e2;\r\n}'
+    tokens = [(type(token), *token) for token in lua_parser.tokenize_cst(text)]
+    assert tokens == [
+        (lua_parser.Separator, "{", 1, 0),
+        (lua_parser.Newline, "\n", 2, -1),
+        (lua_parser.Whitespace, "\t", 2, 0),
+        (lua_parser.Identifier, "name", 2, 4),
+        (lua_parser.Whitespace, " ", 2, 5),
+        (lua_parser.Assignment, "=", 2, 6),
+        (lua_parser.Whitespace, " ", 2, 7),
+        (lua_parser.StrLit, '"a \\"b\\""', 2, 16),
+        (lua_parser.Separator, ",", 2, 17),
+        (lua_parser.Whitespace, " ", 2, 18),
+        (lua_parser.Comment, "-- note", 2, 25),
+        (lua_parser.Newline, "\n", 3, -1),
+        (lua_parser.Whitespace, "\t", 3, 0),
+        (lua_parser.Separator, "[", 3, 1),
+        (lua_parser.Numeric, "2", 3, 2),
+        (lua_parser.Separator, "]", 3, 3),
+        (lua_parser.Whitespace, " ", 3, 4),
+        (lua_parser.Assignment, "=", 3, 5),
+        (lua_parser.Whitespace, " ", 3, 6),
+        (lua_parser.Numeric, "0x1F", 3, 10),
+        (lua_parser.Separator, ",", 3, 11),
+        (lua_parser.Whitespace, " ", 3, 12),
+        (lua_parser.Identifier, "n", 3, 13),
+        (lua_parser.Assignment, "=", 3, 14),
+        (lua_parser.Numeric, "-3.5e2", 3, 20),
+        (lua_parser.Separator, ";", 3, 21),
+        (lua_parser.Whitespace, "\r", 3, 22),
+        (lua_parser.Newline, "\n", 4, -1),
+        (lua_parser.Separator, "}", 4, 0),
+        (lua_parser.End, "", 4, 0),
+    ]
+
+
+def test_tokenize_cst_errors() -> None:
+    with pytest.raises(lua_parser.ParseError, match="comment"):
+        list(lua_parser.tokenize_cst("a = 1 -- no newline"))
+    with pytest.raises(lua_parser.ParseError, match="Could not parse '@x'"):
+        list(lua_parser.tokenize_cst("a = @x"))
+
+
+def test_token_stream_matches_tokenize() -> None:
+    text = '{\n\tname = "value", -- note\n\t[2] = 0x1F, list = { 1, 2 };\r\n}'
+    stream = lua_parser.TokenStream(text)
+    expected = list(lua_parser.tokenize_cst(text))
+    assert [(type(token), *token) for token in stream] == [(type(token), *token) for token in expected]
+    assert stream[-1] == lua_parser.End("", 4, 0)
+    assert stream[1:3] == expected[1:3]
+    assert stream.kind(3) is lua_parser.Identifier
+    assert stream.text(3) == "name"
+
+    view = stream.without_cst()
+    assert [(type(token), *token) for token in view] == [(type(token), *token) for token in lua_parser.tokenize(text)]
+    expected_table = lua_parser.Parser(list(lua_parser.tokenize(text))).parse_table()
+    assert str(lua_parser.Parser(view).parse_table()) == str(expected_table)
+
+
+@pytest.mark.parametrize("convert_lists", [True, False])
+def test_read_lua_table_matches_parse_lua_table(convert_lists: bool) -> None:
+    source = '{ a = { 1, 2, { x = "y" } }, [3] = "three"; "four", b = true, c = nil, d = name, e = {} }'
+    tokens = list(lua_parser.tokenize(source))
+    expected = lua_parser.parse_lua_table(lua_parser.Parser(tokens).parse_value(), convert_lists)
+    assert lua_parser.read_lua_table(tokens, convert_lists) == expected
+
+
+def test_read_lua_table_deep_nesting() -> None:
+    depth = 5000
+    stream = lua_parser.TokenStream("{" * depth + '"core"' + "}" * depth)
+    value, _ = lua_parser.read_lua_table(stream.without_cst())
+    for _ in range(depth):
+        assert isinstance(value, list)
+        (value,) = value
+    assert value == "core"
+
+
+@pytest.mark.parametrize(
+    "source",
+    ["{ a = 1", "{ a = 1 b = 2 }", "{ f(1) }", "{ [{}] = 1 }", "{ a 1 }"],
+)
+def test_read_lua_table_errors(source: str) -> None:
+    with pytest.raises(lua_parser.ParseError):
+        lua_parser.read_lua_table(list(lua_parser.tokenize(source)))
+
+
+@pytest.mark.parametrize(
+    ("literal", "expect"),
+    [
+        ('"plain"', "plain"),
+        ("'it\\'s'", "it's"),
+        ('"\\a\\b\\f\\n\\r\\t\\v\\\\\\"\\\'"', "\a\b\f\n\r\t\v\\\"'"),
+        ('"\\97lo\\10\\04923"', "alo\n123"),
+        ('"\\x41\\x62"', "Ab"),
+        ('"\\u{48}\\u{1F600}"', "H\U0001f600"),
+        ('"\\208\\159\\209\\128"', "Пр"),
+        ('"line\\\nnext"', "line\nnext"),
+        ('"skip \\z  \n   spaces"', "skip spaces"),
+        ("[[long]]", "long"),
+        ("[==[\n]] still ]=] long]==]", "]] still ]=] long"),
+    ],
+)
+def test_string_value(literal: str, expect: str) -> None:
+    assert lua_parser.string_value(literal) == expect
+
+
+@pytest.mark.parametrize(
+    ("literal", "problem"),
+    [
+        ('"a\\256b"', "Decimal escape .* too large"),
+        ('"\\999"', "too large"),
+        ('"\\u{D800}"', "out of range"),
+        ('"\\u{dfff}"', "out of range"),
+        ('"\\u{110000}"', "out of range"),
+    ],
+)
+def test_string_value_bad_escape(literal: str, problem: str) -> None:
+    with pytest.raises(lua_parser.ParseError, match=problem):
+        lua_parser.string_value(literal)
+
+
+def test_string_value_largest_escapes_encode() -> None:
+    value = lua_parser.string_value('"\\255\\u{D7FF}\\u{E000}\\u{10FFFF}"')
+    assert lua_parser.string_value(lua_parser.encode_string(value)) == value
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["plain", 'quote " and \\ slash', "new\nline\ttab\x00\x7f", "ünïcödé 日本", "bad \udcff byte"],
+)
+def test_encode_string_round_trip(value: str) -> None:
+    literal = lua_parser.encode_string(value)
+    (token, _end) = lua_parser.tokenize(literal)
+    assert isinstance(token, lua_parser.StrLit)
+    assert lua_parser.string_value(token.text) == value
+
+
+def test_tokenize_long_string() -> None:
+    tokens = list(lua_parser.tokenize_cst("{ [==[\nfirst\nsecond]==], x }"))
+    assert tokens[2] == lua_parser.StrLit("[==[\nfirst\nsecond]==]", 1, 22)
+    assert isinstance(tokens[2], lua_parser.StrLit)
+    # Lines inside long strings are counted
+    assert tokens[5] == lua_parser.Identifier("x", 3, 12)
+    with pytest.raises(lua_parser.ParseError, match="Unfinished long string"):
+        list(lua_parser.tokenize_cst("[[never closed"))
+
+
+def test_scan_cst_bytes_matches_scan_cst() -> None:
+    text = '{\n\tname = "a \\"b\\"", -- note\n\t[2] = 0x1F, [[x\ny]], n=-3.5e2;\r\n}'
+    assert list(lua_parser.scan_cst_bytes(text.encode())) == list(lua_parser.scan_cst(text))
+    # Offsets count bytes
+    tokens = list(lua_parser.tokenize_bytes('{"é", x}'.encode()))
+    assert tokens[1] == lua_parser.StrLit('"é"', 1, 4)
+    assert tokens[3] == lua_parser.Identifier("x", 1, 7)
+    with pytest.raises(lua_parser.ParseError, match="comment"):
+        list(lua_parser.scan_cst_bytes(b"a = 1 -- no newline"))
+    with pytest.raises(lua_parser.ParseError, match="Could not parse '@x'"):
+        list(lua_parser.scan_cst_bytes(b"a = @x"))
+
+
+def test_token_window() -> None:
+    tokens = lua_parser.TokenWindow(lua_parser.tokenize("{ a = 1, 'two' }"), keep=3)
+    assert len(tokens) == 1
+    assert tokens[2] == lua_parser.Assignment("=", 1, 4)
+    assert len(tokens) == 4
+    assert tokens[0] == lua_parser.Separator("{", 1, 0)
+    assert tokens[6].text == "}"
+    with pytest.raises(IndexError, match="no longer kept"):
+        tokens[3]
+    assert tokens[7] == lua_parser.End("", 1, 15)
+    with pytest.raises(IndexError):
+        tokens[8]
+    assert len(tokens) == 8
+    value, from_tokens = lua_parser.read_lua_table(
+        lua_parser.TokenWindow(lua_parser.tokenize("{ a = 1, 'two' }")),
+        keep_tokens=False,
+    )
+    assert value == {"a": 1, 1: "two"}
+    assert from_tokens == []
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+import trio
+import trio.testing
+
+from localization_translation import pipeline
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.mark.trio
+async def test_pipeline_runs_every_item_through_stages(autojump_clock: trio.testing.MockClock) -> None:
+    written: list[str] = []
+
+    async def split_words(text: str) -> list[str]:
+        return text.split()
+
+    async def upper(word: str) -> tuple[str]:
+        await trio.sleep(1)
+        return (word.upper(),)
+
+    async def write(word: str) -> tuple[()]:
+        written.append(word)
+        return ()
+
+    stages = pipeline.Pipeline(
+        (
+            pipeline.Stage("split", split_words),
+            pipeline.Stage("upper", upper, workers=4),
+            pipeline.Stage("write", write),
+        ),
+    )
+    await stages.run(["a b", "", "c d e"])
+    assert sorted(written) == ["A", "B", "C", "D", "E"]
+    assert stages.processed == {"split": 3, "upper": 5, "write": 5}
+
+
+@pytest.mark.trio
+async def test_pipeline_overlaps_stages(autojump_clock: trio.testing.MockClock) -> None:
+    events: list[tuple[str, int]] = []
+
+    async def fetch(item: int) -> tuple[int]:
+        events.append(("fetch", item))
+        return (item,)
+
+    async def slow(item: int) -> tuple[int]:
+        await trio.sleep(10)
+        events.append(("slow", item))
+        return (item,)
+
+    start = trio.current_time()
+    await pipeline.Pipeline((pipeline.Stage("fetch", fetch), pipeline.Stage("slow", slow))).run(range(3))
+    # Second item is fetched while the first one is still being handled
+    assert events.index(("fetch", 1)) < events.index(("slow", 0))
+    assert trio.current_time() - start == pytest.approx(30)
+
+
+@pytest.mark.trio
+async def test_pipeline_reads_items_lazily(autojump_clock: trio.testing.MockClock) -> None:
+    produced = 0
+    high_water = 0
+    finished = 0
+
+    def items() -> Iterator[int]:
+        nonlocal produced, high_water
+        for item in range(100):
+            produced += 1
+            high_water = max(high_water, produced - finished)
+            yield item
+
+    async def slow(item: int) -> tuple[()]:
+        nonlocal finished
+        await trio.sleep(1)
+        finished += 1
+        return ()
+
+    await pipeline.Pipeline((pipeline.Stage("slow", slow, workers=2),), buffer_size=3).run(items())
+    assert produced == 100
+    # Only the buffer and items being worked on are ever held at once
+    assert high_water <= 2 + 3 + 1
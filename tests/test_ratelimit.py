@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import random
+
+import httpx
+import pytest
+import trio
+import trio.testing
+
+from localization_translation import ratelimit, translate
+
+
+def test_backoff_delay_bounds() -> None:
+    rng = random.Random(0)  # noqa: S311
+    for attempt in range(12):
+        delay = ratelimit.backoff_delay(attempt, base=0.5, cap=10, rng=rng)
+        assert 0 <= delay <= min(10, 0.5 * 2**attempt)
+
+
+def test_parse_retry_after() -> None:
+    assert ratelimit.parse_retry_after(None) is None
+    assert ratelimit.parse_retry_after("3") == 3.0
+    assert ratelimit.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+
+
+def test_aimd() -> None:
+    limiter = ratelimit.AdaptiveRateLimiter(rate=4, min_rate=1, max_rate=5, increase=1, decrease=0.5)
+    limiter.succeeded(0.1)
+    assert limiter.rate == 5
+    limiter.succeeded(0.1)
+    assert limiter.rate == 5
+    limiter.succeeded(limiter.latency_target + 1)
+    assert limiter.rate == pytest.approx(4.5)
+    limiter.throttled()
+    assert limiter.rate == pytest.approx(2.25)
+    limiter.throttled()
+    limiter.throttled()
+    assert limiter.rate == 1
+
+
+@pytest.mark.trio
+async def test_wait_paces_requests(autojump_clock: trio.testing.MockClock) -> None:
+    limiter = ratelimit.AdaptiveRateLimiter(rate=2)
+    start = trio.current_time()
+    for _ in range(5):
+        await limiter.wait()
+    assert trio.current_time() - start == pytest.approx(2)
+
+
+@pytest.mark.trio
+async def test_throttled_retry_after(autojump_clock: trio.testing.MockClock) -> None:
+    limiter = ratelimit.AdaptiveRateLimiter(rate=100)
+    await limiter.wait()
+    start = trio.current_time()
+    limiter.throttled(30)
+    await limiter.wait()
+    assert trio.current_time() - start == pytest.approx(30)
+
+
+@pytest.mark.trio
+async def test_get_response_json_retries(autojump_clock: trio.testing.MockClock) -> None:
+    responses = iter(
+        [
+            httpx.Response(429, headers={"Retry-After": "5"}),
+            httpx.Response(503),
+            httpx.Response(200, text="<html>unusual traffic</html>"),
+            httpx.Response(200, json=[[["hola", "hello", None]]]),
+        ],
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return next(responses)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        start = trio.current_time()
+        result = await translate.get_response_json(client, "https://retry.example/translate")
+    assert result == [[["hola", "hello", None]]]
+    assert trio.current_time() - start >= 5
+
+
+@pytest.mark.trio
+async def test_get_response_json_budget(autojump_clock: trio.testing.MockClock) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectTimeout("timed out", request=request)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(translate.RequestError, match="after 3 attempts"):
+            await translate.get_response_json(client, "https://down.example/translate", attempts=3)
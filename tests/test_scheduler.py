@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pytest
+import trio
+import trio.testing
+
+from localization_translation import scheduler
+
+
+def test_get_host() -> None:
+    assert scheduler.get_host("https://translate.googleapis.com/translate_a/single?q=a") == "translate.googleapis.com"
+    assert scheduler.get_host("example.com") == "example.com"
+
+
+@pytest.mark.trio
+async def test_global_and_host_limits(autojump_clock: trio.testing.MockClock) -> None:
+    sched = scheduler.RequestScheduler(max_concurrent=3, max_per_host=2, host_limits={"c.example": 1})
+    active: dict[str, int] = {}
+    most: dict[str, int] = {}
+    total_most = 0
+
+    async def request(url: str) -> str:
+        nonlocal total_most
+        host = scheduler.get_host(url)
+        async with sched.slot(url):
+            active[host] = active.get(host, 0) + 1
+            most[host] = max(most.get(host, 0), active[host])
+            total_most = max(total_most, sum(active.values()))
+            await trio.sleep(1)
+            active[host] -= 1
+        return host
+
+    urls = [f"https://{host}.example/{i}" for host in "abc" for i in range(4)]
+    results = await sched.map(request, urls, workers=len(urls))
+    assert results == [scheduler.get_host(url) for url in urls]
+    assert most["a.example"] <= 2
+    assert most["b.example"] <= 2
+    assert most["c.example"] == 1
+    assert total_most == 3
+
+
+@pytest.mark.trio
+async def test_map_bounded_workers() -> None:
+    sched = scheduler.RequestScheduler(max_concurrent=2)
+    running = 0
+    most = 0
+
+    async def double(value: int) -> int:
+        nonlocal running, most
+        running += 1
+        most = max(most, running)
+        await trio.lowlevel.checkpoint()
+        running -= 1
+        return value * 2
+
+    assert await sched.map(double, range(10)) == [i * 2 for i in range(10)]
+    assert most == 2
+    assert await sched.map(double, []) == []
+
+
+@pytest.mark.trio
+async def test_set_limits() -> None:
+    sched = scheduler.RequestScheduler(max_concurrent=4, max_per_host=4)
+    assert sched.host_limiter("a").total_tokens == 4
+    sched.set_limits(max_concurrent=1, max_per_host=2)
+    assert sched.global_limiter().total_tokens == 1
+    assert sched.host_limiter("a").total_tokens == 2
+    sched.set_limits(max_per_host=5, host="b")
+    assert sched.host_limiter("b").total_tokens == 5
+    assert sched.host_limiter("a").total_tokens == 2
+
+
+@pytest.mark.trio
+async def test_run() -> None:
+    sched = scheduler.RequestScheduler()
+
+    async def answer() -> int:
+        return 42
+
+    assert await sched.run("https://example.com", answer) == 42
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import atexit
+import time
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+import trio
+import trio.testing
+
+from localization_translation import translate
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def fake_google(transform: Callable[[str], str]) -> httpx.MockTransport:
+    """Return transport answering like the gtx endpoint, one segment per line."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = request.url.params["q"]
+        segments = [[transform(line), line, None, None, 10] for line in query.splitlines(True)]
+        return httpx.Response(200, json=[segments, None, request.url.params["sl"]])
+
+    return httpx.MockTransport(handler)
+
+
+def test_pack_batches_respects_budget() -> None:
+    sentences = ["a" * 10] * 10
+    separator = translate.query_length(translate.BATCH_SEPARATOR)
+    batches = translate.pack_batches(sentences, max_length=30 + separator * 2)
+    assert batches == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+
+
+def test_pack_batches_max_size() -> None:
+    assert translate.pack_batches(["x"] * 5, max_size=2) == [[0, 1], [2, 3], [4]]
+
+
+def test_pack_batches_oversized_sentence_alone() -> None:
+    assert translate.pack_batches(["a", "b" * 50, "c"], max_length=20) == [[0], [1], [2]]
+
+
+def test_pack_batches_empty() -> None:
+    assert translate.pack_batches([]) == []
+
+
+def test_process_batch_response() -> None:
+    result = [[["Hola. ", "Hello. ", None], ["Mundo", "World", None]], None, "en"]
+    assert translate.process_batch_response(result) == "Hola. Mundo"
+
+
+def test_split_batch() -> None:
+    text = translate.BATCH_SEPARATOR.join(["one", "two", "three"])
+    assert translate.split_batch(text, ["one", "two", "three"]) == ["one", "two", "three"]
+    assert translate.split_batch("one § §two§§ three", ["one", "two", "three"]) == ["one", "two", "three"]
+
+
+def test_split_batch_mangled() -> None:
+    assert translate.split_batch("one § two", ["one", "two"]) is None
+
+
+def test_split_batch_keeps_whitespace() -> None:
+    sentences = ["  Hello", "World ", "\tCat\n"]
+    text = "Hola§§\nMundo\n§§  Gato"
+    assert translate.split_batch(text, sentences) == ["  Hola", "Mundo ", "\tGato\n"]
+
+
+@pytest.mark.trio
+async def test_translate_async_keeps_leading_whitespace(autojump_clock: trio.testing.MockClock) -> None:
+    async with httpx.AsyncClient(transport=fake_google(str.upper)) as client:
+        results = await translate.translate_async(client, ["  Hello", "world"], "es", "en")
+    assert results == ["  HELLO", "WORLD"]
+
+
+@pytest.mark.trio
+async def test_translate_async_batches_requests(autojump_clock: trio.testing.MockClock) -> None:
+    requests: list[str] = []
+
+    def transform(text: str) -> str:
+        requests.append(text)
+        return text.upper()
+
+    sentences: list[str | int] = ["hello", 5, "world", "https://example.com/a.lua", "cat"]
+    async with httpx.AsyncClient(transport=fake_google(transform)) as client:
+        results = await translate.translate_async(client, sentences, "es", "en")
+    assert results == ["HELLO", 5, "WORLD", "https://example.com/a.lua", "CAT"]
+    # Three sentences on separate lines, answered by one request
+    assert "".join(requests).count("§§") == 2
+
+
+@pytest.mark.trio
+async def test_batch_falls_back_when_separator_mangled(autojump_clock: trio.testing.MockClock) -> None:
+    async with httpx.AsyncClient(transport=fake_google(lambda text: text.replace("§", "").upper())) as client:
+        results = await translate.get_translated_batch_coroutine(client, ["a", "b"], "es", "en")
+    assert results == ["A", "B"]
+
+
+@pytest.mark.trio
+async def test_deduplicator_translates_each_text_once(autojump_clock: trio.testing.MockClock) -> None:
+    requested: list[str] = []
+
+    def transform(text: str) -> str:
+        if text.strip("\n§"):
+            requested.append(text.strip())
+        return text.upper()
+
+    dedup = translate.Deduplicator()
+    async with httpx.AsyncClient(transport=fake_google(transform)) as client:
+        async with trio.open_nursery() as nursery:
+            for sentences in (["OK", "Cancel", "OK"], ["Cancel", "Settings"]):
+                nursery.start_soon(dedup.translate, client, sentences, "es", "en")
+        results = await dedup.translate(client, ["Settings", 3, "OK"], "es", "en")
+        other = await dedup.translate(client, ["OK"], "fr", "en")
+    assert results == ["SETTINGS", 3, "OK"]
+    assert other == ["OK"]
+    assert sorted(requested) == ["Cancel", "OK", "OK", "Settings"]
+    assert dedup.requested == 4
+    assert dedup.reused == 4
+
+
+@pytest.mark.trio
+async def test_deduplicator_reports_each_index_once(autojump_clock: trio.testing.MockClock) -> None:
+    reported: list[int] = []
+
+    def on_batch(translated: dict[int, str]) -> None:
+        reported.extend(translated)
+
+    dedup = translate.Deduplicator()
+    async with httpx.AsyncClient(transport=fake_google(str.upper)) as client:
+        results = await dedup.translate(client, ["OK", "Cancel", "OK"], "es", "en", on_batch=on_batch)
+        assert results == ["OK", "CANCEL", "OK"]
+        assert sorted(reported) == [0, 1, 2]
+        assert (dedup.requested, dedup.reused) == (2, 1)
+
+        reported.clear()
+        await dedup.translate(client, ["Cancel", 5], "es", "en", on_batch=on_batch)
+    assert reported == [0]
+    assert (dedup.requested, dedup.reused) == (2, 2)
+
+
+def test_translate_sync_batch_uses_one_request() -> None:
+    requests: list[str] = []
+
+    def transform(text: str) -> str:
+        requests.append(text)
+        return text.upper()
+
+    with httpx.Client(transport=fake_google(transform)) as client:
+        results = translate.translate_sync_batch(["hello", 5, "world", "cat"], "es", "en", client)
+        single = translate.translate_sync("dog", "es", "en", client)
+    assert results == ["HELLO", 5, "WORLD", "CAT"]
+    assert single == "DOG"
+    # Three sentences on separate lines, answered by one request
+    assert "".join(requests).count("§§") == 2
+
+
+def test_translate_sync_retries_server_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    statuses = [503, 429]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if statuses:
+            return httpx.Response(statuses.pop())
+        return httpx.Response(200, json=[[["HOLA", "hello", None]], None, "en"])
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        assert translate.translate_sync("hello", "es", "en", client) == "HOLA"
+        statuses.extend([503, 503])
+        with pytest.raises(translate.RequestError):
+            translate.get_response_json_sync(client, translate.get_translation_url("hi", "es"), attempts=2)
+
+
+def forbidden(requests: list[httpx.Request]) -> httpx.MockTransport:
+    """Return transport answering every request with 403, recording them."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(403)
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.trio
+async def test_translate_async_forbidden_is_request_error(autojump_clock: trio.testing.MockClock) -> None:
+    requests: list[httpx.Request] = []
+    async with httpx.AsyncClient(transport=forbidden(requests)) as client:
+        with trio.testing.RaisesGroup(
+            trio.testing.Matcher(translate.RequestError, "HTTP 403"),
+            flatten_subgroups=True,
+        ):
+            await translate.translate_async(client, ["hello"], "es", "en")
+    # Not retried
+    assert len(requests) == 1
+
+
+def test_translate_sync_forbidden_is_request_error() -> None:
+    requests: list[httpx.Request] = []
+    with httpx.Client(transport=forbidden(requests)) as client, pytest.raises(translate.RequestError, match="HTTP 403"):
+        translate.translate_sync("hello", "es", "en", client)
+    assert len(requests) == 1
+
+
+def test_get_sync_client_is_shared() -> None:
+    client = translate.get_sync_client()
+    assert translate.get_sync_client() is client
+    client.close()
+    assert translate.get_sync_client() is not client
+
+
+def test_close_sync_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    registered: list[object] = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    client = translate.get_sync_client()
+    translate.close_sync_client()
+    assert client.is_closed
+    new_client = translate.get_sync_client()
+    assert new_client is not client
+    # The one module level exit handler closes whichever client is current
+    assert registered == []
+    translate.close_sync_client()
+    assert new_client.is_closed
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import TYPE_CHECKING
+
+import httpx
+import pytest
+
+from localization_translation import translate
+from localization_translation.translation_memory import TranslationMemory
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import trio.testing
+
+
+def test_get_set_counters() -> None:
+    with TranslationMemory() as memory:
+        assert memory.get("Cancel", "en", "es") is None
+        memory.set("Cancel", "Cancelar", "en", "es")
+        assert memory.get("Cancel", "en", "es") == "Cancelar"
+        assert memory.get("Cancel", "en", "fr") is None
+        assert (memory.hits, memory.misses) == (1, 2)
+
+
+def test_get_many() -> None:
+    with TranslationMemory() as memory:
+        memory.set_many({"OK": "Vale", "Cancel": "Cancelar"}, "en", "es")
+        assert memory.get_many(["OK", "Settings", "OK"], "en", "es") == {"OK": "Vale"}
+        assert (memory.hits, memory.misses) == (1, 1)
+
+
+def test_eviction_least_recently_used() -> None:
+    with TranslationMemory(max_entries=2) as memory:
+        memory.set("a", "A", "en", "es")
+        memory.set("b", "B", "en", "es")
+        assert memory.get("a", "en", "es") == "A"
+        memory.set("c", "C", "en", "es")
+        assert len(memory) == 2
+        assert memory.get("b", "en", "es") is None
+        assert memory.get("a", "en", "es") == "A"
+
+
+def test_invalidate_language() -> None:
+    with TranslationMemory() as memory:
+        memory.set("OK", "Vale", "en", "es")
+        memory.set("OK", "D'accord", "en", "fr")
+        assert memory.invalidate("es") == 1
+        assert memory.get("OK", "en", "es") is None
+        assert memory.get("OK", "en", "fr") == "D'accord"
+        assert memory.invalidate() == 1
+        assert len(memory) == 0
+
+
+def test_persistent(tmp_path: Path) -> None:
+    filename = str(tmp_path / "memory.sqlite3")
+    with TranslationMemory(filename) as memory:
+        memory.set("OK", "Vale", "en", "es")
+    with TranslationMemory(filename) as memory:
+        assert memory.get("OK", "en", "es") == "Vale"
+        assert memory.clock == 2
+
+
+def test_entry_count() -> None:
+    with TranslationMemory(max_entries=3) as memory:
+        memory.set_many({"a": "A", "b": "B"}, "en", "es")
+        # Replacing does not add an entry
+        memory.set_many({"a": "AA", "c": "C"}, "en", "es")
+        assert len(memory) == 3
+        memory.set("d", "D", "en", "es")
+        assert len(memory) == 3
+        assert memory.get("a", "en", "es") == "AA"
+        assert memory.invalidate("es") == 3
+        assert len(memory) == 0
+
+
+def test_backends_kept_apart() -> None:
+    with TranslationMemory() as memory:
+        memory.set("OK", "OK MOCK", "en", "es", "mock")
+        assert memory.get("OK", "en", "es") is None
+        assert memory.get("OK", "en", "es", "mock") == "OK MOCK"
+
+
+def test_old_database_gets_backend(tmp_path: Path) -> None:
+    filename = str(tmp_path / "memory.sqlite3")
+    connection = sqlite3.connect(filename)
+    connection.executescript(
+        """
+        CREATE TABLE translations (
+            source_lang TEXT NOT NULL,
+            to_lang TEXT NOT NULL,
+            text TEXT NOT NULL,
+            translation TEXT NOT NULL,
+            used INTEGER NOT NULL,
+            PRIMARY KEY (source_lang, to_lang, text)
+        ) WITHOUT ROWID;
+        CREATE INDEX translations_used ON translations (used);
+        INSERT INTO translations VALUES ('en', 'es', 'OK', 'Vale', 4);
+        """,
+    )
+    connection.close()
+    with TranslationMemory(filename) as memory:
+        assert len(memory) == 1
+        assert memory.clock == 4
+        assert memory.get("OK", "en", "es") == "Vale"
+        assert memory.get("OK", "en", "es", "mock") is None
+
+
+@pytest.mark.trio
+async def test_translate_async_uses_memory(autojump_clock: trio.testing.MockClock) -> None:
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = request.url.params["q"]
+        requested.append(query)
+        return httpx.Response(200, json=[[[query.upper(), query, None]], None, "en"])
+
+    with TranslationMemory() as memory:
+        memory.set("hello", "hola", "en", "es")
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            results = await translate.translate_async(client, ["hello", "cat"], "es", "en", memory)
+            assert results == ["hola", "CAT"]
+            assert await translate.get_translated_coroutine(client, "cat", "es", "en", memory) == "CAT"
+    assert requested == ["cat"]
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+
+from localization_translation.value_store import StringTable, ValueStore, changed_indexes
+
+
+def test_string_table_dedup() -> None:
+    table = StringTable()
+    assert list(table.add_many(["OK", "Cancel", "OK"])) == [0, 1, 0]
+    assert table.add("Cancel") == 1
+    assert table.add("Save") == 2
+    assert len(table) == 3
+    assert table[2] == "Save"
+    assert table.get_many([2, 0, 0]) == ["Save", "OK", "OK"]
+    assert repr(table) == "<StringTable 3 strings>"
+
+
+def test_value_store_round_trip() -> None:
+    english = {"title": "Settings", "buttons": ["OK", "Cancel"], "count": 3}
+    spanish = {"title": "Ajustes", "buttons": ["OK", "Cancelar"], "count": 3}
+    store = ValueStore()
+    store.add_data("Settings.app", "English", english)
+    store.add_data("Other.app", "English", {"ok": "OK"})
+    keys = store.keys["Settings.app"]
+    assert store.set_values("Settings.app", "Spanish", ["Ajustes", "OK", "Cancelar", "3"]) == [0, 1, 2, 3]
+    assert store.get_data("Settings.app", "English") == english
+    assert store.get_data("Settings.app", "Spanish") == spanish
+    assert store.languages("Settings.app") == ["English", "Spanish"]
+    # "OK" and "3" are shared between languages and files
+    assert len(store.table) == 6
+    assert store.changed("Settings.app", "English", "Spanish") == [0, 2]
+    assert store.changed_keys("Settings.app", "English", "Spanish") == [keys[0], keys[2]]
+    assert repr(store) == "<ValueStore 2 files, 3 columns, 6 strings>"
+
+
+def test_value_store_set_values_changes() -> None:
+    store = ValueStore()
+    store.add_data("App", "Spanish", ["Uno", "Dos", "Tres"])
+    assert store.set_values("App", "Spanish", ["Uno", "Dos", "Tres"]) == []
+    assert store.set_values("App", "Spanish", ["Uno", "2", "Tres"]) == [1]
+    strings = len(store.table)
+    with pytest.raises(ValueError, match="Expected 3 values, got 2"):
+        store.set_values("App", "Spanish", ["Cuatro", "Cinco"])
+    # Rejected values are not added to the table
+    assert len(store.table) == strings
+    # Other languages with the same keys are kept
+    store.add_data("App", "English", ["One", "Two", "Three"])
+    assert store.languages("App") == ["Spanish", "English"]
+    assert store.changed("App", "English", "Spanish") == [0, 1, 2]
+    # Different keys drop columns that no longer line up
+    store.add_data("App", "English", ["One"])
+    assert store.languages("App") == ["English"]
+
+
+def test_changed_indexes() -> None:
+    store = ValueStore()
+    old = store.table.add_many(["a", "b", "c"])
+    assert changed_indexes(old, store.table.add_many(["a", "b", "c"])) == []
+    assert changed_indexes(old, store.table.add_many(["x", "b", "y"])) == [0, 2]